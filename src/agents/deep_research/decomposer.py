@@ -4,7 +4,6 @@
 参考 Open Deep Research 的 Supervisor 设计。
 """
 import json
-import re
 from typing import List, Optional
 from dataclasses import dataclass
 
@@ -12,10 +11,12 @@ import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from utils import json_utils
+from utils.json_utils import find_json_object
 from utils.llm_client import QwenClient
 
 
-@dataclass
+@dataclass(slots=True)
 class SubQuestion:
     """子问题"""
     question: str       # 子问题内容
@@ -23,7 +24,7 @@ class SubQuestion:
     search_keywords: List[str]  # 建议的搜索关键词
 
 
-@dataclass
+@dataclass(slots=True)
 class DecompositionResult:
     """分解结果"""
     original_query: str          # 原始查询
@@ -151,14 +152,15 @@ class SubQuestionDecomposer:
     def _parse_response(self, content: str) -> Optional[dict]:
         """解析 LLM 响应"""
         try:
-            return json.loads(content)
+            return json_utils.loads(content)
         except json.JSONDecodeError:
             pass
 
-        json_match = re.search(r'\{[\s\S]*\}', content)
-        if json_match:
+        # 回退：截取第一个括号平衡的 JSON 对象
+        json_text = find_json_object(content)
+        if json_text:
             try:
-                return json.loads(json_match.group())
+                return json_utils.loads(json_text)
             except json.JSONDecodeError:
                 pass
 
@@ -14,12 +14,17 @@ import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from tools.search import UnifiedSearch
+from tools.search import UnifiedSearch, get_default_searcher
 from tools.paper_screener import PaperScreener, ScreeningResult, ScreenedPaper
 from tools.pdf import PaperProcessor, ProcessedPaper
+from utils import json_utils
+from utils.json_utils import find_json_object
 from utils.llm_client import QwenClient
 from .decomposer import SubQuestion
 
+# 句子切分：句末标点后的空白
+_SENTENCE_SPLIT_RE = re.compile(r'(?<=[.!?。！？])\s+')
+
 
 @dataclass
 class SupportingEvidence:
@@ -118,7 +123,7 @@ class FulltextResearchAgent:
         max_fulltext_per_question: int = 5
     ):
         self.llm_client = QwenClient(api_key=qwen_api_key) if qwen_api_key else None
-        self.searcher = searcher or UnifiedSearch()
+        self.searcher = searcher or get_default_searcher()
         self.screener = PaperScreener(
             qwen_api_key=qwen_api_key,
             max_fulltext=max_fulltext_per_question
@@ -251,7 +256,7 @@ class FulltextResearchAgent:
             position_tag = chunk.position_tags[0] if chunk.position_tags else ""
 
             # 简单句子分割
-            chunk_sentences = re.split(r'(?<=[.!?。！？])\s+', chunk.text)
+            chunk_sentences = _SENTENCE_SPLIT_RE.split(chunk.text)
             for sent in chunk_sentences:
                 sent = sent.strip()
                 if len(sent) > 20:  # 过滤太短的句子
@@ -532,15 +537,16 @@ class FulltextResearchAgent:
     def _parse_response(self, content: str) -> Optional[dict]:
         """解析 LLM 响应"""
         try:
-            return json.loads(content)
-        except:
+            return json_utils.loads(content)
+        except json.JSONDecodeError:
             pass
 
-        match = re.search(r'\{[\s\S]*\}', content)
-        if match:
+        # 回退：截取第一个括号平衡的 JSON 对象
+        json_text = find_json_object(content)
+        if json_text:
             try:
-                return json.loads(match.group())
-            except:
+                return json_utils.loads(json_text)
+            except json.JSONDecodeError:
                 pass
 
         return None
@@ -29,6 +29,7 @@ class DeepResearchConfig:
     use_fulltext: bool = False          # 是否使用全文研究（下载 PDF）
     max_fulltext_per_question: int = 10 # 每个子问题最多获取的全文数
     papers_to_analyze: int = 10         # 筛选后用于分析的论文数
+    use_cache: bool = True              # 是否启用搜索 / LLM 压缩的磁盘缓存（data/cache）
 
 
 @dataclass
@@ -101,7 +102,8 @@ class DeepResearchOrchestrator:
             # 原有摘要研究模式
             self.research_runner = ParallelResearchRunner(
                 qwen_api_key=qwen_api_key,
-                max_workers=self.config.max_parallel_workers
+                max_workers=self.config.max_parallel_workers,
+                use_cache=self.config.use_cache
             )
             self.use_fulltext = False
 
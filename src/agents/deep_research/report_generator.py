@@ -3,9 +3,10 @@
 将多个子问题的研究结果整合为一份完整的研究报告。
 参考 Open Deep Research 的 final_report_generation 设计。
 """
+import io
 import json
-import re
-from typing import List, Optional
+import string
+from typing import Iterator, List, Optional
 from dataclasses import dataclass
 from datetime import datetime
 
@@ -14,11 +15,38 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from utils.llm_client import QwenClient
+from utils import json_utils
+from utils.json_utils import find_json_object
 from .decomposer import DecompositionResult
 from .research_agent import ResearchResult
 
 
-@dataclass
+# 无章节、无来源的报告（超时/空结果）直接套用的 Markdown 模板，与 iter_markdown 的输出一致
+_EMPTY_TEMPLATE = """# {title}
+
+> 研究类型: {query_type} | 子问题: {sub_questions_count} 个 | 论文: {total_papers} 篇
+
+## 概述
+
+{overview}
+
+## 结论
+
+{conclusion}
+"""
+
+
+@dataclass(slots=True)
+class ResultScan:
+    """研究结果的单次遍历汇总（prompt 与报告格式化共用）"""
+    findings_text: str          # prompt 用的研究发现文本
+    papers: List[dict]          # 去重并按引用数排序的论文
+    evidences: List[dict]       # 句级证据
+    total_papers: int           # 各子问题找到的论文总数
+    has_fulltext: bool          # 是否包含全文研究结果
+
+
+@dataclass(slots=True)
 class ResearchReport:
     """研究报告"""
     title: str                  # 报告标题
@@ -93,6 +121,20 @@ class ReportGenerator:
 - 综述类问题：sections 应该按主题或时间线组织
 - 趋势类问题：sections 应该包括历史回顾、现状分析、未来展望"""
 
+    # prompt 中论文列表的规模控制
+    MAX_PROMPT_PAPERS = 30      # 最多列出的论文数（按引用数取前 N）
+    PROMPT_TITLE_CHARS = 80     # 标题截断长度
+
+    # 每个子问题写入 prompt 的研究发现上限，防止上游压缩异常时 prompt 膨胀
+    FINDINGS_CHAR_BUDGET = 1500
+    MAX_KEY_POINTS = 5
+
+    # 模板只在类加载时解析一次：(字面量, 字段名) 序列，避免每次 format 重新扫描占位符
+    _REPORT_PROMPT_PARTS = tuple(
+        (literal, field_name)
+        for literal, field_name, _, _ in string.Formatter().parse(REPORT_PROMPT)
+    )
+
     def __init__(self, qwen_api_key: Optional[str] = None):
         self.llm_client = QwenClient(api_key=qwen_api_key) if qwen_api_key else None
 
@@ -114,105 +156,126 @@ class ReportGenerator:
         if not research_results:
             return self._empty_report(decomposition.original_query)
 
+        # 论文去重排序、证据收集只做一次，LLM 路径与回退路径共用
+        scan = self._scan_results(research_results)
+
         if self.llm_client:
-            report = self._generate_with_llm(decomposition, research_results)
+            report = self._generate_with_llm(decomposition, research_results, scan)
         else:
-            report = self._generate_fallback(decomposition, research_results)
+            report = self._generate_fallback(decomposition, research_results, scan)
 
         return report
 
-    def _format_research_findings(self, results: List[ResearchResult]) -> str:
-        """格式化研究结果用于 prompt"""
-        lines = []
-        for i, result in enumerate(results, 1):
-            lines.append(f"## 子问题 {i}: {result.sub_question}")
-            lines.append(f"研究目的: {result.purpose}")
-            lines.append(f"找到论文: {result.papers_found} 篇")
-            lines.append(f"\n研究发现:\n{result.compressed_findings}")
-
-            if result.key_points:
-                lines.append("\n关键要点:")
-                for point in result.key_points:
-                    lines.append(f"- {point}")
-
-            lines.append("\n" + "-" * 40 + "\n")
+    def _scan_results(self, results: List[ResearchResult]) -> ResultScan:
+        """
+        单次遍历研究结果，同时产出 prompt 研究发现、去重论文、句级证据和统计信息
 
-        return "\n".join(lines)
+        Args:
+            results: 各子问题的研究结果
 
-    def _collect_all_papers(self, results: List[ResearchResult]) -> List[dict]:
-        """收集所有论文并去重"""
+        Returns:
+            ResultScan: 汇总结果
+        """
+        findings = io.StringIO()
         seen_titles = set()
         all_papers = []
+        all_evidences = []
+        total_papers = 0
+        has_fulltext = False
 
-        for result in results:
+        for i, result in enumerate(results, 1):
+            # 研究发现（用于 prompt）
+            findings.write(f"## 子问题 {i}: {result.sub_question}\n")
+            findings.write(f"研究目的: {result.purpose}\n")
+            findings.write(f"找到论文: {result.papers_found} 篇\n")
+            compressed = str(result.compressed_findings)
+            if len(compressed) > self.FINDINGS_CHAR_BUDGET:
+                compressed = compressed[:self.FINDINGS_CHAR_BUDGET] + "…[已截断]"
+            findings.write(f"\n研究发现:\n{compressed}\n")
+
+            if result.key_points:
+                findings.write("\n关键要点:\n")
+                for point in result.key_points[:self.MAX_KEY_POINTS]:
+                    findings.write("- ")
+                    findings.write(str(point))  # LLM 偶尔返回数字 / 对象作为要点
+                    findings.write("\n")
+
+            findings.write("\n" + "-" * 40 + "\n\n")
+
+            # 论文去重
             for src in result.sources:
                 title = src.get("title", "").lower().strip()
                 if title and title not in seen_titles:
                     seen_titles.add(title)
                     all_papers.append(src)
 
+            # 句级证据（仅全文研究模式非空）
+            for evidence in result.evidences:
+                all_evidences.append({
+                    "sentence": evidence.sentence,
+                    "page": evidence.page,
+                    "position": evidence.position,
+                    "paper_title": evidence.paper_title,
+                    "paper_index": evidence.paper_index,
+                    "sub_question": result.sub_question
+                })
+
+            total_papers += result.papers_found
+            if result.papers_with_fulltext > 0:
+                has_fulltext = True
+
         # 按引用数排序，高引用论文优先
         all_papers.sort(
             key=lambda x: x.get("citation_count", 0) or 0,
             reverse=True
         )
 
-        return all_papers
-
-    def _collect_all_evidences(self, results: List[ResearchResult]) -> List[dict]:
-        """收集所有句级证据（仅 FulltextResearchResult 有）"""
-        all_evidences = []
-        for result in results:
-            # 检查是否是 FulltextResearchResult（有 evidences 属性）
-            if hasattr(result, 'evidences') and result.evidences:
-                for evidence in result.evidences:
-                    all_evidences.append({
-                        "sentence": evidence.sentence,
-                        "page": evidence.page,
-                        "position": evidence.position,
-                        "paper_title": evidence.paper_title,
-                        "paper_index": evidence.paper_index,
-                        "sub_question": result.sub_question
-                    })
-        return all_evidences
+        return ResultScan(
+            findings_text=findings.getvalue()[:-1],  # 去掉末尾多写的换行
+            papers=all_papers,
+            evidences=all_evidences,
+            total_papers=total_papers,
+            has_fulltext=has_fulltext
+        )
 
     def _format_paper_list(self, papers: List[dict]) -> str:
-        """格式化论文列表，带编号"""
+        """
+        格式化论文列表，带编号
+
+        只保留截断后的标题和年份，并限制为引用数最高的前 MAX_PROMPT_PAPERS 篇，
+        以压缩 prompt。编号与 report.sources 的前缀一一对应，来源、链接等信息
+        由 Markdown 参考来源部分展示。
+        """
         if not papers:
             return "（无可引用的论文）"
 
-        lines = []
-        for i, p in enumerate(papers, 1):
-            title = p.get("title", "未知标题")
-            year = p.get("year", "N/A")
-            source = p.get("source", "unknown").upper()
-            relevance = p.get("relevance", "")
-
-            line = f"[{i}] {title} ({source}, {year})"
-            if relevance:
-                line += f" - {relevance}"
-            lines.append(line)
+        buf = io.StringIO()
+        for i, p in enumerate(papers[:self.MAX_PROMPT_PAPERS], 1):
+            buf.write("[")
+            buf.write(str(i))
+            buf.write("] ")
+            buf.write((p.get("title") or "未知标题")[:self.PROMPT_TITLE_CHARS])
+            buf.write(" (")
+            buf.write(str(p.get("year") or "N/A"))
+            buf.write(")\n")
 
-        return "\n".join(lines)
+        return buf.getvalue().rstrip("\n")
 
     def _generate_with_llm(
         self,
         decomposition: DecompositionResult,
-        research_results: List[ResearchResult]
+        research_results: List[ResearchResult],
+        scan: ResultScan
     ) -> ResearchReport:
         """使用 LLM 生成报告"""
         try:
-            findings_text = self._format_research_findings(research_results)
+            paper_list_text = self._format_paper_list(scan.papers)
 
-            # 收集所有论文并编号
-            all_papers = self._collect_all_papers(research_results)
-            paper_list_text = self._format_paper_list(all_papers)
-
-            prompt = self.REPORT_PROMPT.format(
+            prompt = self._render_prompt(
                 original_query=decomposition.original_query,
                 query_type=decomposition.query_type,
                 research_strategy=decomposition.research_strategy,
-                research_findings=findings_text,
+                research_findings=scan.findings_text,
                 paper_list=paper_list_text
             )
 
@@ -227,24 +290,34 @@ class ReportGenerator:
             parsed = self._parse_response(content)
 
             if parsed:
-                return self._format_report(decomposition, research_results, parsed)
+                return self._format_report(decomposition, parsed, scan)
 
         except Exception as e:
             print(f"[ReportGenerator] LLM 生成出错: {e}")
 
-        return self._generate_fallback(decomposition, research_results)
+        return self._generate_fallback(decomposition, research_results, scan)
+
+    def _render_prompt(self, **kwargs) -> str:
+        """用预解析的模板片段拼接 prompt（等价于 REPORT_PROMPT.format(**kwargs)）"""
+        out = []
+        for literal, field_name in self._REPORT_PROMPT_PARTS:
+            out.append(literal)
+            if field_name:
+                out.append(str(kwargs[field_name]))
+        return "".join(out)
 
     def _parse_response(self, content: str) -> Optional[dict]:
         """解析 LLM 响应"""
         try:
-            return json.loads(content)
+            return json_utils.loads(content)
         except json.JSONDecodeError:
             pass
 
-        json_match = re.search(r'\{[\s\S]*\}', content)
-        if json_match:
+        # 回退：截取第一个括号平衡的 JSON 对象
+        json_text = find_json_object(content)
+        if json_text:
             try:
-                return json.loads(json_match.group())
+                return json_utils.loads(json_text)
             except json.JSONDecodeError:
                 pass
 
@@ -253,46 +326,35 @@ class ReportGenerator:
     def _format_report(
         self,
         decomposition: DecompositionResult,
-        research_results: List[ResearchResult],
-        parsed: dict
+        parsed: dict,
+        scan: ResultScan
     ) -> ResearchReport:
-        """格式化报告"""
-        # 使用统一的论文收集方法，保持编号一致性
-        all_sources = self._collect_all_papers(research_results)
-
-        # 收集句级证据
-        all_evidences = self._collect_all_evidences(research_results)
-
-        # 检查是否有全文研究结果
-        has_fulltext = any(
-            hasattr(r, 'papers_with_fulltext') and r.papers_with_fulltext > 0
-            for r in research_results
-        )
-
+        """格式化报告（来源沿用 prompt 中的编号顺序）"""
         return ResearchReport(
             title=parsed.get("title", decomposition.original_query),
             overview=parsed.get("overview", ""),
             sections=parsed.get("sections", []),
             conclusion=parsed.get("conclusion", ""),
-            sources=all_sources,
+            sources=scan.papers,
             metadata={
                 "original_query": decomposition.original_query,
                 "query_type": decomposition.query_type,
                 "research_strategy": decomposition.research_strategy,
                 "sub_questions_count": len(decomposition.sub_questions),
-                "total_papers": sum(r.papers_found for r in research_results),
+                "total_papers": scan.total_papers,
                 "generated_at": datetime.now().isoformat(),
                 "key_takeaways": parsed.get("key_takeaways", []),
-                "has_fulltext": has_fulltext,
-                "evidences_count": len(all_evidences)
+                "has_fulltext": scan.has_fulltext,
+                "evidences_count": len(scan.evidences)
             },
-            evidences=all_evidences
+            evidences=scan.evidences
         )
 
     def _generate_fallback(
         self,
         decomposition: DecompositionResult,
-        research_results: List[ResearchResult]
+        research_results: List[ResearchResult],
+        scan: ResultScan
     ) -> ResearchReport:
         """回退方案：从研究结果中整合报告"""
         print("[ReportGenerator] 使用回退方案生成报告")
@@ -314,16 +376,9 @@ class ReportGenerator:
                 "key_findings": key_findings
             })
 
-        # 收集所有来源
-        all_sources = []
-        for result in research_results:
-            all_sources.extend(result.sources)
-
-        # 收集句级证据
-        all_evidences = self._collect_all_evidences(research_results)
+        total_papers = scan.total_papers
 
         # 概述：包含更多信息
-        total_papers = sum(r.papers_found for r in research_results)
         overview = f"本研究围绕「{decomposition.original_query}」展开，分解为 {len(research_results)} 个子问题进行研究，共检索到 {total_papers} 篇相关论文。"
 
         # 如果有研究策略，加入概述
@@ -349,7 +404,7 @@ class ReportGenerator:
             overview=overview,
             sections=sections,
             conclusion=conclusion,
-            sources=all_sources,
+            sources=scan.papers,  # 与 LLM 路径一致：去重并按引用数排序
             metadata={
                 "original_query": decomposition.original_query,
                 "query_type": decomposition.query_type,
@@ -357,7 +412,7 @@ class ReportGenerator:
                 "total_papers": total_papers,
                 "generated_at": datetime.now().isoformat()
             },
-            evidences=all_evidences
+            evidences=scan.evidences
         )
 
     def _empty_report(self, query: str) -> ResearchReport:
@@ -385,59 +440,83 @@ class ReportGenerator:
         Returns:
             str: Markdown 格式的报告
         """
-        lines = []
+        meta = report.metadata
+        if not (report.sections or report.sources or report.evidences
+                or meta.get("key_takeaways")):
+            return _EMPTY_TEMPLATE.format(
+                title=report.title,
+                query_type=meta.get('query_type', 'N/A'),
+                sub_questions_count=meta.get('sub_questions_count', 0),
+                total_papers=meta.get('total_papers', 0),
+                overview=report.overview,
+                conclusion=report.conclusion
+            )
 
+        return "\n".join(self.iter_markdown(report))
+
+    def iter_markdown(self, report: ResearchReport) -> Iterator[str]:
+        """
+        逐行生成 Markdown 报告
+
+        调用方可以边生成边写入文件或 HTTP 响应，无需先拼出完整字符串。
+
+        Args:
+            report: 研究报告
+
+        Yields:
+            str: Markdown 的一行（不含换行符）
+        """
         # 标题
-        lines.append(f"# {report.title}")
-        lines.append("")
+        yield f"# {report.title}"
+        yield ""
 
         # 元数据
         meta = report.metadata
-        lines.append(f"> 研究类型: {meta.get('query_type', 'N/A')} | "
-                    f"子问题: {meta.get('sub_questions_count', 0)} 个 | "
-                    f"论文: {meta.get('total_papers', 0)} 篇")
-        lines.append("")
+        yield (f"> 研究类型: {meta.get('query_type', 'N/A')} | "
+               f"子问题: {meta.get('sub_questions_count', 0)} 个 | "
+               f"论文: {meta.get('total_papers', 0)} 篇")
+        yield ""
 
         # 概述
-        lines.append("## 概述")
-        lines.append("")
-        lines.append(report.overview)
-        lines.append("")
+        yield "## 概述"
+        yield ""
+        yield report.overview
+        yield ""
 
         # 核心要点
         if meta.get("key_takeaways"):
-            lines.append("### 核心要点")
-            lines.append("")
+            yield "### 核心要点"
+            yield ""
             for i, point in enumerate(meta["key_takeaways"], 1):
-                lines.append(f"{i}. {point}")
-            lines.append("")
+                yield f"{i}. {point}"
+            yield ""
 
         # 各章节
         for i, section in enumerate(report.sections, 1):
             heading = section.get("heading", f"部分 {i}")
-            lines.append(f"## {i}. {heading}")
-            lines.append("")
-            lines.append(section.get("content", ""))
-            lines.append("")
+            yield f"## {i}. {heading}"
+            yield ""
+            yield section.get("content", "")
+            yield ""
 
             if section.get("key_findings"):
-                lines.append("**关键发现：**")
+                yield "**关键发现：**"
                 for finding in section["key_findings"]:
-                    lines.append(f"- {finding}")
-                lines.append("")
+                    yield f"- {finding}"
+                yield ""
 
         # 结论
-        lines.append("## 结论")
-        lines.append("")
-        lines.append(report.conclusion)
-        lines.append("")
+        yield "## 结论"
+        yield ""
+        yield report.conclusion
+        yield ""
 
         # 句级证据（全文研究模式）
         if report.evidences:
-            lines.append("## 📌 支持证据")
-            lines.append("")
-            lines.append("> *以下是从论文原文中摘录的关键支持句，可用于验证报告中的结论。*")
-            lines.append("")
+            yield "## 📌 支持证据"
+            yield ""
+            yield "> *以下是从论文原文中摘录的关键支持句，可用于验证报告中的结论。*"
+            yield ""
 
             # 按论文分组显示
             evidence_by_paper = {}
@@ -448,17 +527,17 @@ class ReportGenerator:
                 evidence_by_paper[paper_title].append(ev)
 
             for paper_title, evidences in evidence_by_paper.items():
-                lines.append(f"**{paper_title[:60]}...**")
+                yield f"**{paper_title[:60]}...**"
                 for ev in evidences[:3]:  # 每篇论文最多显示3条
                     sentence = ev.get("sentence", "")[:200]
                     page = ev.get("page", "?")
-                    lines.append(f"- 📄 *\"{sentence}...\"* (第{page}页)")
-                lines.append("")
+                    yield f"- 📄 *\"{sentence}...\"* (第{page}页)"
+                yield ""
 
         # 引用来源
         if report.sources:
-            lines.append("## 参考来源")
-            lines.append("")
+            yield "## 参考来源"
+            yield ""
             for i, src in enumerate(report.sources[:10], 1):
                 title = src.get("title", "未知标题")
                 year = src.get("year", "")
@@ -484,11 +563,9 @@ class ReportGenerator:
                     line += f" → [arXiv](https://arxiv.org/abs/{arxiv_id})"
                 elif url:
                     line += f" → [查看论文]({url})"
-                lines.append(line)
-                lines.append("")
-            lines.append("")
-
-        return "\n".join(lines)
+                yield line
+                yield ""
+            yield ""
 
 
 # 测试代码
@@ -3,22 +3,59 @@
 负责对单个子问题进行搜索研究，并压缩总结结果。
 参考 Open Deep Research 的 Researcher Subgraph 设计。
 """
+import asyncio
+import heapq
+import io
 import json
-import re
+from itertools import zip_longest
 from typing import List, Optional
-from dataclasses import dataclass
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
 
 import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from tools.search import UnifiedSearch
-from utils.llm_client import QwenClient
+from tools.paper_ranker import drop_near_duplicates, prefilter_papers
+from tools.search import UnifiedSearch, get_default_searcher
+from utils import json_utils
+from utils.cache import DiskCache
+from utils.json_utils import find_json_object
+from utils.llm_client import QwenClient, aclose_async_client, get_qwen_client
+from utils.text_utils import normalize_title, match_title
 from .decomposer import SubQuestion
 
+# 摘要中的控制字符（换行、制表符等）统一替换为空格，单次 str.translate 完成
+_CONTROL_CHARS = {c: " " for c in (*range(32), 127)}
 
-@dataclass
+# 常见来源名的大写形式（免去每篇论文一次 str.upper）
+_SOURCE_UPPER = {"arxiv": "ARXIV", "openalex": "OPENALEX", "semantic_scholar": "SEMANTIC_SCHOLAR"}
+
+
+def _year_key(paper: dict) -> int:
+    """排序键：年份（缺失视为 0）"""
+    return paper.get("year") or 0
+
+
+def _citation_key(paper: dict) -> int:
+    """排序键：引用数（缺失视为 0）"""
+    return paper.get("citation_count") or 0
+
+
+def _to_source(paper: dict, relevance: str) -> dict:
+    """论文 dict → 来源 dict（保留完整信息）"""
+    return {
+        "title": paper["title"],
+        "authors": paper.get("authors", []),
+        "year": paper.get("year"),
+        "abstract": paper.get("abstract", ""),
+        "url": paper.get("url"),
+        "source": paper.get("source"),
+        "citation_count": paper.get("citation_count"),
+        "relevance": relevance
+    }
+
+
+@dataclass(slots=True)
 class ResearchResult:
     """单个子问题的研究结果"""
     sub_question: str           # 子问题
@@ -27,6 +64,9 @@ class ResearchResult:
     compressed_findings: str    # 压缩后的研究发现
     key_points: List[str]       # 关键要点
     sources: List[dict]         # 引用来源
+    # 与 FulltextResearchResult 对齐的字段，摘要模式下保持默认值，报告生成无需反射判断
+    papers_with_fulltext: int = 0
+    evidences: list = field(default_factory=list)
 
 
 class ResearchAgent:
@@ -39,23 +79,18 @@ class ResearchAgent:
     3. 使用 LLM 压缩和总结发现
     """
 
-    COMPRESS_PROMPT = """你是一个严谨的学术研究助手。你的任务是：
+    # 固定的指令部分作为 system prompt（每次调用完全相同，可被服务端前缀缓存）
+    COMPRESS_SYSTEM_PROMPT = """你是一个严谨的学术研究助手。你的任务是：
 1. 严格筛选与研究问题**直接相关**的论文
 2. 基于相关论文总结研究发现
 
-研究问题：{question}
-研究目的：{purpose}
-
-搜索到的论文：
-{papers_text}
-
 **重要**：请严格评估每篇论文与研究问题的相关性。
 - 只有**直接讨论**研究问题核心内容的论文才算相关
 - 仅仅提到相关词汇但主题不同的论文，应排除
 - 例如：研究问题是"Transformer vs RNN对比"，则只有直接对比两者的论文才相关
 
 输出 JSON 格式：
-{{
+{
   "findings": "基于相关论文的综合发现（100-200字，必须有具体内容支撑）",
   "key_points": [
     "关键要点1（基于论文的具体发现）",
@@ -63,14 +98,14 @@ class ResearchAgent:
     "关键要点3"
   ],
   "relevant_papers": [
-    {{
+    {
       "title": "论文完整标题（必须与输入完全一致）",
       "year": 年份,
       "relevance_score": 5,
       "relevance": "具体说明该论文如何回答研究问题（20字内）"
-    }}
+    }
   ]
-}}
+}
 
 相关性评分标准（relevance_score）：
 - 5分：直接对比/研究该问题的核心论文（必选）
@@ -85,13 +120,32 @@ class ResearchAgent:
 4. findings 必须基于所选论文的实际内容，不要编造
 5. 如果没有高度相关的论文，诚实说明"""
 
+    # 每个子问题变化的部分作为 user prompt
+    COMPRESS_USER_TEMPLATE = """研究问题：{question}
+研究目的：{purpose}
+
+搜索到的论文：
+{papers_text}"""
+
     def __init__(
         self,
         qwen_api_key: Optional[str] = None,
-        searcher: Optional[UnifiedSearch] = None
+        searcher: Optional[UnifiedSearch] = None,
+        llm_cache: Optional[DiskCache] = None,
+        llm_client: Optional[QwenClient] = None
     ):
-        self.llm_client = QwenClient(api_key=qwen_api_key) if qwen_api_key else None
-        self.searcher = searcher or UnifiedSearch()
+        """
+        Args:
+            qwen_api_key: 通义千问 API Key
+            searcher: 统一搜索器（默认使用进程内共享的搜索器）
+            llm_cache: LLM 压缩结果磁盘缓存（可选）
+            llm_client: LLM 客户端（可共享，优先于 qwen_api_key）
+        """
+        if llm_client is None and qwen_api_key:
+            llm_client = get_qwen_client(qwen_api_key)
+        self.llm_client = llm_client
+        self.searcher = searcher or get_default_searcher()
+        self.llm_cache = llm_cache
 
     def research(self, sub_question: SubQuestion, limit: int = 5) -> ResearchResult:
         """
@@ -108,14 +162,7 @@ class ResearchAgent:
         papers = self._search_papers(sub_question, limit)
 
         if not papers:
-            return ResearchResult(
-                sub_question=sub_question.question,
-                purpose=sub_question.purpose,
-                papers_found=0,
-                compressed_findings="未找到相关论文",
-                key_points=["无法获取相关信息"],
-                sources=[]
-            )
+            return self._no_papers_result(sub_question)
 
         # 2. 压缩总结
         if self.llm_client:
@@ -125,147 +172,232 @@ class ResearchAgent:
 
         return result
 
+    async def research_async(self, sub_question: SubQuestion, limit: int = 5) -> ResearchResult:
+        """
+        异步研究单个子问题（与 research 行为一致）
+
+        搜索在线程中执行（arXiv 客户端是同步库），LLM 压缩走 chat_async。
+        """
+        papers = await asyncio.to_thread(self._search_papers, sub_question, limit)
+
+        if not papers:
+            return self._no_papers_result(sub_question)
+
+        if self.llm_client:
+            return await self._compress_with_llm_async(sub_question, papers)
+        return self._compress_fallback(sub_question, papers)
+
+    def _no_papers_result(self, sub_question: SubQuestion) -> ResearchResult:
+        """未找到论文时的结果"""
+        return ResearchResult(
+            sub_question=sub_question.question,
+            purpose=sub_question.purpose,
+            papers_found=0,
+            compressed_findings="未找到相关论文",
+            key_points=["无法获取相关信息"],
+            sources=[]
+        )
+
     def _search_papers(self, sub_question: SubQuestion, limit: int) -> List[dict]:
         """搜索论文"""
-        all_papers = []
-
-        # 使用多个关键词搜索
-        for keyword in sub_question.search_keywords[:3]:  # 最多3个关键词
-            try:
-                result = self.searcher.search(keyword, limit=limit)
-                for paper in result.papers:
-                    paper_dict = {
-                        "title": paper.title,
-                        "authors": paper.authors[:3],
-                        "year": paper.year,
-                        "abstract": paper.abstract,
-                        "url": paper.url,
-                        "source": paper.source,
-                        "citation_count": paper.citation_count
-                    }
-                    all_papers.append(paper_dict)
-            except Exception as e:
-                print(f"[ResearchAgent] 搜索 '{keyword}' 出错: {e}")
-
-        # 去重（基于标题）
-        seen_titles = set()
-        unique_papers = []
-        for p in all_papers:
-            title_lower = p["title"].lower().strip()
-            if title_lower not in seen_titles:
-                seen_titles.add(title_lower)
-                unique_papers.append(p)
-
-        return unique_papers[:limit * 2]  # 返回更多以供筛选
+        # 最多3个关键词并发搜索（总耗时约等于最慢的一次；单个关键词出错返回空结果）
+        keywords = sub_question.search_keywords[:3]
+        results = self.searcher.search_many(keywords, limit=limit)
+
+        # 各关键词的结果交错合并，截断到 limit * 2 篇时每个关键词都有贡献；
+        # 按归一化标题单次去重（保留首次出现）
+        unique_papers: dict = {}
+        for ranked in zip_longest(*(result.papers for result in results)):
+            for paper in ranked:
+                if paper is None:
+                    continue
+                key = normalize_title(paper.title)
+                if key in unique_papers:
+                    continue
+                unique_papers[key] = {
+                    "title": paper.title,
+                    "authors": paper.authors[:3],
+                    "year": paper.year,
+                    "abstract": paper.abstract,
+                    "url": paper.url,
+                    "source": paper.source,
+                    "citation_count": paper.citation_count
+                }
+
+        # 再去掉标题近重复的版本（预印本 / 正式发表），返回更多以供筛选
+        return drop_near_duplicates(list(unique_papers.values()))[:limit * 2]
 
     def _format_papers_for_prompt(self, papers: List[dict]) -> str:
-        """格式化论文列表"""
-        lines = []
+        """格式化论文列表（单次写入 StringIO）"""
+        buf = io.StringIO()
         for i, p in enumerate(papers, 1):
-            source = p.get('source', 'unknown').upper()
-            year = p.get('year', 'N/A')
-            citations = p.get('citation_count', 0) or 0
-            abstract = p.get('abstract', '')[:300] if p.get('abstract') else ''
-
-            lines.append(
-                f"[{i}] [{source}] {p['title']}\n"
-                f"    年份: {year}, 引用: {citations}\n"
+            if i > 1:
+                buf.write("\n\n")
+            source = p.get('source') or 'unknown'
+            abstract = (p.get('abstract') or '')[:300].translate(_CONTROL_CHARS)
+            buf.write(
+                f"[{i}] [{_SOURCE_UPPER.get(source) or source.upper()}] {p['title']}\n"
+                f"    年份: {p.get('year', 'N/A')}, 引用: {p.get('citation_count', 0) or 0}\n"
                 f"    摘要: {abstract}..."
             )
-        return "\n\n".join(lines)
+        return buf.getvalue()
+
+    # 送入压缩 prompt 的最大论文数（超出时按 BM25 相关性预筛）
+    COMPRESS_MAX_PAPERS = 7
+
+    # 压缩调用的 LLM 参数（通义千问 plus 模型，论文压缩是复杂任务）
+    # 生成 1500 token 常需十几秒，单次超时要留足；超时重试会从头生成，因此不重试
+    COMPRESS_LLM_OPTIONS = {
+        "task_type": "compress",
+        "max_tokens": 1500,
+        "temperature": 0.3,
+        "timeout": 25.0,
+        "system_prompt": COMPRESS_SYSTEM_PROMPT
+    }
 
     def _compress_with_llm(self, sub_question: SubQuestion, papers: List[dict]) -> ResearchResult:
         """使用 LLM 压缩总结"""
         try:
-            papers_text = self._format_papers_for_prompt(papers)
+            prompt = self._build_compress_prompt(sub_question, papers)
+            content = self._get_cached_compression(prompt)
+            if content is None:
+                content = self.llm_client.chat(prompt=prompt, **self.COMPRESS_LLM_OPTIONS)
+                self._set_cached_compression(prompt, content)
 
-            prompt = self.COMPRESS_PROMPT.format(
-                question=sub_question.question,
-                purpose=sub_question.purpose,
-                papers_text=papers_text
-            )
+            result = self._result_from_response(sub_question, papers, content)
+            if result:
+                return result
 
-            print(f"[ResearchAgent] 调用 LLM 压缩: {sub_question.question[:30]}...")
+        except Exception as e:
+            print(f"[ResearchAgent] LLM 压缩出错: {type(e).__name__}: {e}")
 
-            # 使用通义千问 plus 模型（论文压缩是复杂任务）
-            content = self.llm_client.chat(
-                prompt=prompt,
-                task_type="compress",
-                max_tokens=1500,
-                temperature=0.3,
-                timeout=25.0
-            )
+        return self._compress_fallback(sub_question, papers)
 
-            print(f"[ResearchAgent] LLM 响应长度: {len(content)} 字符")
-            parsed = self._parse_response(content)
-
-            if parsed:
-                print(f"[ResearchAgent] JSON 解析成功，findings 长度: {len(parsed.get('findings', ''))}")
-                # 提取相关论文作为来源（保留完整信息）
-                sources = []
-                for rp in parsed.get("relevant_papers", []):
-                    # 在原始论文列表中查找匹配
-                    for p in papers:
-                        if rp.get("title", "").lower() in p["title"].lower():
-                            sources.append({
-                                "title": p["title"],
-                                "authors": p.get("authors", []),
-                                "year": p.get("year"),
-                                "abstract": p.get("abstract", ""),
-                                "url": p.get("url"),
-                                "source": p.get("source"),
-                                "citation_count": p.get("citation_count"),
-                                "relevance": rp.get("relevance", "")
-                            })
-                            break
-
-                # 检查来源平衡：如果 LLM 筛选后没有 arXiv 论文，补充一些
-                arxiv_in_sources = [s for s in sources if s.get("source") == "arxiv"]
-                if not arxiv_in_sources:
-                    # 从原始列表中找 arXiv 论文补充
-                    arxiv_papers = [p for p in papers if p.get("source") == "arxiv"]
-                    arxiv_papers.sort(key=lambda x: x.get("year", 0) or 0, reverse=True)
-                    for p in arxiv_papers[:2]:  # 补充最多2篇最新的 arXiv 论文
-                        sources.append({
-                            "title": p["title"],
-                            "authors": p.get("authors", []),
-                            "year": p.get("year"),
-                            "abstract": p.get("abstract", ""),
-                            "url": p.get("url"),
-                            "source": p.get("source"),
-                            "citation_count": p.get("citation_count"),
-                            "relevance": "最新研究（补充）"
-                        })
-                    print(f"[ResearchAgent] 补充了 {min(2, len(arxiv_papers))} 篇 arXiv 论文")
-
-                print(f"[ResearchAgent] 筛选出 {len(sources)} 篇相关论文")
-                return ResearchResult(
-                    sub_question=sub_question.question,
-                    purpose=sub_question.purpose,
-                    papers_found=len(papers),
-                    compressed_findings=parsed.get("findings", ""),
-                    key_points=parsed.get("key_points", []),
-                    sources=sources if sources else self._extract_top_sources(papers)
+    async def _compress_with_llm_async(
+        self,
+        sub_question: SubQuestion,
+        papers: List[dict]
+    ) -> ResearchResult:
+        """使用 LLM 压缩总结（异步）"""
+        try:
+            prompt = self._build_compress_prompt(sub_question, papers)
+            content = self._get_cached_compression(prompt)
+            if content is None:
+                content = await self.llm_client.chat_async(
+                    prompt=prompt, **self.COMPRESS_LLM_OPTIONS
                 )
-            else:
-                print(f"[ResearchAgent] JSON 解析失败，原始内容前200字: {content[:200]}")
+                self._set_cached_compression(prompt, content)
+
+            result = self._result_from_response(sub_question, papers, content)
+            if result:
+                return result
 
         except Exception as e:
             print(f"[ResearchAgent] LLM 压缩出错: {type(e).__name__}: {e}")
 
         return self._compress_fallback(sub_question, papers)
 
+    def _compression_cache_key(self, prompt: str) -> str:
+        """压缩缓存键：模型 + 任务类型 + 温度 + 最大 token 数 + system prompt + prompt"""
+        options = self.COMPRESS_LLM_OPTIONS
+        task_type = options["task_type"]
+        return DiskCache.make_key(
+            QwenClient.MODELS[QwenClient.TASK_MODEL_MAP[task_type]],
+            task_type,
+            options["temperature"],
+            options["max_tokens"],
+            options["system_prompt"],
+            prompt
+        )
+
+    def _get_cached_compression(self, prompt: str) -> Optional[str]:
+        """读取缓存的 LLM 压缩响应"""
+        if self.llm_cache is None:
+            return None
+        content = self.llm_cache.get(self._compression_cache_key(prompt))
+        if content is not None:
+            print("[ResearchAgent] 压缩结果命中缓存")
+        return content
+
+    def _set_cached_compression(self, prompt: str, content: str):
+        """缓存 LLM 压缩响应"""
+        if self.llm_cache is not None and content:
+            self.llm_cache.set(self._compression_cache_key(prompt), content)
+
+    def _build_compress_prompt(self, sub_question: SubQuestion, papers: List[dict]) -> str:
+        """构建压缩 prompt（论文过多时先按 BM25 相关性预筛，缩短 prompt）"""
+        papers = prefilter_papers(
+            papers,
+            [sub_question.question, *sub_question.search_keywords],
+            self.COMPRESS_MAX_PAPERS
+        )
+        papers_text = self._format_papers_for_prompt(papers)
+
+        print(f"[ResearchAgent] 调用 LLM 压缩: {sub_question.question[:30]}...")
+
+        return self.COMPRESS_USER_TEMPLATE.format(
+            question=sub_question.question,
+            purpose=sub_question.purpose,
+            papers_text=papers_text
+        )
+
+    def _result_from_response(
+        self,
+        sub_question: SubQuestion,
+        papers: List[dict],
+        content: str
+    ) -> Optional[ResearchResult]:
+        """将 LLM 响应解析为研究结果，解析失败返回 None"""
+        print(f"[ResearchAgent] LLM 响应长度: {len(content)} 字符")
+        parsed = self._parse_response(content)
+
+        if not parsed:
+            print(f"[ResearchAgent] JSON 解析失败，原始内容前200字: {content[:200]}")
+            return None
+
+        print(f"[ResearchAgent] JSON 解析成功，findings 长度: {len(parsed.get('findings', ''))}")
+        # 提取相关论文作为来源（保留完整信息）
+        sources = []
+        # 归一化标题索引，O(1) 查找（未命中时 match_title 再做模糊匹配）
+        index = {}
+        for p in papers:
+            index.setdefault(normalize_title(p["title"]), p)
+        for rp in parsed.get("relevant_papers", []):
+            p = match_title(rp.get("title", ""), index)
+            if p is not None:
+                sources.append(_to_source(p, rp.get("relevance", "")))
+
+        # 检查来源平衡：如果 LLM 筛选后没有 arXiv 论文，补充一些
+        arxiv_in_sources = [s for s in sources if s.get("source") == "arxiv"]
+        if not arxiv_in_sources:
+            # 从原始列表中找 arXiv 论文补充
+            arxiv_papers = [p for p in papers if p.get("source") == "arxiv"]
+            for p in heapq.nlargest(2, arxiv_papers, key=_year_key):  # 补充最多2篇最新的 arXiv 论文
+                sources.append(_to_source(p, "最新研究（补充）"))
+            print(f"[ResearchAgent] 补充了 {min(2, len(arxiv_papers))} 篇 arXiv 论文")
+
+        print(f"[ResearchAgent] 筛选出 {len(sources)} 篇相关论文")
+        return ResearchResult(
+            sub_question=sub_question.question,
+            purpose=sub_question.purpose,
+            papers_found=len(papers),
+            compressed_findings=parsed.get("findings", ""),
+            key_points=parsed.get("key_points", []),
+            sources=sources if sources else self._extract_top_sources(papers)
+        )
+
     def _parse_response(self, content: str) -> Optional[dict]:
         """解析 LLM 响应"""
         try:
-            return json.loads(content)
+            return json_utils.loads(content)
         except json.JSONDecodeError:
             pass
 
-        json_match = re.search(r'\{[\s\S]*\}', content)
-        if json_match:
+        # 回退：截取第一个括号平衡的 JSON 对象（兼容 ```json 代码块和前后说明文字）
+        json_text = find_json_object(content)
+        if json_text:
             try:
-                return json.loads(json_match.group())
+                return json_utils.loads(json_text)
             except json.JSONDecodeError:
                 pass
 
@@ -273,62 +405,32 @@ class ResearchAgent:
 
     def _extract_top_sources(self, papers: List[dict], limit: int = 5) -> List[dict]:
         """提取最重要的来源（平衡 arXiv 和 OpenAlex）"""
-        # 分离 arXiv 和 OpenAlex 论文
-        arxiv_papers = [p for p in papers if p.get("source") == "arxiv"]
-        openalex_papers = [p for p in papers if p.get("source") != "arxiv"]
+        # 单次遍历分离 arXiv 和 OpenAlex 论文
+        arxiv_papers, openalex_papers = [], []
+        for p in papers:
+            (arxiv_papers if p.get("source") == "arxiv" else openalex_papers).append(p)
 
-        # arXiv 按年份排序（最新优先）
-        arxiv_papers.sort(key=lambda x: x.get("year", 0) or 0, reverse=True)
-        # OpenAlex 按引用数排序
-        openalex_papers.sort(key=lambda x: x.get("citation_count", 0) or 0, reverse=True)
-
-        # 平衡选择：各取一半
+        # 平衡选择：各取一半，某一来源不足时用另一来源补充
         half_limit = max(1, limit // 2)
-        selected_arxiv = arxiv_papers[:half_limit]
-        selected_openalex = openalex_papers[:limit - len(selected_arxiv)]
-
-        # 如果某一来源不足，用另一来源补充
-        if len(selected_arxiv) < half_limit:
-            selected_openalex = openalex_papers[:limit - len(selected_arxiv)]
-        if len(selected_openalex) < limit - half_limit:
-            selected_arxiv = arxiv_papers[:limit - len(selected_openalex)]
-
-        sources = []
-        for p in selected_arxiv:
-            sources.append({
-                "title": p["title"],
-                "authors": p.get("authors", []),
-                "year": p.get("year"),
-                "abstract": p.get("abstract", ""),
-                "url": p.get("url"),
-                "source": p.get("source"),
-                "citation_count": p.get("citation_count"),
-                "relevance": "最新研究"
-            })
-        for p in selected_openalex:
-            sources.append({
-                "title": p["title"],
-                "authors": p.get("authors", []),
-                "year": p.get("year"),
-                "abstract": p.get("abstract", ""),
-                "url": p.get("url"),
-                "source": p.get("source"),
-                "citation_count": p.get("citation_count"),
-                "relevance": "经典文献"
-            })
-
-        return sources
+        n_arxiv = min(half_limit, len(arxiv_papers))
+        n_openalex = min(limit - n_arxiv, len(openalex_papers))
+        if n_openalex < limit - half_limit:
+            n_arxiv = min(limit - n_openalex, len(arxiv_papers))
+
+        # 只需部分排序（O(N log k)）：arXiv 按年份（最新优先），OpenAlex 按引用数
+        return [
+            *(_to_source(p, "最新研究")
+              for p in heapq.nlargest(n_arxiv, arxiv_papers, key=_year_key)),
+            *(_to_source(p, "经典文献")
+              for p in heapq.nlargest(n_openalex, openalex_papers, key=_citation_key)),
+        ]
 
     def _compress_fallback(self, sub_question: SubQuestion, papers: List[dict]) -> ResearchResult:
         """回退方案：从摘要中提取关键信息"""
         print("[ResearchAgent] 使用回退方案（摘要提取）")
 
-        # 按引用数排序
-        sorted_papers = sorted(
-            papers,
-            key=lambda x: x.get("citation_count", 0) or 0,
-            reverse=True
-        )
+        # 按引用数取前 5 篇
+        sorted_papers = heapq.nlargest(5, papers, key=_citation_key)
 
         # 从摘要中提取关键发现
         findings_parts = []
@@ -373,16 +475,32 @@ class ParallelResearchRunner:
     """
     并行研究执行器
 
-    并行执行多个子问题的研究，提高效率。
+    基于 asyncio 并发执行多个子问题的研究，提高效率。
     """
 
     def __init__(
         self,
         qwen_api_key: Optional[str] = None,
-        max_workers: int = 3
+        max_workers: int = 3,
+        use_cache: bool = True
     ):
+        """
+        Args:
+            qwen_api_key: 通义千问 API Key
+            max_workers: 并发度基数
+            use_cache: 是否启用搜索 / LLM 压缩的磁盘缓存
+        """
         self.qwen_api_key = qwen_api_key
         self.max_workers = max_workers
+        # 搜索器（含 HTTP 连接池）进程内共享，多次 run、多个协调器之间复用
+        self.searcher = get_default_searcher(cached=use_cache)
+        self.llm_cache = DiskCache("llm", ttl_seconds=7 * 86400) if use_cache else None
+        # 研究员无状态，所有子问题、多次 run 共享同一个实例（共享搜索器与 LLM 客户端）
+        self.agent = ResearchAgent(
+            searcher=self.searcher,
+            llm_cache=self.llm_cache,
+            llm_client=get_qwen_client(qwen_api_key) if qwen_api_key else None
+        )
 
     def run(
         self,
@@ -390,49 +508,106 @@ class ParallelResearchRunner:
         limit_per_question: int = 5
     ) -> List[ResearchResult]:
         """
-        并行执行多个子问题的研究
+        并行执行多个子问题的研究（同步封装）
 
         Args:
             sub_questions: 子问题列表
             limit_per_question: 每个问题的论文数量限制
 
         Returns:
-            List[ResearchResult]: 研究结果列表
+            List[ResearchResult]: 研究结果列表（与 sub_questions 顺序一致）
         """
-        results = []
+        async def run_and_close() -> List[ResearchResult]:
+            try:
+                return await self.run_async(sub_questions, limit_per_question)
+            finally:
+                await aclose_async_client()
+
+        return asyncio.run(run_and_close())
+
+    async def run_async(
+        self,
+        sub_questions: List[SubQuestion],
+        limit_per_question: int = 5
+    ) -> List[ResearchResult]:
+        """
+        异步并发执行多个子问题的研究
+
+        Args:
+            sub_questions: 子问题列表
+            limit_per_question: 每个问题的论文数量限制
+
+        Returns:
+            List[ResearchResult]: 研究结果列表（与 sub_questions 顺序一致）
+        """
+        agent = self.agent
+
+        # 限制同时进行的搜索数，避免触发 API 限流
+        semaphore = asyncio.Semaphore(self.max_workers)
 
-        # 创建统一搜索器（共享）
-        searcher = UnifiedSearch()
+        async def search_with_limit(sq: SubQuestion) -> List[dict]:
+            async with semaphore:
+                return await asyncio.to_thread(agent._search_papers, sq, limit_per_question)
 
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            # 提交所有任务
-            future_to_question = {}
-            for sq in sub_questions:
-                agent = ResearchAgent(
-                    qwen_api_key=self.qwen_api_key,
-                    searcher=searcher
+        # 阶段1：并发搜索所有子问题
+        searched = await asyncio.gather(
+            *(search_with_limit(sq) for sq in sub_questions),
+            return_exceptions=True
+        )
+
+        outcomes: list = []
+        pending = []  # 需要压缩的子问题下标
+        for i, papers in enumerate(searched):
+            if isinstance(papers, BaseException):
+                outcomes.append(papers)
+            elif not papers:
+                outcomes.append(agent._no_papers_result(sub_questions[i]))
+            else:
+                outcomes.append(None)
+                pending.append(i)
+
+        # 阶段2：所有压缩 prompt 一次性批量提交
+        contents: list = [None] * len(pending)
+        if agent.llm_client and pending:
+            prompts = [
+                agent._build_compress_prompt(sub_questions[i], searched[i]) for i in pending
+            ]
+            contents = [agent._get_cached_compression(prompt) for prompt in prompts]
+            missing = [j for j, content in enumerate(contents) if content is None]
+            if missing:
+                fresh = await agent.llm_client.chat_batch_async(
+                    [prompts[j] for j in missing], **agent.COMPRESS_LLM_OPTIONS
                 )
-                future = executor.submit(agent.research, sq, limit_per_question)
-                future_to_question[future] = sq
-
-            # 收集结果
-            for future in as_completed(future_to_question):
-                sq = future_to_question[future]
-                try:
-                    result = future.result()
-                    results.append(result)
-                    print(f"[ResearchRunner] 完成: {sq.question[:30]}...")
-                except Exception as e:
-                    print(f"[ResearchRunner] 研究出错: {sq.question[:30]}... - {e}")
-                    # 返回空结果
-                    results.append(ResearchResult(
-                        sub_question=sq.question,
-                        purpose=sq.purpose,
-                        papers_found=0,
-                        compressed_findings="研究过程出错",
-                        key_points=[],
-                        sources=[]
-                    ))
+                for j, content in zip(missing, fresh):
+                    contents[j] = content
+                    if isinstance(content, str):
+                        agent._set_cached_compression(prompts[j], content)
+
+        for i, content in zip(pending, contents):
+            sq, papers = sub_questions[i], searched[i]
+            result = None
+            if isinstance(content, BaseException):
+                print(f"[ResearchAgent] LLM 压缩出错: {type(content).__name__}: {content}")
+            elif content is not None:
+                result = agent._result_from_response(sq, papers, content)
+            outcomes[i] = result or agent._compress_fallback(sq, papers)
+
+        results = []
+        for sq, outcome in zip(sub_questions, outcomes):
+            if isinstance(outcome, BaseException):
+                print(f"[ResearchRunner] 研究出错: {sq.question[:30]}... - {outcome}")
+                # 返回空结果
+                results.append(ResearchResult(
+                    sub_question=sq.question,
+                    purpose=sq.purpose,
+                    papers_found=0,
+                    compressed_findings="研究过程出错",
+                    key_points=[],
+                    sources=[]
+                ))
+            else:
+                print(f"[ResearchRunner] 完成: {sq.question[:30]}...")
+                results.append(outcome)
 
         return results
 
@@ -9,6 +9,7 @@
 - 动态研究轮数
 - 显式反思过程
 """
+import time
 from typing import Optional, Callable, List, Dict
 from dataclasses import dataclass, field
 from datetime import datetime
@@ -17,10 +18,13 @@ import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 
+from tools.search import get_default_searcher
+from utils.cache import DiskCache
 from utils.llm_client import QwenClient
 from utils.logger import get_agent_logger
 
 from .supervisor import SupervisorAgent, SupervisorResult
+from .researcher import Researcher
 from .state import AgentState
 from .prompts import build_report_prompt
 
@@ -33,6 +37,7 @@ class DeepResearchV2Config:
     max_rounds: int = 10            # 最大研究轮数
     timeout_seconds: int = 300      # 超时时间（秒）
     use_fulltext: bool = False      # 是否使用全文（暂未实现）
+    use_cache: bool = True          # 是否启用搜索 / LLM 压缩 / Supervisor 响应的磁盘缓存（data/cache）
 
 
 @dataclass
@@ -56,11 +61,11 @@ class DeepResearchV2Output:
 
     @property
     def total_sources(self) -> int:
-        return len(self.state.get_all_sources())
+        return self.state.unique_source_count
 
     @property
-    def thinking_history(self) -> List[str]:
-        return self.state.thinking_history
+    def thinking_history(self) -> List[Dict]:
+        return list(self.state.thinking_history)
 
 
 class DeepResearchV2:
@@ -96,17 +101,25 @@ class DeepResearchV2:
         self.progress_callback = progress_callback
 
         self.llm_client = QwenClient(api_key=qwen_api_key) if qwen_api_key else None
+        use_cache = self.config.use_cache
+        researcher = Researcher(
+            qwen_api_key=qwen_api_key,
+            searcher=get_default_searcher(cached=use_cache),
+            llm_cache=DiskCache("llm", ttl_seconds=7 * 86400) if use_cache else None
+        )
         self.supervisor = SupervisorAgent(
             qwen_api_key=qwen_api_key,
+            researcher=researcher,
             max_rounds=self.config.max_rounds,
-            progress_callback=self._supervisor_progress
+            progress_callback=self._supervisor_progress,
+            llm_cache=DiskCache("supervisor", ttl_seconds=86400) if use_cache else None
         )
 
     def _report_progress(self, message: str, progress: float):
         """报告进度"""
         if self.progress_callback:
             self.progress_callback(message, progress)
-        log.info(f"[V2] {message} ({progress*100:.0f}%)")
+        log.info("[V2] %s (%.0f%%)", message, progress * 100)
 
     def _supervisor_progress(self, message: str, progress: float):
         """Supervisor 进度（映射到 0-80%）"""
@@ -123,7 +136,7 @@ class DeepResearchV2:
         Returns:
             DeepResearchV2Output: 研究输出
         """
-        start_time = datetime.now()
+        start_time = time.perf_counter()
 
         log.info(f"[V2] 开始深度研究: {query[:50]}...")
         self._report_progress("开始研究...", 0.0)
@@ -138,13 +151,13 @@ class DeepResearchV2:
             report_markdown = self._generate_report(query, state)
 
             # 计算耗时
-            duration = (datetime.now() - start_time).total_seconds()
+            duration = time.perf_counter() - start_time
 
             self._report_progress("研究完成", 1.0)
 
             # 计算搜索和筛选统计
-            total_searched = sum(len(rn.papers) for rn in state.raw_notes)
-            total_selected = len(state.get_all_sources())
+            total_searched = state.papers_searched
+            total_selected = state.unique_source_count
 
             # 构建元数据
             metadata = {
@@ -168,7 +181,7 @@ class DeepResearchV2:
 
         except Exception as e:
             log.error(f"[V2] 研究出错: {e}")
-            duration = (datetime.now() - start_time).total_seconds()
+            duration = time.perf_counter() - start_time
 
             # 返回错误报告
             error_report = f"""## ⚠️ 研究出错
@@ -129,6 +129,63 @@ RESEARCHER_COMPRESS_PROMPT = """你是一个严谨的学术研究助手。你的
 """
 
 
+# 批量压缩：多个研究任务合并为一次调用（batch prompting）
+RESEARCHER_BATCH_COMPRESS_PROMPT = """你是一个严谨的学术研究助手。下面有 {task_count} 个相互独立的研究任务，请对**每个任务分别**：
+1. 严格筛选与该任务研究主题**直接相关**的论文（只能从该任务自己的论文列表中选）
+2. 基于相关论文总结研究发现
+
+{task_sections}
+
+## 输出要求
+
+请输出一个 JSON 数组，按任务顺序包含 {task_count} 个结果对象（第 i 个对象对应 TASK i）：
+```json
+[
+  {{
+    "findings": "基于相关论文的综合发现（100-200字，必须有具体内容支撑）",
+    "key_points": ["关键要点1（基于论文的具体发现）", "关键要点2", "关键要点3"],
+    "relevant_papers": [
+      {{
+        "title": "论文完整标题",
+        "year": 年份,
+        "relevance_score": 5,
+        "key_contribution": "该论文的核心贡献（20字内）"
+      }}
+    ],
+    "gaps": "研究缺口或需要进一步探索的方向（可选）"
+  }}
+]
+```
+
+## 相关性评分标准（relevance_score）
+- 5分：直接研究该问题的核心论文（必选）
+- 4分：深入讨论问题某一方面的重要论文（应选）
+- 3分：提供相关背景的论文（可选，优先级低）
+- 1-2分：仅间接相关，**不要包含**
+
+## 筛选原则
+1. 只包含 relevance_score >= 4 的论文
+2. 平衡新旧论文：ARXIV代表最新进展，OPENALEX代表经典文献
+3. 不要只看引用数，新论文引用低但可能更切题
+4. 某个任务无高度相关论文时，在该任务的结果中诚实说明
+"""
+
+RESEARCHER_BATCH_TASK_SECTION = """### TASK {index}
+
+#### 研究主题
+{topic}
+
+#### 搜索关键词
+{keywords}
+
+#### 重点关注
+{focus_points}
+
+#### 搜索到的论文
+{papers_text}
+"""
+
+
 # ============================================================
 # Report Generation Prompt（报告生成）
 # ============================================================
@@ -191,7 +248,9 @@ def format_papers_for_prompt(papers: list) -> str:
         source = p.get('source', 'unknown').upper()
         year = p.get('year', 'N/A')
         citations = p.get('citation_count', 0) or 0
-        abstract = p.get('abstract', '')[:400] if p.get('abstract') else '（无摘要）'
+        # 单次查找；短于 400 字的摘要切片直接返回原字符串，不产生拷贝
+        abstract = p.get('abstract')
+        abstract = abstract[:400] if abstract else '（无摘要）'
 
         lines.append(
             f"[{i}] [{source}] {p.get('title', 'Unknown')}\n"
@@ -224,6 +283,27 @@ def build_researcher_prompt(
     )
 
 
+def build_batched_researcher_prompt(
+    tasks: list,
+    papers_per_task: list
+) -> str:
+    """构建批量 Researcher 压缩 Prompt（tasks 与 papers_per_task 一一对应）"""
+    sections = [
+        RESEARCHER_BATCH_TASK_SECTION.format(
+            index=i,
+            topic=task.topic,
+            keywords=", ".join(task.search_keywords),
+            focus_points=", ".join(task.focus_points) if task.focus_points else "无特定要求",
+            papers_text=format_papers_for_prompt(papers)
+        )
+        for i, (task, papers) in enumerate(zip(tasks, papers_per_task), 1)
+    ]
+    return RESEARCHER_BATCH_COMPRESS_PROMPT.format(
+        task_count=len(tasks),
+        task_sections="\n".join(sections)
+    )
+
+
 def format_sources_for_prompt(sources: list) -> str:
     """格式化来源列表用于 Prompt（带编号）"""
     if not sources:
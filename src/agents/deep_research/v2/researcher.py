@@ -11,27 +11,40 @@
 - 返回压缩结果，不返回完整论文
 - 原始数据卸载到 raw_notes
 """
+import asyncio
+import heapq
 import json
 import re
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Optional
 from dataclasses import dataclass, field
 from datetime import datetime
 
 import sys
+from contextlib import closing
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 
-from tools.search import UnifiedSearch
-from utils.llm_client import QwenClient
+from tools.paper_ranker import drop_near_duplicates, select_within_budget
+from tools.search import UnifiedSearch, get_default_searcher
+from utils import json_utils
+from utils.json_utils import JsonObjectScanner, find_json_object
+from utils.cache import DiskCache
+from utils.llm_client import QwenClient, aclose_async_client
 from utils.logger import get_agent_logger
+from utils.text_utils import normalize_title
 
 from .tools import ConductResearch, SearchStrategy
-from .prompts import build_researcher_prompt
+from .prompts import build_researcher_prompt, build_batched_researcher_prompt
 
 log = get_agent_logger()
 
+# LLM 响应中的 JSON 提取（模块级预编译）
+_JSON_FENCE_RE = re.compile(r'```json\s*([\s\S]*?)\s*```')
+_JSON_BRACE_RE = re.compile(r'\{[\s\S]*\}')
 
-@dataclass
+
+@dataclass(slots=True)
 class CompressedResearch:
     """压缩后的研究结果（返回给 Supervisor）"""
     topic: str                      # 研究主题
@@ -44,29 +57,24 @@ class CompressedResearch:
 
     def to_message(self) -> str:
         """转换为 Supervisor 可读的消息"""
-        sources_str = "\n".join([
-            f"  - [{s.get('year', 'N/A')}] {s.get('title', 'Unknown')[:60]}..."
-            for s in self.sources[:5]
-        ])
-
-        msg = f"""### 研究结果：{self.topic}
-
-**核心发现：**
-{self.findings}
-
-**关键要点：**
-{chr(10).join([f"- {p}" for p in self.key_points])}
-
-**来源论文（{self.papers_selected}/{self.papers_searched} 篇相关）：**
-{sources_str}
-"""
+        parts = [
+            f"### 研究结果：{self.topic}\n\n",
+            "**核心发现：**\n", self.findings, "\n\n",
+            "**关键要点：**\n", "\n".join(f"- {p}" for p in self.key_points), "\n\n",
+            f"**来源论文（{self.papers_selected}/{self.papers_searched} 篇相关）：**\n",
+            "\n".join(
+                f"  - [{s.get('year', 'N/A')}] {s.get('title', 'Unknown')[:60]}..."
+                for s in self.sources[:5]
+            ),
+            "\n"
+        ]
         if self.gaps:
-            msg += f"\n**研究缺口：** {self.gaps}"
+            parts.append(f"\n**研究缺口：** {self.gaps}")
 
-        return msg
+        return "".join(parts)
 
 
-@dataclass
+@dataclass(slots=True)
 class RawResearchData:
     """原始研究数据（用于卸载）"""
     topic: str
@@ -85,33 +93,55 @@ class Researcher:
     使用方式：
     ```python
     researcher = Researcher(qwen_api_key="...")
-    task = ConductResearch(topic="...", search_keywords=["..."])
+    task = ConductResearch(topic="...", search_keywords=("...",))
     result, raw_data = researcher.research(task, round_number=1)
     ```
     """
 
+    # 压缩调用的 LLM 参数
+    COMPRESS_LLM_OPTIONS = {
+        "task_type": "compress",
+        "max_tokens": 1500,
+        "temperature": 0.3,
+        "timeout": 30.0
+    }
+
+    # 逐个任务压缩时同时进行的 LLM 调用数上限
+    COMPRESS_CONCURRENCY = 4
+
+    # 压缩模型（qwen-plus）单次输出 token 上限；批量压缩按此拆批，每批 n × max_tokens 不超过它
+    COMPRESS_MAX_OUTPUT_TOKENS = 8192
+    COMPRESS_BATCH_SIZE = COMPRESS_MAX_OUTPUT_TOKENS // COMPRESS_LLM_OPTIONS["max_tokens"]
+
+    # 单个任务写入压缩 prompt 的论文部分字符预算（超出时按 BM25 综合分保留）
+    COMPRESS_PROMPT_CHARS = 8000
+
     def __init__(
         self,
         qwen_api_key: Optional[str] = None,
         searcher: Optional[UnifiedSearch] = None,
-        papers_per_search: int = 15
+        papers_per_search: int = 15,
+        llm_cache: Optional[DiskCache] = None
     ):
         """
         初始化研究员
 
         Args:
             qwen_api_key: 通义千问 API Key
-            searcher: 统一搜索器（可共享）
+            searcher: 统一搜索器（默认使用进程内共享的搜索器）
             papers_per_search: 每次搜索的论文数量
+            llm_cache: LLM 压缩结果磁盘缓存（可选）
         """
         self.llm_client = QwenClient(api_key=qwen_api_key) if qwen_api_key else None
-        self.searcher = searcher or UnifiedSearch()
+        self.searcher = searcher or get_default_searcher()
         self.papers_per_search = papers_per_search
+        self.llm_cache = llm_cache
 
     def research(
         self,
         task: ConductResearch,
-        round_number: int = 1
+        round_number: int = 1,
+        papers: Optional[List[Dict]] = None
     ) -> tuple[CompressedResearch, RawResearchData]:
         """
         执行研究任务
@@ -119,6 +149,7 @@ class Researcher:
         Args:
             task: 研究任务
             round_number: 当前轮数
+            papers: 已提前搜索到的论文（可选，提供时跳过搜索）
 
         Returns:
             (CompressedResearch, RawResearchData): 压缩结果和原始数据
@@ -127,7 +158,8 @@ class Researcher:
         log.debug(f"[Researcher] 关键词: {task.search_keywords}, 策略: {task.strategy}")
 
         # 1. 搜索论文
-        papers = self._search_papers(task)
+        if papers is None:
+            papers = self._search_papers(task)
 
         # 2. 创建原始数据记录
         raw_data = RawResearchData(
@@ -149,10 +181,40 @@ class Researcher:
         log.info(f"[Researcher] 完成研究: {task.topic}, 筛选 {result.papers_selected}/{result.papers_searched} 篇")
         return result, raw_data
 
+    async def research_async(
+        self,
+        task: ConductResearch,
+        round_number: int = 1
+    ) -> tuple[CompressedResearch, RawResearchData]:
+        """
+        异步执行研究任务（与 research 行为一致）
+
+        搜索在线程中执行（arXiv 客户端是同步库），LLM 压缩走 chat_async，
+        多个任务可用 asyncio.gather 并发执行。
+        """
+        log.info(f"[Researcher] 开始研究: {task.topic}")
+
+        papers = await asyncio.to_thread(self._search_papers, task)
+        raw_data = RawResearchData(
+            topic=task.topic,
+            keywords=task.search_keywords,
+            papers=papers
+        )
+
+        if not papers:
+            log.warning(f"[Researcher] 未找到相关论文: {task.topic}")
+            return self._empty_result(task), raw_data
+
+        if self.llm_client:
+            result = await self._compress_with_llm_async(task, papers, raw_data)
+        else:
+            result = self._compress_fallback(task, papers)
+
+        log.info(f"[Researcher] 完成研究: {task.topic}, 筛选 {result.papers_selected}/{result.papers_searched} 篇")
+        return result, raw_data
+
     def _search_papers(self, task: ConductResearch) -> List[Dict]:
         """搜索论文"""
-        all_papers = []
-
         # 根据策略调整搜索量
         limit = self.papers_per_search
         if task.strategy == SearchStrategy.FOCUSED:
@@ -160,33 +222,26 @@ class Researcher:
         elif task.strategy == SearchStrategy.COMPARISON:
             limit = self.papers_per_search  # 对比搜索保持数量
 
-        # 使用多个关键词搜索
-        for keyword in task.search_keywords[:3]:
-            try:
-                result = self.searcher.search(keyword, limit=limit)
-                for paper in result.papers:
-                    paper_dict = {
-                        "title": paper.title,
-                        "authors": paper.authors[:3],
-                        "year": paper.year,
-                        "abstract": paper.abstract,
-                        "url": paper.url,
-                        "source": paper.source,
-                        "citation_count": paper.citation_count,
-                        "arxiv_id": getattr(paper, 'arxiv_id', None)
-                    }
-                    all_papers.append(paper_dict)
-            except Exception as e:
-                log.error(f"[Researcher] 搜索 '{keyword}' 出错: {e}")
-
-        # 去重
+        # 使用多个关键词并发搜索（总耗时约等于最慢的一次；单个关键词出错返回空结果）
+        # 按归一化标题去重（保留首次出现）
         seen_titles = set()
         unique_papers = []
-        for p in all_papers:
-            title_lower = p["title"].lower().strip()
-            if title_lower not in seen_titles:
-                seen_titles.add(title_lower)
-                unique_papers.append(p)
+        for result in self.searcher.search_many(task.search_keywords[:3], limit=limit):
+            for paper in result.papers:
+                norm_title = normalize_title(paper.title or "")
+                if norm_title in seen_titles:
+                    continue
+                seen_titles.add(norm_title)
+                unique_papers.append({
+                    "title": paper.title,
+                    "authors": paper.authors[:3],
+                    "year": paper.year,
+                    "abstract": paper.abstract,
+                    "url": paper.url,
+                    "source": paper.source,
+                    "citation_count": paper.citation_count,
+                    "arxiv_id": getattr(paper, 'arxiv_id', None)
+                })
 
         return unique_papers
 
@@ -198,72 +253,333 @@ class Researcher:
     ) -> CompressedResearch:
         """使用 LLM 压缩论文"""
         try:
-            # 构建 Prompt
-            prompt = build_researcher_prompt(
+            prompt = self._build_compress_prompt(task, papers)
+
+            # 调用 LLM（相同主题 + 关键词 + 论文集合命中缓存时跳过）
+            cache_key = self._compression_cache_key(task, papers)
+            content = self._get_cached_compression(task, cache_key)
+            if content is None:
+                content = self._stream_compression(prompt)
+
+            result = self._result_from_response(task, papers, raw_data, content, cache_key)
+            if result:
+                return result
+
+        except Exception as e:
+            log.error(f"[Researcher] LLM 压缩出错: {e}")
+
+        # 回退方案
+        return self._compress_fallback(task, papers)
+
+    async def _compress_with_llm_async(
+        self,
+        task: ConductResearch,
+        papers: List[Dict],
+        raw_data: RawResearchData
+    ) -> CompressedResearch:
+        """使用 LLM 压缩论文（异步，走 chat_async，可与其它任务的压缩并发）"""
+        try:
+            prompt = self._build_compress_prompt(task, papers)
+
+            cache_key = self._compression_cache_key(task, papers)
+            content = self._get_cached_compression(task, cache_key)
+            if content is None:
+                content = await self.llm_client.chat_async(
+                    prompt=prompt, **self.COMPRESS_LLM_OPTIONS
+                )
+
+            result = self._result_from_response(task, papers, raw_data, content, cache_key)
+            if result:
+                return result
+
+        except Exception as e:
+            log.error(f"[Researcher] LLM 压缩出错: {type(e).__name__}: {e}")
+
+        return self._compress_fallback(task, papers)
+
+    def _build_compress_prompt(self, task: ConductResearch, papers: List[Dict]) -> str:
+        """构建单任务压缩 Prompt"""
+        prompt = build_researcher_prompt(
+            topic=task.topic,
+            keywords=task.search_keywords,
+            papers=self._prompt_papers(task, papers),
+            focus_points=task.focus_points
+        )
+        log.debug(f"[Researcher] 调用 LLM 压缩, prompt 长度: {len(prompt)}")
+        return prompt
+
+    def _get_cached_compression(self, task: ConductResearch, cache_key: str) -> Optional[str]:
+        """读取缓存的压缩响应"""
+        if not self.llm_cache:
+            return None
+        content = self.llm_cache.get(cache_key)
+        if content is not None:
+            log.info(f"[Researcher] 压缩结果命中缓存: {task.topic}")
+        return content
+
+    def _result_from_response(
+        self,
+        task: ConductResearch,
+        papers: List[Dict],
+        raw_data: RawResearchData,
+        content: str,
+        cache_key: str
+    ) -> Optional[CompressedResearch]:
+        """解析压缩响应并构建结果；无法解析返回 None（只缓存能解析的响应）"""
+        # 保存原始响应
+        raw_data.llm_response = content
+
+        parsed = self._parse_response(content)
+        if not parsed:
+            return None
+
+        if self.llm_cache:
+            self.llm_cache.set(cache_key, content)
+        return self._build_result(task, papers, parsed)
+
+    def _stream_compression(self, prompt: str) -> str:
+        """
+        流式调用压缩 LLM，第一个 JSON 对象闭合即停止读取
+
+        模型常在 JSON 之后追加说明文字，提前断开可省下这部分生成时间。
+        没有完整对象时返回全部输出，交给 _parse_response 处理。
+        """
+        scanner = JsonObjectScanner()
+        parts = []
+        stream = self.llm_client.chat_stream(prompt=prompt, **self.COMPRESS_LLM_OPTIONS)
+        with closing(stream):
+            for delta in stream:
+                parts.append(delta)
+                json_text = scanner.feed(delta)
+                if json_text is not None:
+                    return json_text
+        return "".join(parts)
+
+    def research_batch(
+        self,
+        tasks: List[ConductResearch],
+        round_number: int = 1,
+        papers_per_task: Optional[List[Optional[List[Dict]]]] = None
+    ) -> List[tuple[CompressedResearch, RawResearchData]]:
+        """
+        批量执行研究任务（batch prompting）
+
+        各任务分别搜索，未命中缓存的任务把压缩请求合并为一次 LLM 调用，
+        分摊网络往返和 prefill 开销。批量响应解析失败时逐个任务回退到 research 的压缩流程。
+
+        Args:
+            tasks: 研究任务列表
+            round_number: 当前轮数
+            papers_per_task: 与 tasks 对应的已提前搜索到的论文（可选，元素为 None 的任务照常搜索）
+
+        Returns:
+            与 tasks 顺序一致的 (CompressedResearch, RawResearchData) 列表
+        """
+        papers_per_task = list(papers_per_task or [None] * len(tasks))
+        if len(tasks) <= 1:
+            return [self.research(task, round_number, papers) for task, papers in zip(tasks, papers_per_task)]
+        if not self.llm_client:
+            # 无 LLM 时只有搜索 + 摘要回退，各任务直接并发执行
+            with ThreadPoolExecutor(max_workers=len(tasks)) as executor:
+                return list(executor.map(
+                    lambda task, papers: self.research(task, round_number, papers), tasks, papers_per_task
+                ))
+
+        # 1. 所有任务同时搜索（任务 × 关键词 × 搜索源一起发出，各源并发数由 UnifiedSearch 限制）
+        for task in tasks:
+            log.info(f"[Researcher] 开始研究: {task.topic}")
+        unsearched = [i for i, papers in enumerate(papers_per_task) if papers is None]
+        if unsearched:
+            with ThreadPoolExecutor(max_workers=len(unsearched)) as executor:
+                for i, papers in zip(unsearched, executor.map(self._search_papers, [tasks[i] for i in unsearched])):
+                    papers_per_task[i] = papers
+
+        searched = []
+        for task, papers in zip(tasks, papers_per_task):
+            raw_data = RawResearchData(
                 topic=task.topic,
                 keywords=task.search_keywords,
-                papers=papers,
-                focus_points=task.focus_points
+                papers=papers
+            )
+            searched.append((task, papers, raw_data))
+
+        # 2. 有论文且未命中缓存的任务合并压缩（每批不超过 COMPRESS_BATCH_SIZE 个）
+        pending = [
+            i for i, (task, papers, _) in enumerate(searched)
+            if papers and not (
+                self.llm_cache
+                and self.llm_cache.get(self._compression_cache_key(task, papers)) is not None
+            )
+        ]
+        results: Dict[int, CompressedResearch] = {}
+        for start in range(0, len(pending), self.COMPRESS_BATCH_SIZE):
+            chunk = pending[start:start + self.COMPRESS_BATCH_SIZE]
+            if len(chunk) > 1:
+                batch = self._compress_batch_with_llm([searched[i] for i in chunk])
+                results.update(zip(chunk, batch))
+
+        # 3. 其余任务（空结果 / 命中缓存 / 批量失败）：多个待压缩任务并发调用 LLM
+        remaining = []
+        for i, (task, papers, _) in enumerate(searched):
+            if i in results:
+                continue
+            if not papers:
+                log.warning(f"[Researcher] 未找到相关论文: {task.topic}")
+                results[i] = self._empty_result(task)
+            else:
+                remaining.append(i)
+        if len(remaining) > 1:
+            results.update(zip(remaining, self._compress_many([searched[i] for i in remaining])))
+        elif remaining:
+            results[remaining[0]] = self._compress_with_llm(*searched[remaining[0]])
+
+        for i, (task, _, _) in enumerate(searched):
+            log.info(
+                f"[Researcher] 完成研究: {task.topic}, "
+                f"筛选 {results[i].papers_selected}/{results[i].papers_searched} 篇"
             )
 
-            log.debug(f"[Researcher] 调用 LLM 压缩, prompt 长度: {len(prompt)}")
+        return [(results[i], raw_data) for i, (_, _, raw_data) in enumerate(searched)]
+
+    def _compress_many(
+        self,
+        items: List[tuple[ConductResearch, List[Dict], RawResearchData]]
+    ) -> List[CompressedResearch]:
+        """并发压缩多个任务（每个任务一次 LLM 调用，同时进行的调用数不超过 COMPRESS_CONCURRENCY）"""
+        async def compress_all() -> List[CompressedResearch]:
+            semaphore = asyncio.Semaphore(self.COMPRESS_CONCURRENCY)
+
+            async def compress_one(item) -> CompressedResearch:
+                async with semaphore:
+                    return await self._compress_with_llm_async(*item)
 
-            # 调用 LLM
+            try:
+                return await asyncio.gather(*(compress_one(item) for item in items))
+            finally:
+                await aclose_async_client()
+
+        return asyncio.run(compress_all())
+
+    def _compress_batch_with_llm(
+        self,
+        items: List[tuple[ConductResearch, List[Dict], RawResearchData]]
+    ) -> List[CompressedResearch]:
+        """
+        一次 LLM 调用压缩多个任务
+
+        Returns:
+            与 items 顺序一致的结果；响应无法解析或数量不符时返回空列表（由调用方回退）
+        """
+        n = len(items)
+        try:
+            prompt = build_batched_researcher_prompt(
+                [task for task, _, _ in items],
+                [self._prompt_papers(task, papers) for task, papers, _ in items]
+            )
+            log.debug(f"[Researcher] 批量压缩 {n} 个任务, prompt 长度: {len(prompt)}")
+
+            options = self.COMPRESS_LLM_OPTIONS
             content = self.llm_client.chat(
                 prompt=prompt,
-                task_type="compress",
-                max_tokens=1500,
-                temperature=0.3,
-                timeout=30.0
+                task_type=options["task_type"],
+                max_tokens=min(options["max_tokens"] * n, self.COMPRESS_MAX_OUTPUT_TOKENS),
+                temperature=options["temperature"],
+                timeout=options["timeout"] * n
             )
 
-            # 保存原始响应
-            raw_data.llm_response = content
-
-            # 解析响应
             parsed = self._parse_response(content)
+            if isinstance(parsed, dict):
+                parsed = parsed.get("results")
+            if not isinstance(parsed, list) or len(parsed) != n \
+                    or not all(isinstance(item, dict) for item in parsed):
+                log.warning(f"[Researcher] 批量压缩响应无法对应 {n} 个任务，逐个回退")
+                return []
 
-            if parsed:
-                # 构建来源信息
-                sources = self._extract_sources(parsed.get("relevant_papers", []), papers)
-
-                return CompressedResearch(
-                    topic=task.topic,
-                    findings=parsed.get("findings", "无法提取发现"),
-                    key_points=parsed.get("key_points", []),
-                    sources=sources,
-                    gaps=parsed.get("gaps"),
-                    papers_searched=len(papers),
-                    papers_selected=len(sources)
+        except Exception as e:
+            log.error(f"[Researcher] 批量压缩出错: {e}")
+            return []
+
+        results = []
+        for (task, papers, raw_data), item in zip(items, parsed):
+            raw_data.llm_response = content
+            # 按单任务的缓存键分别缓存，之后单独研究同一任务也能命中
+            if self.llm_cache:
+                self.llm_cache.set(
+                    self._compression_cache_key(task, papers),
+                    json_utils.dumps(item)
                 )
+            results.append(self._build_result(task, papers, item))
+        return results
 
-        except Exception as e:
-            log.error(f"[Researcher] LLM 压缩出错: {e}")
+    def _build_result(
+        self,
+        task: ConductResearch,
+        papers: List[Dict],
+        parsed: Dict
+    ) -> CompressedResearch:
+        """由解析后的 LLM 输出构建压缩结果"""
+        sources = self._extract_sources(parsed.get("relevant_papers", []), papers)
 
-        # 回退方案
-        return self._compress_fallback(task, papers)
+        return CompressedResearch(
+            topic=task.topic,
+            findings=parsed.get("findings", "无法提取发现"),
+            key_points=parsed.get("key_points", []),
+            sources=sources,
+            gaps=parsed.get("gaps"),
+            papers_searched=len(papers),
+            papers_selected=len(sources)
+        )
+
+    def _prompt_papers(self, task: ConductResearch, papers: List[Dict]) -> List[Dict]:
+        """写入压缩 prompt 的论文：去掉标题近重复的版本，再按字符预算截取最相关的"""
+        return select_within_budget(
+            drop_near_duplicates(papers),
+            [task.topic, *task.search_keywords],
+            self.COMPRESS_PROMPT_CHARS
+        )
+
+    def _compression_cache_key(self, task: ConductResearch, papers: List[Dict]) -> str:
+        """压缩缓存键：模型参数 + 主题 + 关键词 + 关注点 + 论文集合（与顺序无关）"""
+        options = self.COMPRESS_LLM_OPTIONS
+        return DiskCache.make_key(
+            QwenClient.MODELS[QwenClient.TASK_MODEL_MAP[options["task_type"]]],
+            options["temperature"],
+            options["max_tokens"],
+            task.topic,
+            sorted(task.search_keywords),
+            sorted(task.focus_points or []),
+            sorted(p["title"] for p in papers)
+        )
 
     def _parse_response(self, content: str) -> Optional[Dict]:
         """解析 LLM 响应"""
         # 尝试直接解析
         try:
-            return json.loads(content)
+            return json_utils.loads(content)
         except json.JSONDecodeError:
             pass
 
-        # 尝试提取 JSON 块
-        json_match = re.search(r'```json\s*([\s\S]*?)\s*```', content)
+        # 尝试提取 JSON 块（批量压缩的响应是数组，只能从代码块中取出）
+        json_match = _JSON_FENCE_RE.search(content)
         if json_match:
             try:
-                return json.loads(json_match.group(1))
+                return json_utils.loads(json_match.group(1))
             except json.JSONDecodeError:
                 pass
 
-        # 尝试提取花括号内容
-        json_match = re.search(r'\{[\s\S]*\}', content)
-        if json_match:
+        # 截取第一个括号平衡的 JSON 对象（单次扫描，跳过字符串中的括号）
+        json_text = find_json_object(content)
+        if json_text:
+            try:
+                return json_utils.loads(json_text)
+            except json.JSONDecodeError:
+                pass
+
+        # 最后手段：第一个 { 到最后一个 } 之间的内容
+        json_match = _JSON_BRACE_RE.search(content)
+        if json_match and json_match.group() != json_text:
             try:
-                return json.loads(json_match.group())
+                return json_utils.loads(json_match.group())
             except json.JSONDecodeError:
                 pass
 
@@ -277,26 +593,38 @@ class Researcher:
         """提取来源论文信息"""
         sources = []
 
-        for rp in relevant_papers:
-            rp_title = rp.get("title", "").lower().strip()
+        # 归一化标题 → 论文（保留首次出现），精确命中 O(1)
+        norm_titles = [
+            normalize_title(p.get("title", ""))
+            for p in all_papers
+        ]
+        title_index: Dict[str, Dict] = {}
+        for norm, p in zip(norm_titles, all_papers):
+            title_index.setdefault(norm, p)
 
-            # 在原始论文中查找匹配
-            for p in all_papers:
-                p_title = p.get("title", "").lower().strip()
+        for rp in relevant_papers:
+            rp_title = normalize_title(rp.get("title") or "")
+
+            # 在原始论文中查找匹配：先精确，再子串模糊匹配
+            p = title_index.get(rp_title)
+            if p is None:
+                p = next(
+                    (paper for norm, paper in zip(norm_titles, all_papers)
+                     if rp_title in norm or norm in rp_title),
+                    None
+                )
 
-                # 模糊匹配
-                if rp_title in p_title or p_title in rp_title:
-                    sources.append({
-                        "title": p["title"],
-                        "authors": p.get("authors", []),
-                        "year": p.get("year"),
-                        "url": p.get("url"),
-                        "source": p.get("source"),
-                        "citation_count": p.get("citation_count"),
-                        "abstract": p.get("abstract", ""),  # 保留摘要
-                        "key_contribution": rp.get("key_contribution", "")
-                    })
-                    break
+            if p is not None:
+                sources.append({
+                    "title": p["title"],
+                    "authors": p.get("authors", []),
+                    "year": p.get("year"),
+                    "url": p.get("url"),
+                    "source": p.get("source"),
+                    "citation_count": p.get("citation_count"),
+                    "abstract": p.get("abstract", ""),  # 保留摘要
+                    "key_contribution": rp.get("key_contribution", "")
+                })
 
         # 确保来源平衡：检查是否有 arXiv 论文
         arxiv_in_sources = [s for s in sources if s.get("source") == "arxiv"]
@@ -327,18 +655,18 @@ class Researcher:
         """回退方案：基于摘要的简单压缩"""
         log.info("[Researcher] 使用回退方案（摘要提取）")
 
-        # 按引用数排序
-        sorted_papers = sorted(
+        # 按引用数、年份取前 5 篇（只需部分排序；并列时保持原顺序，与稳定排序一致）
+        top_papers = heapq.nlargest(
+            5,
             papers,
-            key=lambda x: (x.get("citation_count", 0) or 0, x.get("year", 0) or 0),
-            reverse=True
+            key=lambda x: (x.get("citation_count") or 0, x.get("year") or 0)
         )
 
         # 提取关键发现
         findings_parts = []
         key_points = []
 
-        for i, p in enumerate(sorted_papers[:5], 1):
+        for p in top_papers:
             abstract = p.get("abstract", "")
             if not abstract:
                 continue
@@ -352,7 +680,7 @@ class Researcher:
 
         # 提取来源
         sources = []
-        for p in sorted_papers[:5]:
+        for p in top_papers:
             sources.append({
                 "title": p["title"],
                 "authors": p.get("authors", []),
@@ -404,9 +732,9 @@ if __name__ == "__main__":
     # 创建研究任务
     task = ConductResearch(
         topic="Transformer 自注意力机制的原理和应用",
-        search_keywords=["Transformer self-attention", "attention mechanism NLP"],
+        search_keywords=("Transformer self-attention", "attention mechanism NLP"),
         strategy=SearchStrategy.FOCUSED,
-        focus_points=["并行计算", "位置编码"]
+        focus_points=("并行计算", "位置编码")
     )
 
     # 执行研究
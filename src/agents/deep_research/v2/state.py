@@ -5,11 +5,20 @@
 2. 状态覆盖（显式指定）
 3. raw_notes / notes 分离
 """
-from typing import List, Dict, Any, Optional, Union
-from dataclasses import dataclass, field
+from collections import deque
+from typing import Callable, ClassVar, Deque, List, Dict, Any, Optional, Union, get_origin
+from dataclasses import dataclass, field, fields, replace
 from datetime import datetime
 from enum import Enum
 
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+from tools.paper_ranker import NearDuplicateIndex
+from utils import json_utils
+from utils.text_utils import normalize_title
+
 
 class MessageRole(str, Enum):
     """消息角色"""
@@ -19,7 +28,7 @@ class MessageRole(str, Enum):
     TOOL = "tool"
 
 
-@dataclass
+@dataclass(slots=True)
 class Message:
     """对话消息"""
     role: MessageRole
@@ -31,6 +40,8 @@ class Message:
     def to_dict(self) -> Dict:
         """转换为 API 格式"""
         d = {"role": self.role.value, "content": self.content}
+        if self.tool_call_id is None and self.tool_calls is None:
+            return d  # 普通消息（最常见）直接返回
         if self.tool_call_id:
             d["tool_call_id"] = self.tool_call_id
         if self.tool_calls:
@@ -38,7 +49,7 @@ class Message:
         return d
 
 
-@dataclass
+@dataclass(slots=True)
 class ResearchNote:
     """研究笔记（压缩后的发现）"""
     topic: str                      # 研究主题
@@ -49,7 +60,7 @@ class ResearchNote:
     created_at: datetime = field(default_factory=datetime.now)
 
 
-@dataclass
+@dataclass(slots=True)
 class RawNote:
     """原始笔记（未压缩的完整数据）"""
     topic: str
@@ -58,8 +69,18 @@ class RawNote:
     round_number: int
     created_at: datetime = field(default_factory=datetime.now)
 
+    def to_record(self) -> Dict[str, Any]:
+        """转换为可 JSON 序列化的记录"""
+        return {
+            "topic": self.topic,
+            "papers": self.papers,
+            "search_keywords": self.search_keywords,
+            "round_number": self.round_number,
+            "created_at": self.created_at.isoformat()
+        }
 
-@dataclass
+
+@dataclass(slots=True)
 class AgentState:
     """
     Agent 状态
@@ -67,9 +88,16 @@ class AgentState:
     核心设计：
     1. messages: Supervisor 的对话历史
     2. notes: 压缩后的研究笔记（Supervisor 使用）
-    3. raw_notes: 原始完整数据（外部存储，不进入 LLM）
+    3. raw_notes: 原始完整数据（不进入 LLM）
     4. research_brief: 研究主题描述
+
+    raw_notes / thinking_history 为定长队列：超出上限时最早的记录被挤出，
+    设置了 spill_path 则先以 JSONL 追加写入该文件，避免长会话内存无限增长。
     """
+    # raw_notes / thinking_history 在内存中保留的最大条数
+    RAW_NOTES_LIMIT: ClassVar[int] = 64
+    THINKING_LIMIT: ClassVar[int] = 64
+
     # 原始查询
     query: str = ""
 
@@ -83,7 +111,7 @@ class AgentState:
     notes: List[ResearchNote] = field(default_factory=list)
 
     # 原始完整数据（卸载到外部）
-    raw_notes: List[RawNote] = field(default_factory=list)
+    raw_notes: Deque[RawNote] = field(default_factory=deque)
 
     # 当前轮数
     current_round: int = 0
@@ -99,31 +127,71 @@ class AgentState:
 
     # 思考历史（think_tool 输出）- 改为带轮次的结构
     # 格式: [{"round": 1, "thought": "..."}, ...]
-    thinking_history: List[Dict[str, Any]] = field(default_factory=list)
+    thinking_history: Deque[Dict[str, Any]] = field(default_factory=deque)
 
     # 元数据
     metadata: Dict[str, Any] = field(default_factory=dict)
 
+    # 被挤出的 raw_notes / thinking_history 溢出文件（JSONL，None 表示直接丢弃）
+    spill_path: Optional[Path] = None
+
+    # 累计搜索到的论文数（含已溢出的 raw_notes）
+    papers_searched: int = 0
+
+    # get_all_sources 的增量缓存（内部使用，不参与 init / repr / 比较）
+    _sources_cache: List[Dict] = field(default_factory=list, init=False, repr=False, compare=False)
+    _sources_seen: set = field(default_factory=set, init=False, repr=False, compare=False)
+    _sources_notes: Optional[List[ResearchNote]] = field(default=None, init=False, repr=False, compare=False)
+    _sources_count: int = field(default=0, init=False, repr=False, compare=False)
+
+    # 已存入 raw_notes 的论文标题索引（跨轮去重）
+    _paper_index: NearDuplicateIndex = field(default_factory=NearDuplicateIndex, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.raw_notes = deque(self.raw_notes, maxlen=self.RAW_NOTES_LIMIT)
+        self.thinking_history = deque(self.thinking_history, maxlen=self.THINKING_LIMIT)
+
     def add_message(self, role: MessageRole, content: str, **kwargs):
         """添加消息"""
         self.messages.append(Message(role=role, content=content, **kwargs))
 
     def add_note(self, note: ResearchNote):
-        """添加研究笔记"""
+        """添加研究笔记（同时更新来源索引）"""
         self.notes.append(note)
         self.current_round = max(self.current_round, note.round_number)
+        self._index_sources()
 
     def add_raw_note(self, raw_note: RawNote):
-        """添加原始笔记（卸载）"""
+        """
+        添加原始笔记（只保留最近 RAW_NOTES_LIMIT 条，累计搜索论文数单独计数）
+
+        与此前轮次标题近重复的论文不再重复存储（内存队列和溢出文件都不再保存重复论文）。
+        """
+        self.papers_searched += len(raw_note.papers)
+        new_papers = [paper for paper in raw_note.papers if self._paper_index.add(paper)]
+        if len(new_papers) < len(raw_note.papers):
+            raw_note = replace(raw_note, papers=new_papers)
+        if len(self.raw_notes) == self.raw_notes.maxlen:
+            self._spill({"type": "raw_note", **self.raw_notes[0].to_record()})
         self.raw_notes.append(raw_note)
 
     def add_thinking(self, thought: str, round_number: int = 0):
         """添加思考记录（带轮次）"""
+        if len(self.thinking_history) == self.thinking_history.maxlen:
+            self._spill({"type": "thinking", **self.thinking_history[0]})
         self.thinking_history.append({
             "round": round_number,
             "thought": thought
         })
 
+    def _spill(self, record: Dict[str, Any]):
+        """把即将被挤出的记录追加到溢出文件"""
+        if self.spill_path is None:
+            return
+        self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.spill_path, "a", encoding="utf-8") as f:
+            f.write(json_utils.dumps(record) + "\n")
+
     def mark_complete(self, reason: str):
         """标记完成"""
         self.is_complete = True
@@ -150,16 +218,72 @@ class AgentState:
         return "\n---\n\n".join(parts)
 
     def get_all_sources(self) -> List[Dict]:
-        """获取所有来源论文（去重）"""
-        seen_titles = set()
-        sources = []
-        for note in self.notes:
+        """获取所有来源论文（按归一化标题去重）
+
+        来源索引在 add_note 时增量维护，这里通常无需再扫描；
+        绕过 add_note 直接追加到 notes 的笔记在此补齐。返回的列表为共享缓存，调用方不应修改。
+        """
+        self._index_sources()
+        return self._sources_cache
+
+    @property
+    def unique_source_count(self) -> int:
+        """去重后的来源论文数（只索引新增笔记，供每轮的饱和度检测使用）"""
+        self._index_sources()
+        return len(self._sources_seen)
+
+    def _index_sources(self):
+        """把尚未索引的笔记来源加入去重索引；notes 被整体替换或缩短时重建"""
+        if self._sources_notes is not self.notes or len(self.notes) < self._sources_count:
+            self._sources_cache = []
+            self._sources_seen = set()
+            self._sources_notes = self.notes
+            self._sources_count = 0
+
+        for note in self.notes[self._sources_count:]:
             for src in note.sources:
-                title = src.get("title", "").lower().strip()
-                if title and title not in seen_titles:
-                    seen_titles.add(title)
-                    sources.append(src)
-        return sources
+                title = normalize_title(src.get("title") or "")
+                if title and title not in self._sources_seen:
+                    self._sources_seen.add(title)
+                    self._sources_cache.append(src)
+        self._sources_count = len(self.notes)
+
+
+def _make_reducer(name: str, is_sequence: bool) -> Callable[[AgentState, Any], None]:
+    """为单个 AgentState 字段生成更新函数（列表 / 定长队列字段默认追加，其他字段直接覆盖）"""
+
+    def reduce_field(state: AgentState, value: Any) -> None:
+        # 特殊更新格式：{"type": "append" | "override", "value": ...}
+        if isinstance(value, dict) and "type" in value:
+            update_type = value["type"]
+            update_value = value.get("value")
+            if update_type == "override":
+                setattr(state, name, update_value)
+            elif update_type == "append" and is_sequence:
+                current_value = getattr(state, name)
+                if isinstance(current_value, (list, deque)):
+                    if isinstance(update_value, list):
+                        current_value.extend(update_value)
+                    else:
+                        current_value.append(update_value)
+            return
+
+        if is_sequence and isinstance(value, list):
+            current_value = getattr(state, name)
+            if isinstance(current_value, (list, deque)):
+                current_value.extend(value)
+                return
+        setattr(state, name, value)
+
+    return reduce_field
+
+
+# 字段名 -> 更新函数（模块加载时按 AgentState 的字段类型生成一次；内部缓存字段不参与）
+_REDUCER_DISPATCH: Dict[str, Callable[[AgentState, Any], None]] = {
+    f.name: _make_reducer(f.name, (get_origin(f.type) or f.type) in (list, deque))
+    for f in fields(AgentState)
+    if not f.name.startswith("_")
+}
 
 
 class StateReducer:
@@ -190,29 +314,9 @@ class StateReducer:
             更新后的状态（原地修改）
         """
         for key, value in updates.items():
-            if not hasattr(current_state, key):
-                continue
-
-            current_value = getattr(current_state, key)
-
-            # 处理特殊更新格式
-            if isinstance(value, dict) and "type" in value:
-                update_type = value["type"]
-                update_value = value.get("value")
-
-                if update_type == "append" and isinstance(current_value, list):
-                    if isinstance(update_value, list):
-                        current_value.extend(update_value)
-                    else:
-                        current_value.append(update_value)
-                elif update_type == "override":
-                    setattr(current_state, key, update_value)
-            else:
-                # 列表默认追加，其他直接覆盖
-                if isinstance(current_value, list) and isinstance(value, list):
-                    current_value.extend(value)
-                else:
-                    setattr(current_state, key, value)
+            reducer = _REDUCER_DISPATCH.get(key)
+            if reducer is not None:
+                reducer(current_state, value)
 
         return current_state
 
@@ -11,28 +11,127 @@ while not complete:
 - 显式反思（think_tool）
 - 工具调用（Function Calling）
 """
+import asyncio
 import json
 from typing import List, Dict, Optional, Callable, Any
+from collections import deque
 from dataclasses import dataclass
 from datetime import datetime
+import time
+import weakref
+
+import httpx
 
 import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
 
-from utils.llm_client import QwenClient
+from tools.paper_ranker import tokenize
+from utils import json_utils
+from utils.cache import DiskCache
+from utils.llm_client import AsyncRateLimiter, QwenClient, aclose_async_client, get_async_client
+from utils.text_utils import normalize_title
 from utils.logger import get_agent_logger
 
 from .state import AgentState, MessageRole, ResearchNote, RawNote, create_initial_state
 from .tools import (
     ThinkTool, ConductResearch, ResearchComplete,
-    TOOL_SCHEMAS, parse_tool_call, SearchStrategy
+    TOOL_SCHEMAS_JSON, parse_tool_call, SearchStrategy
 )
 from .prompts import SUPERVISOR_SYSTEM_PROMPT, SUPERVISOR_START_PROMPT
 from .researcher import Researcher, CompressedResearch, RawResearchData
 
 log = get_agent_logger()
 
+# 请求中除消息历史外的固定参数（JSON 对象成员，不含外层花括号），模块加载时拼好
+_REQUEST_PARAMS = '"tools":' + TOOL_SCHEMAS_JSON + "," + json_utils.dumps({
+    "model": "qwen-plus",  # 使用 plus 模型处理复杂任务
+    "tool_choice": "auto",
+    "max_tokens": 2000,
+    "temperature": 0.3,
+    "stream": True
+})[1:-1]
+
+
+def _slope(values) -> float:
+    """最小二乘拟合直线 y = a·x + b 的斜率 a（x 为 0, 1, 2, ...）"""
+    n = len(values)
+    if n < 2:
+        return 0.0
+    x_mean = (n - 1) / 2
+    y_mean = sum(values) / n
+    numerator = sum((x - x_mean) * (y - y_mean) for x, y in enumerate(values))
+    denominator = sum((x - x_mean) ** 2 for x in range(n))
+    return numerator / denominator
+
+
+@dataclass
+class SaturationConfig:
+    """信息饱和检测参数"""
+    window: int = 4           # 滑动窗口大小（研究任务数）
+    slope_eps: float = 0.1    # 产出曲线斜率不超过该值视为不再增长
+    tail_sum: int = 2         # 最近两次任务新增论文数之和上限
+    min_rounds: int = 3       # 从第几轮开始检测
+
+
+class SaturationDetector:
+    """
+    信息饱和检测（P2-1）
+
+    跟踪每次研究任务的新增论文数与新增要点数，在滑动窗口上拟合产出斜率：
+    两条曲线都不再上升、且最近两次新增论文很少时判定饱和。
+    相比"连续两轮新增 ≤ 1"的计数规则，判定依据是整个窗口的走势，
+    阈值集中在 SaturationConfig 中便于调整。
+    """
+
+    def __init__(self, config: Optional[SaturationConfig] = None):
+        self.config = config or SaturationConfig()
+        self._papers = deque(maxlen=self.config.window)
+        self._findings = deque(maxlen=self.config.window)
+        self._seen_points: set = set()
+
+    def update(self, new_papers: int, key_points: List[str], round_count: int) -> bool:
+        """
+        记录一次研究任务的产出
+
+        Args:
+            new_papers: 本次新增（去重后）论文数
+            key_points: 本次研究要点（与此前要点按归一化文本去重后计为新增发现）
+            round_count: 当前轮数
+
+        Returns:
+            是否判定信息饱和
+        """
+        points = {normalize_title(point) for point in key_points} - {""}
+        new_findings = len(points - self._seen_points)
+        self._seen_points |= points
+
+        self._papers.append(new_papers)
+        self._findings.append(new_findings)
+
+        if round_count < self.config.min_rounds or len(self._papers) < 2:
+            return False
+
+        papers_slope = _slope(self._papers)
+        findings_slope = _slope(self._findings)
+        log.debug(
+            f"[Supervisor] 产出斜率: 论文 {papers_slope:.2f}, 要点 {findings_slope:.2f} "
+            f"(窗口 {list(self._papers)})"
+        )
+        return (
+            papers_slope <= self.config.slope_eps
+            and findings_slope <= self.config.slope_eps
+            and sum(list(self._papers)[-2:]) <= self.config.tail_sum
+        )
+
+
+@dataclass
+class _RunLimits:
+    """单个事件循环内的并发与限流原语（asyncio 原语不能跨事件循环复用）"""
+    research_slots: asyncio.Semaphore   # 同时进行的研究任务（单个任务或一批）
+    research_rate: AsyncRateLimiter     # 研究任务派发速率（搜索 API）
+    llm_rate: AsyncRateLimiter          # Supervisor 自身的 Qwen 调用速率
+
 
 @dataclass
 class SupervisorResult:
@@ -61,12 +160,21 @@ class SupervisorAgent:
     ```
     """
 
+    # Supervisor LLM 调用在超时/连接失败/限流（429）时的最大重试次数
+    LLM_MAX_RETRIES = 2
+
     def __init__(
         self,
         qwen_api_key: Optional[str] = None,
         researcher: Optional[Researcher] = None,
         max_rounds: int = 10,
-        progress_callback: Optional[Callable[[str, float], None]] = None
+        progress_callback: Optional[Callable[[str, float], None]] = None,
+        spill_dir: Optional[Path] = None,
+        llm_cache: Optional[DiskCache] = None,
+        saturation: Optional[SaturationConfig] = None,
+        max_concurrency: int = 5,
+        rpm_limit: int = 60,
+        llm_rpm_limit: int = 60
     ):
         """
         初始化 Supervisor
@@ -76,12 +184,29 @@ class SupervisorAgent:
             researcher: Researcher 实例（可选，默认自动创建）
             max_rounds: 最大研究轮数
             progress_callback: 进度回调 (message, progress_ratio)
+            spill_dir: 被挤出的原始笔记与思考记录的溢出文件目录（可选，每次运行一个文件；默认直接丢弃）
+            llm_cache: Supervisor LLM 响应磁盘缓存（可选；请求体完全相同时直接复用上次的响应）
+            saturation: 信息饱和检测参数（可选，默认 SaturationConfig()）
+            max_concurrency: 同一事件循环内同时进行的研究任务上限（多个 arun 并发时共享）
+            rpm_limit: 每分钟派发的研究任务上限
+            llm_rpm_limit: 每分钟 Supervisor LLM 调用上限
         """
         self.api_key = qwen_api_key
         self.llm_client = QwenClient(api_key=qwen_api_key) if qwen_api_key else None
         self.researcher = researcher or Researcher(qwen_api_key=qwen_api_key)
         self.max_rounds = max_rounds
         self.progress_callback = progress_callback
+        self.spill_dir = spill_dir
+        self.llm_cache = llm_cache
+        self.saturation = saturation or SaturationConfig()
+        self.max_concurrency = max_concurrency
+        self.rpm_limit = rpm_limit
+        self.llm_rpm_limit = llm_rpm_limit
+        self._run_limits: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _RunLimits]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self.llm_cache_stats = {"hits": 0, "misses": 0, "plan_hits": 0}
+        self._message_encoder = json_utils.JsonListEncoder()
 
     def _report_progress(self, message: str, progress: float):
         """报告进度"""
@@ -91,7 +216,7 @@ class SupervisorAgent:
 
     def run(self, query: str, research_brief: str = "") -> SupervisorResult:
         """
-        执行研究任务
+        执行研究任务（同步入口，内部运行 arun）
 
         Args:
             query: 用户查询
@@ -100,11 +225,37 @@ class SupervisorAgent:
         Returns:
             SupervisorResult: 运行结果
         """
-        start_time = datetime.now()
+        async def run_and_close() -> SupervisorResult:
+            try:
+                return await self.arun(query, research_brief)
+            finally:
+                await aclose_async_client()
+
+        return asyncio.run(run_and_close())
+
+    async def arun(self, query: str, research_brief: str = "") -> SupervisorResult:
+        """
+        执行研究任务（异步）
+
+        LLM 调用走当前事件循环的共享连接池（HTTP/2）；Researcher 是同步实现，
+        在线程中执行，不阻塞事件循环，多个 Supervisor 可在同一循环内并发运行。
+
+        Args:
+            query: 用户查询
+            research_brief: 研究简报（可选）
+
+        Returns:
+            SupervisorResult: 运行结果
+        """
+        start_time = time.perf_counter()
 
         # 初始化状态
         state = create_initial_state(query, research_brief)
         state.max_rounds = self.max_rounds
+        if self.spill_dir:
+            # 文件名用墙钟时间；perf_counter 只用于计算耗时
+            run_id = f"{datetime.now():%Y%m%d_%H%M%S_%f}"
+            state.spill_path = self.spill_dir / f"{run_id}.jsonl"
 
         log.info(f"[Supervisor] 开始研究: {query[:50]}...")
         self._report_progress("正在分析问题...", 0.05)
@@ -114,7 +265,7 @@ class SupervisorAgent:
 
         # 主循环
         round_count = 0
-        consecutive_low_yield = 0  # 连续低产出轮数
+        saturation = SaturationDetector(self.saturation)
         previous_source_count = 0  # 上轮去重后的论文数
 
         while not state.is_complete and round_count < self.max_rounds:
@@ -124,134 +275,151 @@ class SupervisorAgent:
             progress = 0.1 + (round_count / self.max_rounds) * 0.7
             self._report_progress(f"研究中...（第 {round_count} 轮）", progress)
 
-            # 调用 LLM 获取下一步行动
-            response = self._call_llm(messages)
-
-            if not response:
-                log.error("[Supervisor] LLM 调用失败")
-                state.mark_complete("LLM 调用失败")
-                break
-
-            # 解析工具调用
-            tool_calls = self._extract_tool_calls(response)
-
-            if not tool_calls:
-                # 没有工具调用，可能是直接回复
-                log.warning("[Supervisor] 无工具调用，尝试继续")
-                messages.append({"role": "assistant", "content": response.get("content", "")})
-                messages.append({
-                    "role": "user",
-                    "content": "请使用工具继续研究，或调用 research_complete 结束研究。"
-                })
-                continue
-
-            # 处理工具调用
-            for tool_call in tool_calls:
-                tool_name = tool_call.get("function", {}).get("name", "")
-                tool_args = json.loads(tool_call.get("function", {}).get("arguments", "{}"))
-                tool_id = tool_call.get("id", f"call_{round_count}")
-
-                log.debug(f"[Supervisor] 工具调用: {tool_name}, 参数: {tool_args}")
-
-                # 解析工具
-                tool = parse_tool_call(tool_name, tool_args)
-
-                if isinstance(tool, ThinkTool):
-                    # 思考工具
-                    state.add_thinking(tool.thought, round_number=round_count)
-                    log.info(f"[Supervisor] 思考: {tool.thought[:100]}...")
-
-                    # 添加工具响应
-                    messages.append({
-                        "role": "assistant",
-                        "content": None,
-                        "tool_calls": [tool_call]
-                    })
-                    messages.append({
-                        "role": "tool",
-                        "tool_call_id": tool_id,
-                        "content": f"思考已记录。请继续下一步行动。"
-                    })
-
-                elif isinstance(tool, ConductResearch):
-                    # 派发研究任务
-                    log.info(f"[Supervisor] 派发研究: {tool.topic}")
-                    self._report_progress(f"研究: {tool.topic[:30]}...", progress + 0.05)
-
-                    # 调用 Researcher
-                    research_result, raw_data = self.researcher.research(tool, round_number=round_count)
-
-                    # 更新状态
-                    note = ResearchNote(
-                        topic=research_result.topic,
-                        findings=research_result.findings,
-                        key_points=research_result.key_points,
-                        sources=research_result.sources,
-                        round_number=round_count
+            # 调用 LLM 获取下一步行动（首轮可复用相同查询的规划）
+            reuse_plan = round_count == 1 and not research_brief
+            response = self._find_cached_plan(query) if reuse_plan else None
+            # 流式响应中每个 conduct_research 的参数一完整就提前开始搜索
+            searches: Dict[ConductResearch, asyncio.Task] = {}
+            try:
+                if response is None:
+                    response = await self._acall_llm(
+                        messages, on_tool_call=lambda name, args: self._search_ahead(searches, name, args)
                     )
-                    state.add_note(note)
+                    if reuse_plan and response:
+                        self._remember_plan(query, response)
 
-                    raw_note = RawNote(
-                        topic=raw_data.topic,
-                        papers=raw_data.papers,
-                        search_keywords=raw_data.keywords,
-                        round_number=round_count
-                    )
-                    state.add_raw_note(raw_note)
+                if not response:
+                    log.error("[Supervisor] LLM 调用失败")
+                    state.mark_complete("LLM 调用失败")
+                    break
 
-                    # 添加工具响应
-                    messages.append({
-                        "role": "assistant",
-                        "content": None,
-                        "tool_calls": [tool_call]
-                    })
+                # 解析工具调用
+                tool_calls = self._extract_tool_calls(response)
+
+                if not tool_calls:
+                    # 没有工具调用，可能是直接回复
+                    log.warning("[Supervisor] 无工具调用，尝试继续")
+                    messages.append({"role": "assistant", "content": response.get("content", "")})
                     messages.append({
-                        "role": "tool",
-                        "tool_call_id": tool_id,
-                        "content": research_result.to_message()
+                        "role": "user",
+                        "content": "请使用工具继续研究，或调用 research_complete 结束研究。"
                     })
-
-                    # === P2-1: 信息饱和检测 ===
-                    current_source_count = len(state.get_all_sources())
-                    new_papers = current_source_count - previous_source_count
-                    log.debug(f"[Supervisor] 新增论文: {new_papers} (总计: {current_source_count})")
-
-                    if new_papers <= 1:
-                        consecutive_low_yield += 1
-                        log.info(f"[Supervisor] 低产出轮次: {consecutive_low_yield}/2")
-
-                        # 连续 2 轮低产出，提示 LLM 考虑结束
-                        if consecutive_low_yield >= 2 and round_count >= 3:
+                    continue
+
+                # 同一轮派发的多个研究任务合并执行（一次 LLM 压缩调用）
+                prefetched = await self._prefetch_research(tool_calls, round_count, searches)
+
+                # 处理工具调用
+                for index, tool_call in enumerate(tool_calls):
+                    tool_name = tool_call.get("function", {}).get("name", "")
+                    tool_args = json_utils.loads(tool_call.get("function", {}).get("arguments") or "{}")
+                    tool_id = tool_call.get("id", f"call_{round_count}")
+
+                    log.debug(f"[Supervisor] 工具调用: {tool_name}, 参数: {tool_args}")
+
+                    # 解析工具
+                    tool = parse_tool_call(tool_name, tool_args)
+
+                    if isinstance(tool, ThinkTool):
+                        # 思考工具
+                        state.add_thinking(tool.thought, round_number=round_count)
+                        log.info(f"[Supervisor] 思考: {tool.thought[:100]}...")
+
+                        # 添加工具响应
+                        messages.append({
+                            "role": "assistant",
+                            "content": None,
+                            "tool_calls": [tool_call]
+                        })
+                        messages.append({
+                            "role": "tool",
+                            "tool_call_id": tool_id,
+                            "content": f"思考已记录。请继续下一步行动。"
+                        })
+
+                    elif isinstance(tool, ConductResearch):
+                        # 派发研究任务
+                        log.info(f"[Supervisor] 派发研究: {tool.topic}")
+                        self._report_progress(f"研究: {tool.topic[:30]}...", progress + 0.05)
+
+                        # 调用 Researcher（已批量执行的直接取结果）
+                        if index in prefetched:
+                            research_result, raw_data = prefetched[index]
+                        else:
+                            papers = await self._searched_papers(searches, tool)
+                            research_result, raw_data = await self._run_research(
+                                int(papers is None), self.researcher.research, tool, round_count, papers
+                            )
+
+                        # 更新状态
+                        note = ResearchNote(
+                            topic=research_result.topic,
+                            findings=research_result.findings,
+                            key_points=research_result.key_points,
+                            sources=research_result.sources,
+                            round_number=round_count
+                        )
+                        state.add_note(note)
+
+                        raw_note = RawNote(
+                            topic=raw_data.topic,
+                            papers=raw_data.papers,
+                            search_keywords=raw_data.keywords,
+                            round_number=round_count
+                        )
+                        state.add_raw_note(raw_note)
+
+                        # 添加工具响应
+                        messages.append({
+                            "role": "assistant",
+                            "content": None,
+                            "tool_calls": [tool_call]
+                        })
+                        messages.append({
+                            "role": "tool",
+                            "tool_call_id": tool_id,
+                            "content": research_result.to_message()
+                        })
+
+                        # === P2-1: 信息饱和检测 ===
+                        current_source_count = state.unique_source_count
+                        new_papers = current_source_count - previous_source_count
+                        log.debug(f"[Supervisor] 新增论文: {new_papers} (总计: {current_source_count})")
+
+                        # 产出曲线走平，提示 LLM 考虑结束
+                        if saturation.update(new_papers, note.key_points, round_count):
                             log.info("[Supervisor] 信息饱和，建议结束研究")
                             messages.append({
                                 "role": "user",
-                                "content": "注意：连续两轮搜索未发现新的高质量论文，信息可能已饱和。如果你认为研究已经充分，请调用 research_complete 结束研究。"
+                                "content": "注意：最近几次搜索新发现的高质量论文和要点持续减少，信息可能已饱和。如果你认为研究已经充分，请调用 research_complete 结束研究。"
                             })
-                    else:
-                        consecutive_low_yield = 0  # 重置计数器
-
-                    previous_source_count = current_source_count
 
-                elif isinstance(tool, ResearchComplete):
-                    # 研究完成
-                    log.info(f"[Supervisor] 研究完成: {tool.reason}")
-                    state.mark_complete(tool.reason)
-
-                    # 添加工具响应
-                    messages.append({
-                        "role": "assistant",
-                        "content": None,
-                        "tool_calls": [tool_call]
-                    })
-                    messages.append({
-                        "role": "tool",
-                        "tool_call_id": tool_id,
-                        "content": f"研究已标记完成。原因: {tool.reason}"
-                    })
-                    break
+                        previous_source_count = current_source_count
+
+                    elif isinstance(tool, ResearchComplete):
+                        # 研究完成
+                        log.info(f"[Supervisor] 研究完成: {tool.reason}")
+                        state.mark_complete(tool.reason)
+
+                        # 添加工具响应
+                        messages.append({
+                            "role": "assistant",
+                            "content": None,
+                            "tool_calls": [tool_call]
+                        })
+                        messages.append({
+                            "role": "tool",
+                            "tool_call_id": tool_id,
+                            "content": f"研究已标记完成。原因: {tool.reason}"
+                        })
+                        break
 
-                else:
-                    log.warning(f"[Supervisor] 未知工具: {tool_name}")
+                    else:
+                        log.warning(f"[Supervisor] 未知工具: {tool_name}")
+            finally:
+                # LLM 失败、无工具调用、研究结束等原因未被使用的提前搜索
+                for pending in searches.values():
+                    pending.cancel()
 
         # 检查是否因达到最大轮数而结束
         if not state.is_complete:
@@ -259,7 +427,7 @@ class SupervisorAgent:
             log.warning(f"[Supervisor] 达到最大轮数限制")
 
         # 计算耗时
-        duration = (datetime.now() - start_time).total_seconds()
+        duration = time.perf_counter() - start_time
 
         self._report_progress("研究完成", 0.85)
 
@@ -270,6 +438,100 @@ class SupervisorAgent:
             duration_seconds=duration
         )
 
+    def _limits(self) -> _RunLimits:
+        """当前事件循环的并发与限流原语（不存在则创建）"""
+        loop = asyncio.get_running_loop()
+        limits = self._run_limits.get(loop)
+        if limits is None:
+            limits = _RunLimits(
+                research_slots=asyncio.Semaphore(self.max_concurrency),
+                research_rate=AsyncRateLimiter(self.rpm_limit, 60.0),
+                llm_rate=AsyncRateLimiter(self.llm_rpm_limit, 60.0)
+            )
+            self._run_limits[loop] = limits
+        return limits
+
+    async def _run_research(self, task_count: int, func: Callable, *args):
+        """
+        在线程中执行 Researcher（同步实现），不阻塞事件循环
+
+        占用一个并发名额，并按需要搜索的任务数取得派发令牌。
+        """
+        limits = self._limits()
+        async with limits.research_slots:
+            for _ in range(task_count):
+                await limits.research_rate.acquire()
+            return await asyncio.to_thread(func, *args)
+
+    def _search_ahead(self, searches: Dict[ConductResearch, asyncio.Task], tool_name: str, arguments: Dict):
+        """流式响应中某个工具调用的参数已完整：conduct_research 提前开始搜索"""
+        tool = parse_tool_call(tool_name, arguments)
+        if not isinstance(tool, ConductResearch):
+            return
+        if tool in searches:
+            return
+
+        async def search() -> List[Dict]:
+            limits = self._limits()
+            async with limits.research_slots:
+                await limits.research_rate.acquire()
+                return await asyncio.to_thread(self.researcher._search_papers, tool)
+
+        log.debug(f"[Supervisor] 提前搜索: {tool.topic}")
+        searches[tool] = asyncio.create_task(search())
+
+    async def _searched_papers(
+        self,
+        searches: Dict[ConductResearch, asyncio.Task],
+        task: ConductResearch
+    ) -> Optional[List[Dict]]:
+        """取出任务提前搜索的结果（没有提前搜索或搜索失败返回 None，由 Researcher 照常搜索）"""
+        pending = searches.pop(task, None)
+        if pending is None:
+            return None
+        try:
+            return await pending
+        except Exception as e:
+            log.warning(f"[Supervisor] 提前搜索失败: {e}")
+            return None
+
+    async def _prefetch_research(
+        self,
+        tool_calls: List[Dict],
+        round_count: int,
+        searches: Dict[ConductResearch, asyncio.Task]
+    ) -> Dict[int, tuple[CompressedResearch, RawResearchData]]:
+        """
+        批量执行本轮的研究任务
+
+        只收集 research_complete 之前的 conduct_research 调用；少于 2 个时不预取。
+
+        Returns:
+            {工具调用下标: (CompressedResearch, RawResearchData)}
+        """
+        tasks: Dict[int, ConductResearch] = {}
+        for index, tool_call in enumerate(tool_calls):
+            function = tool_call.get("function", {})
+            try:
+                tool = parse_tool_call(function.get("name", ""), json_utils.loads(function.get("arguments") or "{}"))
+            except (json.JSONDecodeError, TypeError):
+                continue
+            if isinstance(tool, ResearchComplete):
+                break
+            if isinstance(tool, ConductResearch):
+                tasks[index] = tool
+
+        if len(tasks) < 2:
+            return {}
+
+        log.info(f"[Supervisor] 批量派发 {len(tasks)} 个研究任务")
+        papers_per_task = [await self._searched_papers(searches, task) for task in tasks.values()]
+        # 已提前搜索的任务在搜索时取过派发令牌
+        results = await self._run_research(
+            papers_per_task.count(None), self.researcher.research_batch, list(tasks.values()), round_count, papers_per_task
+        )
+        return dict(zip(tasks.keys(), results))
+
     def _build_initial_messages(self, state: AgentState) -> List[Dict]:
         """构建初始消息"""
         return [
@@ -279,41 +541,179 @@ class SupervisorAgent:
             )}
         ]
 
-    def _call_llm(self, messages: List[Dict]) -> Optional[Dict]:
-        """调用 LLM"""
+    async def _acall_llm(
+        self,
+        messages: List[Dict],
+        on_tool_call: Optional[Callable[[str, Dict], None]] = None
+    ) -> Optional[Dict]:
+        """
+        调用 LLM（异步，流式）
+
+        Args:
+            messages: 消息历史
+            on_tool_call: 流式响应中某个工具调用的参数已完整时回调 (工具名, 参数)，
+                此时模型可能还在生成后续内容（命中缓存时不回调）
+
+        Returns:
+            拼装好的 assistant 消息（与非流式响应的 message 结构相同），失败返回 None
+        """
         if not self.llm_client:
             log.error("[Supervisor] LLM 客户端未初始化")
             return None
 
+        # 消息历史只追加，已发送过的消息复用上一轮的编码；
+        # 请求体同时用作缓存键与 HTTP 请求内容
+        body = '{"messages":' + self._message_encoder.encode(messages) + "," + _REQUEST_PARAMS + "}"
+
+        # 精确匹配缓存：模型、消息历史、工具定义、采样参数完全相同
+        cache_key = None
+        if self.llm_cache:
+            cache_key = DiskCache.make_key(body)
+            cached = self.llm_cache.get(cache_key)
+            if cached is not None:
+                self.llm_cache_stats["hits"] += 1
+                log.info("[Supervisor] LLM 响应命中缓存")
+                return cached
+            self.llm_cache_stats["misses"] += 1
+
+        llm_rate = self._limits().llm_rate
+        attempt = 0
         try:
-            # 使用 httpx 直接调用支持 tools 的 API
-            import httpx
-
-            response = httpx.post(
-                self.llm_client.API_URL,
-                headers={
-                    "Authorization": f"Bearer {self.llm_client.api_key}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": "qwen-plus",  # 使用 plus 模型处理复杂任务
-                    "messages": messages,
-                    "tools": TOOL_SCHEMAS,
-                    "tool_choice": "auto",
-                    "max_tokens": 2000,
-                    "temperature": 0.3
-                },
-                timeout=60.0
-            )
-            response.raise_for_status()
-
-            result = response.json()
-            return result.get("choices", [{}])[0].get("message", {})
+            while True:
+                await llm_rate.acquire()
+                try:
+                    # 直接调用支持 tools 的 API（复用当前事件循环的共享连接池）
+                    async with get_async_client().stream(
+                        "POST",
+                        self.llm_client.API_URL,
+                        headers={
+                            "Authorization": f"Bearer {self.llm_client.api_key}",
+                            "Content-Type": "application/json"
+                        },
+                        content=body.encode("utf-8"),
+                        timeout=60.0
+                    ) as response:
+                        if response.is_error:
+                            await response.aread()
+                        response.raise_for_status()
+                        message = await self._read_stream(response, on_tool_call)
+                    break
+                except (httpx.TransportError, httpx.HTTPStatusError) as e:
+                    if isinstance(e, httpx.HTTPStatusError) and e.response.status_code != 429:
+                        raise
+                    # 超时/连接失败/限流：与 QwenClient 相同的随机退避
+                    delay = self.llm_client._retry_delay(e, attempt, self.LLM_MAX_RETRIES, 60.0)
+                    if delay is None:
+                        raise
+                    await asyncio.sleep(delay)
+                    attempt += 1
+
+            if not message.get("content") and not message.get("tool_calls"):
+                return None
+            if cache_key is not None:
+                self.llm_cache.set(cache_key, message)
+            return message
 
         except Exception as e:
             log.error(f"[Supervisor] LLM 调用出错: {e}")
             return None
 
+    @staticmethod
+    async def _read_stream(
+        response: httpx.Response,
+        on_tool_call: Optional[Callable[[str, Dict], None]] = None
+    ) -> Dict:
+        """
+        读取 SSE 流式响应，拼装 assistant 消息
+
+        工具调用按 index 分片到达（首片带 id 和工具名，参数逐片追加）；
+        参数拼接到以 } 结尾且能完整解析时即回调 on_tool_call，每个工具调用只回调一次。
+        """
+        content_parts: List[str] = []
+        tool_calls: Dict[int, Dict] = {}
+        announced = set()
+
+        async for line in response.aiter_lines():
+            if not line.startswith("data:"):
+                continue
+            data = line[5:].strip()
+            if data == "[DONE]":
+                break
+            choices = json_utils.loads(data).get("choices")
+            if not choices:
+                continue
+            delta = choices[0].get("delta") or {}
+
+            if delta.get("content"):
+                content_parts.append(delta["content"])
+
+            for fragment in delta.get("tool_calls") or []:
+                index = fragment.get("index", len(tool_calls))
+                call = tool_calls.setdefault(index, {
+                    "id": "",
+                    "type": "function",
+                    "function": {"name": "", "arguments": ""}
+                })
+                if fragment.get("id"):
+                    call["id"] = fragment["id"]
+                function = fragment.get("function") or {}
+                call["function"]["name"] += function.get("name") or ""
+                call["function"]["arguments"] += function.get("arguments") or ""
+
+                arguments = call["function"]["arguments"]
+                if on_tool_call is None or index in announced or not arguments.rstrip().endswith("}"):
+                    continue
+                try:
+                    parsed = json_utils.loads(arguments)
+                except json.JSONDecodeError:
+                    continue  # 字符串值中的 }，参数尚未完整
+                announced.add(index)
+                if isinstance(parsed, dict):
+                    on_tool_call(call["function"]["name"], parsed)
+
+        message: Dict[str, Any] = {"role": "assistant", "content": "".join(content_parts)}
+        if tool_calls:
+            message["tool_calls"] = [tool_calls[index] for index in sorted(tool_calls)]
+        return message
+
+    @staticmethod
+    def _plan_query_key(query: str) -> str:
+        """
+        查询的归一化形式：按原顺序拼接分词结果（英文词 + 单个汉字）
+
+        只忽略大小写、标点、空白和虚词，实词（含每个汉字）必须完全一致，
+        "医学图像分割" 与 "遥感图像分割" 不会共用规划。
+        """
+        return " ".join(tokenize(query))
+
+    def _plan_cache_key(self, query: str) -> Optional[str]:
+        """首轮规划的缓存键（每个归一化查询一条；查询没有有效词时返回 None）"""
+        key = self._plan_query_key(query)
+        return DiskCache.make_key("plan", key) if key else None
+
+    def _find_cached_plan(self, query: str) -> Optional[Dict]:
+        """查找归一化后完全相同的查询的首轮规划"""
+        if not self.llm_cache:
+            return None
+        cache_key = self._plan_cache_key(query)
+        if cache_key is None:
+            return None
+
+        entry = self.llm_cache.get(cache_key)
+        if entry is None:
+            return None
+        self.llm_cache_stats["plan_hits"] += 1
+        log.info(f"[Supervisor] 复用相同查询的首轮规划: {entry['query'][:50]}")
+        return entry["message"]
+
+    def _remember_plan(self, query: str, message: Dict):
+        """记录首轮规划（只记录包含工具调用的响应）"""
+        if not self.llm_cache or not self._extract_tool_calls(message):
+            return
+        cache_key = self._plan_cache_key(query)
+        if cache_key is not None:
+            self.llm_cache.set(cache_key, {"query": query, "message": message})
+
     def _extract_tool_calls(self, response: Dict) -> List[Dict]:
         """提取工具调用"""
         tool_calls = response.get("tool_calls", [])
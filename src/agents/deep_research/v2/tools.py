@@ -5,10 +5,16 @@ Supervisor 可用的三个核心工具：
 2. ConductResearch - 派发研究任务给 Researcher
 3. ResearchComplete - 标记研究完成
 """
-from typing import List, Optional, Literal
+from typing import List, Optional, Literal, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent.parent))
+
+from utils import json_utils
+
 
 class SearchStrategy(str, Enum):
     """搜索策略"""
@@ -17,7 +23,7 @@ class SearchStrategy(str, Enum):
     COMPARISON = "comparison"  # 对比搜索（对比分析）
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ThinkTool:
     """
     思考工具
@@ -36,7 +42,7 @@ class ThinkTool:
         return f"[Think] {self.thought}"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ConductResearch:
     """
     派发研究任务
@@ -46,28 +52,23 @@ class ConductResearch:
 
     参数说明：
     - topic: 研究主题（具体、可搜索）
-    - search_keywords: 搜索关键词列表（2-4个）
+    - search_keywords: 搜索关键词（2-4个）
     - strategy: 搜索策略
     - focus_points: 重点关注的方面（可选）
+
+    不可变且可哈希，可直接用作缓存 / 字典键；关键词的补全与截断在 parse_tool_call 中完成。
     """
     topic: str                      # 研究主题
-    search_keywords: List[str]      # 搜索关键词
+    search_keywords: Tuple[str, ...]  # 搜索关键词
     strategy: SearchStrategy = SearchStrategy.BROAD
-    focus_points: Optional[List[str]] = None  # 重点关注
-
-    def __post_init__(self):
-        # 确保关键词列表有效
-        if not self.search_keywords:
-            self.search_keywords = [self.topic]
-        # 限制关键词数量
-        self.search_keywords = self.search_keywords[:4]
+    focus_points: Optional[Tuple[str, ...]] = None  # 重点关注
 
     def __str__(self):
         keywords = ", ".join(self.search_keywords)
         return f"[Research] {self.topic} (keywords: {keywords}, strategy: {self.strategy.value})"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ResearchComplete:
     """
     标记研究完成
@@ -161,6 +162,48 @@ TOOL_SCHEMAS = [
 ]
 
 
+# TOOL_SCHEMAS 运行期不变，序列化结果在导入时生成一次，直接拼入每轮的请求体
+TOOL_SCHEMAS_JSON: str = json_utils.dumps(TOOL_SCHEMAS)
+
+
+# 策略字符串 -> 枚举成员（直接查表，无需构造枚举再捕获 ValueError）
+_STRATEGY_MAP = {strategy.value: strategy for strategy in SearchStrategy}
+
+
+def _parse_conduct_research(arguments: dict) -> ConductResearch:
+    strategy_str = arguments.get("strategy", "broad")
+    if not isinstance(strategy_str, str):
+        strategy_str = "broad"
+    strategy = _STRATEGY_MAP.get(strategy_str, SearchStrategy.BROAD)
+
+    # 关键词为空时用主题搜索，最多 4 个
+    topic = arguments.get("topic", "")
+    keywords = arguments.get("search_keywords") or [topic]
+    if isinstance(keywords, str):
+        keywords = [keywords]
+    focus_points = arguments.get("focus_points")
+    if isinstance(focus_points, str):
+        focus_points = [focus_points]
+
+    return ConductResearch(
+        topic=topic,
+        search_keywords=tuple(keywords[:4]),
+        strategy=strategy,
+        focus_points=tuple(focus_points) if focus_points else None
+    )
+
+
+# 工具名称 -> 工具对象构造函数
+_TOOL_PARSERS = {
+    "think": lambda arguments: ThinkTool(thought=arguments.get("thought", "")),
+    "conduct_research": _parse_conduct_research,
+    "research_complete": lambda arguments: ResearchComplete(
+        reason=arguments.get("reason", ""),
+        summary=arguments.get("summary")
+    ),
+}
+
+
 def parse_tool_call(tool_name: str, arguments: dict) -> Optional[object]:
     """
     解析工具调用
@@ -172,30 +215,8 @@ def parse_tool_call(tool_name: str, arguments: dict) -> Optional[object]:
     Returns:
         工具对象，或 None（无法解析）
     """
-    if tool_name == "think":
-        return ThinkTool(thought=arguments.get("thought", ""))
-
-    elif tool_name == "conduct_research":
-        strategy_str = arguments.get("strategy", "broad")
-        try:
-            strategy = SearchStrategy(strategy_str)
-        except ValueError:
-            strategy = SearchStrategy.BROAD
-
-        return ConductResearch(
-            topic=arguments.get("topic", ""),
-            search_keywords=arguments.get("search_keywords", []),
-            strategy=strategy,
-            focus_points=arguments.get("focus_points")
-        )
-
-    elif tool_name == "research_complete":
-        return ResearchComplete(
-            reason=arguments.get("reason", ""),
-            summary=arguments.get("summary")
-        )
-
-    return None
+    parser = _TOOL_PARSERS.get(tool_name)
+    return parser(arguments) if parser else None
 
 
 def get_tool_names() -> List[str]:
@@ -216,9 +237,9 @@ if __name__ == "__main__":
     # 测试 ConductResearch
     research = ConductResearch(
         topic="Transformer 自注意力机制",
-        search_keywords=["Transformer self-attention", "attention mechanism"],
+        search_keywords=("Transformer self-attention", "attention mechanism"),
         strategy=SearchStrategy.FOCUSED,
-        focus_points=["并行计算", "位置编码"]
+        focus_points=("并行计算", "位置编码")
     )
     print(f"\n{research}")
 
@@ -1,4 +1,5 @@
 """意图路由 Agent"""
+import re
 from typing import Literal
 
 
@@ -11,18 +12,22 @@ class IntentRouter:
     # 复杂模式的关键词
     COMPLEX_KEYWORDS = ["对比", "比较", "区别", "优劣", "综述", "进展", "趋势", "分析"]
 
+    # 关键词合并为一个正则（单次扫描查询串；关键词均为中文，无需大小写折叠）
+    _SIMPLE_RE = re.compile("|".join(map(re.escape, SIMPLE_KEYWORDS)))
+    _COMPLEX_RE = re.compile("|".join(map(re.escape, COMPLEX_KEYWORDS)))
+
+    # 所有关键词的首字符：查询中一个都没有时不可能命中关键词，直接按长度判断
+    _FIRST_CHARS = frozenset(k[0] for k in SIMPLE_KEYWORDS + COMPLEX_KEYWORDS)
+
     def route(self, query: str) -> Literal["simple", "deep_research"]:
         """路由用户查询（简单规则版，后续可替换为LLM）"""
-        query_lower = query.lower()
-
-        # 检查是否包含复杂模式关键词
-        for keyword in self.COMPLEX_KEYWORDS:
-            if keyword in query_lower:
+        if not self._FIRST_CHARS.isdisjoint(query):
+            # 检查是否包含复杂模式关键词
+            if self._COMPLEX_RE.search(query):
                 return "deep_research"
 
-        # 检查是否包含简单模式关键词
-        for keyword in self.SIMPLE_KEYWORDS:
-            if keyword in query_lower:
+            # 检查是否包含简单模式关键词
+            if self._SIMPLE_RE.search(query):
                 return "simple"
 
         # 默认：根据查询长度判断
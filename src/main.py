@@ -1,7 +1,10 @@
 """科研助手主入口"""
+import asyncio
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Callable
+from typing import Callable, Iterable, Optional, Set
 
 # 添加src目录到路径
 src_dir = Path(__file__).parent
@@ -12,14 +15,23 @@ from tools.search import UnifiedSearch
 from tools.query_analyzer import QueryAnalyzer
 from tools.abstract_summarizer import AbstractSummarizer
 from tools.reading_guide import ReadingGuide
-from agents.deep_research import DeepResearchOrchestrator
+from rag import SemanticCompressor
+from agents.deep_research import DeepResearchConfig, DeepResearchOrchestrator
 from agents.deep_research.v2 import DeepResearchV2, DeepResearchV2Config
 from utils.config import config
+from utils.llm_client import QwenClient, aclose_async_client, get_sync_client
+from utils.text_utils import normalize_title
+
+# 来源标签：构造论文字典时驻留（sys.intern），分组时的字符串比较先命中同一对象
+_ARXIV = sys.intern("arxiv")
 
 
 class ResearchAssistant:
     """科研助手主类"""
 
+    # 阅读导航 prompt 中每篇论文摘要的字符上限（与 ReadingGuide 的截断长度一致）
+    GUIDE_ABSTRACT_CHARS = 200
+
     def __init__(
         self,
         semantic_scholar_key: Optional[str] = None,
@@ -36,6 +48,8 @@ class ResearchAssistant:
         ss_key = semantic_scholar_key or config.SEMANTIC_SCHOLAR_API_KEY
         self.searcher = UnifiedSearch(semantic_scholar_key=ss_key)
         self.progress_callback = progress_callback
+        # 阅读导航输入的摘要压缩（本地抽取与查询相关的句子，不调用 LLM）
+        self.compressor = SemanticCompressor()
 
         # 初始化查询分析器和摘要总结器
         translator_config = config.get_translator_config()
@@ -48,15 +62,52 @@ class ResearchAssistant:
             # 深度研究协调器
             self.deep_research = DeepResearchOrchestrator(
                 qwen_api_key=self.qwen_key,
+                config=DeepResearchConfig(use_cache=config.USE_CACHE),
                 progress_callback=progress_callback
             )
         else:
             self.analyzer = QueryAnalyzer()  # 会使用回退方案
             self.summarizer = None
             self.reading_guide = ReadingGuide()  # 使用回退方案
-            self.deep_research = DeepResearchOrchestrator()  # 使用回退方案
+            self.deep_research = DeepResearchOrchestrator(  # 使用回退方案
+                config=DeepResearchConfig(use_cache=config.USE_CACHE),
+                progress_callback=progress_callback
+            )
             print("提示: 未配置 QWEN_API_KEY，将使用简单模式")
 
+        # 深度研究协调器按是否全文研究各建一个，跨查询复用（摘要模式即 self.deep_research）
+        self._orchestrators = {False: self.deep_research}
+        # V2 协调器首次使用时创建，跨查询复用
+        self._research_v2: Optional[DeepResearchV2] = None
+
+    def warmup(self):
+        """
+        预先建立到搜索源与 LLM API 的连接（失败忽略）
+
+        命令行在等待用户输入问题时于后台线程调用，把首次请求的握手开销藏在输入时间里。
+        简单搜索与深度研究（V1 / V2）使用的搜索器都会预连接；LLM 只预连接同步客户端
+        （查询分析、子问题分解、报告生成），异步客户端按事件循环创建、每次研究后关闭，无法提前建立。
+        """
+        for searcher in self._searchers():
+            searcher.warmup()
+        if self.qwen_key:
+            try:
+                get_sync_client().head(QwenClient.API_URL, timeout=5.0)
+            except Exception:
+                pass
+
+    def _searchers(self) -> list:
+        """简单搜索和已创建的深度研究协调器使用的搜索器（去重）"""
+        searchers = [self.searcher]
+        searchers.extend(
+            orchestrator.research_runner.searcher
+            for orchestrator in self._orchestrators.values()
+            if hasattr(orchestrator.research_runner, "searcher")
+        )
+        if self._research_v2 is not None:
+            searchers.append(self._research_v2.supervisor.researcher.searcher)
+        return list({id(searcher): searcher for searcher in searchers}.values())
+
     def process_query(
         self,
         query: str,
@@ -79,6 +130,20 @@ class ResearchAssistant:
         Returns:
             搜索结果字典
         """
+        # 已指定深度研究：研究本身不依赖查询分析（分析结果只写入返回的 intent / keywords），
+        # 查询分析（一次 LLM 调用）与研究并行执行
+        if mode not in ("auto", "simple"):
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                analysis_future = executor.submit(self.analyzer.analyze, query)
+                result = self._run_deep_research(query, use_fulltext=use_fulltext, use_v2=use_v2)
+                try:
+                    analysis = analysis_future.result()
+                except Exception as e:
+                    # 分析失败不应丢弃已完成的研究
+                    print(f"[QueryAnalyzer] 分析出错: {e}")
+                    analysis = self.analyzer._fallback_analyze(query)
+                return self._attach_analysis(result, analysis)
+
         # 1. 分析查询，生成多组关键词
         analysis = self.analyzer.analyze(query)
 
@@ -89,11 +154,71 @@ class ResearchAssistant:
         # 3. 根据模式执行
         if mode == "simple":
             return self._handle_simple_query(query, analysis)
-        elif use_v2:
+        result = self._run_deep_research(query, use_fulltext=use_fulltext, use_v2=use_v2)
+        return self._attach_analysis(result, analysis)
+
+    def _run_deep_research(self, query: str, use_fulltext: bool = False, use_v2: bool = False) -> dict:
+        """执行深度研究（V1 / V2）"""
+        if use_v2:
             # V2 架构：Supervisor 循环
-            return self._handle_deep_research_v2(query, analysis)
-        else:
-            return self._handle_deep_research(query, analysis, use_fulltext=use_fulltext)
+            return self._handle_deep_research_v2(query)
+        return self._handle_deep_research(query, use_fulltext=use_fulltext)
+
+    @staticmethod
+    def _attach_analysis(result: dict, analysis) -> dict:
+        """把查询分析结果写入深度研究结果"""
+        result["intent"] = analysis.intent
+        result["keywords"] = analysis.keywords
+        return result
+
+    @classmethod
+    def _collect_papers(
+        cls,
+        sources: Iterable[dict],
+        summary_limit: int,
+        extra_fields: tuple = ("relevance",)
+    ) -> tuple:
+        """
+        深度研究来源 → (全部论文, arXiv, 其他)，一次遍历完成去重、转换、截取摘要和分组
+
+        按归一化标题去重（保留首次出现），集合中只存标题的哈希值。
+        """
+        all_papers, arxiv_papers, other_papers = [], [], []
+        seen_titles: Set[int] = set()
+        for src in sources:
+            key = hash(normalize_title(src.get("title") or ""))
+            if key in seen_titles:
+                continue
+            seen_titles.add(key)
+
+            paper = cls._source_to_paper(src, extra_fields)
+            paper["summary"] = cls._truncate(paper["abstract"], summary_limit)
+            all_papers.append(paper)
+            (arxiv_papers if paper["source"] == _ARXIV else other_papers).append(paper)
+        return all_papers, arxiv_papers, other_papers
+
+    @staticmethod
+    def _source_to_paper(src: dict, extra_fields: tuple = ("relevance",)) -> dict:
+        """深度研究的来源记录转换为结果中的论文字典（extra_fields 为额外保留的文本字段）"""
+        paper = {
+            "title": src.get("title", ""),
+            "authors": src.get("authors", []),
+            "year": src.get("year"),
+            "citation_count": src.get("citation_count"),
+            "abstract": src.get("abstract", ""),
+            "url": src.get("url", ""),
+            "source": sys.intern(src.get("source") or "unknown"),
+        }
+        for key in extra_fields:
+            paper[key] = src.get(key, "")
+        return paper
+
+    @staticmethod
+    def _truncate(text: str, limit: int) -> str:
+        """截取前 limit 个字符，超长时加省略号"""
+        if text and len(text) > limit:
+            return text[:limit] + "..."
+        return text
 
     def _handle_simple_query(self, original_query: str, analysis) -> dict:
         """处理快速搜索"""
@@ -104,34 +229,23 @@ class ResearchAssistant:
             total_limit=5
         )
 
-        # 转换为字典格式，按来源分组
-        arxiv_papers = []
-        openalex_papers = []
+        # 转换为字典格式，构造时即按来源分组（来源取自论文对象，无需事后按字段再筛选）
+        arxiv_papers, openalex_papers = [], []
         for p in result.papers:
-            paper_dict = {
+            source = sys.intern(p.source)
+            (arxiv_papers if source == _ARXIV else openalex_papers).append({
                 "title": p.title,
                 "authors": p.authors[:3],
                 "year": p.year,
                 "citation_count": p.citation_count,
                 "abstract": p.abstract,
                 "url": p.url,
-                "source": p.source,
-            }
-            if p.source == "arxiv":
-                arxiv_papers.append(paper_dict)
-            else:
-                openalex_papers.append(paper_dict)
-
+                "source": source,
+            })
         all_papers = arxiv_papers + openalex_papers
 
-        # LLM总结摘要（批量并行处理）
-        if self.summarizer and all_papers:
-            all_papers = self.summarizer.summarize_batch(all_papers)
-            arxiv_papers = [p for p in all_papers if p.get('source') == 'arxiv']
-            openalex_papers = [p for p in all_papers if p.get('source') == 'openalex']
-
-        # 生成阅读导航
-        reading_guide = self.reading_guide.generate(original_query, all_papers)
+        # LLM总结摘要与阅读导航在同一事件循环中并发执行
+        reading_guide = asyncio.run(self._summarize_and_guide(original_query, all_papers))
 
         return {
             "mode": "simple",
@@ -147,7 +261,74 @@ class ResearchAssistant:
             "reading_guide": reading_guide,
         }
 
-    def _handle_deep_research(self, original_query: str, analysis, use_fulltext: bool = False) -> dict:
+    def _guide_papers(self, query: str, papers: list) -> list:
+        """
+        阅读导航的输入：只保留导航用到的字段，摘要压缩为与查询最相关的句子
+
+        阅读导航的 prompt 按序号引用论文，返回列表与 papers 一一对应。
+        """
+        limit = self.GUIDE_ABSTRACT_CHARS
+        slim = []
+        for p in papers:
+            abstract = p.get("abstract") or ""
+            if len(abstract) > limit:
+                # 首句过长时压缩结果可能为空，此时退回截断
+                abstract = self.compressor.compress(abstract, query, limit).content or abstract[:limit]
+            slim.append({
+                "title": p["title"],
+                "year": p.get("year"),
+                "citation_count": p.get("citation_count"),
+                "source": p.get("source", "unknown"),
+                "abstract": abstract,
+            })
+        return slim
+
+    async def _summarize_and_guide(self, query: str, papers: list) -> dict:
+        """
+        并发执行摘要总结和阅读导航，返回阅读导航
+
+        阅读导航只用标题、摘要、年份、引用数，不依赖摘要总结；
+        摘要总结原地写入各论文字典，分组列表无需重建。
+        """
+        guide_papers = self._guide_papers(query, papers)
+        try:
+            if self.summarizer and papers:
+                _, reading_guide = await asyncio.gather(
+                    self.summarizer.asummarize_batch(papers),
+                    self.reading_guide.agenerate(query, guide_papers),
+                )
+                return reading_guide
+            return await self.reading_guide.agenerate(query, guide_papers)
+        finally:
+            await aclose_async_client()
+
+    def _orchestrator(self, use_fulltext: bool) -> DeepResearchOrchestrator:
+        """获取深度研究协调器（全文 / 摘要模式首次使用时创建，之后复用）"""
+        orchestrator = self._orchestrators.get(use_fulltext)
+        if orchestrator is None:
+            orchestrator = DeepResearchOrchestrator(
+                qwen_api_key=self.qwen_key,
+                config=DeepResearchConfig(use_fulltext=use_fulltext, use_cache=config.USE_CACHE),
+                progress_callback=self.progress_callback
+            )
+            self._orchestrators[use_fulltext] = orchestrator
+        # 进度回调可能在创建后被替换
+        orchestrator.progress_callback = self.progress_callback
+        return orchestrator
+
+    def _v2(self) -> DeepResearchV2:
+        """获取 V2 协调器（首次使用时创建，之后复用）"""
+        if self._research_v2 is None:
+            self._research_v2 = DeepResearchV2(
+                qwen_api_key=self.qwen_key,
+                config=DeepResearchV2Config(max_rounds=10, use_cache=config.USE_CACHE),
+                progress_callback=self.progress_callback
+            )
+        # 进度回调可能在创建后被替换
+        self._research_v2.progress_callback = self.progress_callback
+        return self._research_v2
+
+    def _handle_deep_research(self, original_query: str, use_fulltext: bool = False) -> dict:
         """
         处理深度研究查询
 
@@ -159,83 +340,36 @@ class ResearchAssistant:
         v0.4.0 新增：
         - 支持全文研究模式（下载 PDF）
         """
-        # 根据 use_fulltext 创建配置
-        from agents.deep_research import DeepResearchConfig
-        config = DeepResearchConfig(use_fulltext=use_fulltext)
-
-        # 创建协调器实例（使用指定配置）
-        orchestrator = DeepResearchOrchestrator(
-            qwen_api_key=self.qwen_key,
-            config=config,
-            progress_callback=self.progress_callback
-        )
-
         # 执行深度研究
-        deep_result = orchestrator.run(original_query)
-
-        # 收集所有论文（从各子问题的研究结果中提取）
-        all_papers = []
-        arxiv_papers = []
-        openalex_papers = []
-
-        seen_titles = set()  # 去重
-        for research_result in deep_result.research_results:
-            for src in research_result.sources:
-                title = src.get("title", "")
-                if title.lower() in seen_titles:
-                    continue
-                seen_titles.add(title.lower())
-
-                paper_dict = {
-                    "title": title,
-                    "authors": src.get("authors", []),
-                    "year": src.get("year"),
-                    "citation_count": src.get("citation_count"),
-                    "abstract": src.get("abstract", ""),
-                    "url": src.get("url", ""),
-                    "source": src.get("source", "unknown"),
-                    "relevance": src.get("relevance", ""),
-                }
-                all_papers.append(paper_dict)
-
-                if src.get("source") == "arxiv":
-                    arxiv_papers.append(paper_dict)
-                else:
-                    openalex_papers.append(paper_dict)
+        deep_result = self._orchestrator(use_fulltext).run(original_query)
 
+        # 收集所有论文（从各子问题的研究结果中提取，按标题去重）
         # 深度研究模式不需要额外的摘要总结，报告已包含分析
         # 只截取原始摘要的前150字作为简要说明
-        for paper in all_papers:
-            abstract = paper.get("abstract", "")
-            if abstract and len(abstract) > 150:
-                paper["summary"] = abstract[:150] + "..."
-            elif abstract:
-                paper["summary"] = abstract
+        all_papers, arxiv_papers, openalex_papers = self._collect_papers(
+            (
+                src for research_result in deep_result.research_results
+                for src in research_result.sources
+            ),
+            summary_limit=150,
+        )
 
         # 生成阅读导航（基于报告中的论文）
-        reading_guide = self.reading_guide.generate(original_query, all_papers)
+        reading_guide = self.reading_guide.generate(
+            original_query, self._guide_papers(original_query, all_papers)
+        )
 
         # 获取报告中的参考来源（与报告引用编号一致）
         report_sources = []
         if deep_result.report and deep_result.report.sources:
             for src in deep_result.report.sources:
-                report_sources.append({
-                    "title": src.get("title", ""),
-                    "authors": src.get("authors", []),
-                    "year": src.get("year"),
-                    "citation_count": src.get("citation_count"),
-                    "abstract": src.get("abstract", ""),
-                    "url": src.get("url", ""),
-                    "source": src.get("source", "unknown"),
-                    "relevance": src.get("relevance", ""),
-                    "summary": src.get("abstract", "")[:150] + "..." if src.get("abstract", "") and len(src.get("abstract", "")) > 150 else src.get("abstract", ""),
-                })
+                paper = self._source_to_paper(src)
+                paper["summary"] = self._truncate(paper["abstract"], 150)
+                report_sources.append(paper)
 
         return {
             "mode": "deep_research",
             "query": original_query,
-            "intent": analysis.intent,
-            "keywords": analysis.keywords,
             "sources": ["arxiv", "openalex"],
             "total_found": deep_result.metadata.get("total_papers", 0),
             "arxiv_papers": arxiv_papers,
@@ -260,7 +394,7 @@ class ResearchAssistant:
             "metadata": deep_result.metadata,
         }
 
-    def _handle_deep_research_v2(self, original_query: str, analysis) -> dict:
+    def _handle_deep_research_v2(self, original_query: str) -> dict:
         """
         处理深度研究查询（V2 架构）
 
@@ -269,61 +403,24 @@ class ResearchAssistant:
         - 显式反思（think_tool）
         - Subagent as Tool
         """
-        # 创建 V2 配置
-        config = DeepResearchV2Config(max_rounds=10)
-
-        # 创建 V2 协调器
-        research_v2 = DeepResearchV2(
-            qwen_api_key=self.qwen_key,
-            config=config,
-            progress_callback=self.progress_callback
-        )
-
         # 执行 V2 深度研究
-        v2_result = research_v2.run(original_query)
+        v2_result = self._v2().run(original_query)
 
-        # 收集所有论文（从 notes 中提取）
-        all_papers = []
-        arxiv_papers = []
-        openalex_papers = []
-
-        seen_titles = set()
-        for src in v2_result.state.get_all_sources():
-            title = src.get("title", "")
-            if title.lower() in seen_titles:
-                continue
-            seen_titles.add(title.lower())
-
-            # 获取摘要，截取前 200 字作为 summary
-            abstract = src.get("abstract", "")
-            summary = abstract[:200] + "..." if abstract and len(abstract) > 200 else abstract
-
-            paper_dict = {
-                "title": title,
-                "authors": src.get("authors", []),
-                "year": src.get("year"),
-                "citation_count": src.get("citation_count"),
-                "abstract": abstract,
-                "summary": summary,  # 用于列表显示
-                "url": src.get("url", ""),
-                "source": src.get("source", "unknown"),
-                "key_contribution": src.get("key_contribution", ""),
-            }
-            all_papers.append(paper_dict)
-
-            if src.get("source") == "arxiv":
-                arxiv_papers.append(paper_dict)
-            else:
-                openalex_papers.append(paper_dict)
+        # 收集所有论文（从 notes 中提取），截取摘要前 200 字作为 summary（用于列表显示）
+        all_papers, arxiv_papers, openalex_papers = self._collect_papers(
+            v2_result.state.get_all_sources(),
+            summary_limit=200,
+            extra_fields=("key_contribution",),
+        )
 
         # 生成阅读导航
-        reading_guide = self.reading_guide.generate(original_query, all_papers)
+        reading_guide = self.reading_guide.generate(
+            original_query, self._guide_papers(original_query, all_papers)
+        )
 
         return {
             "mode": "deep_research_v2",
             "query": original_query,
-            "intent": analysis.intent,
-            "keywords": analysis.keywords,
             "sources": ["arxiv", "openalex"],
             "total_found": len(all_papers),
             "arxiv_papers": arxiv_papers,
@@ -338,6 +435,27 @@ class ResearchAssistant:
         }
 
 
+def _format_papers(papers: list) -> str:
+    """格式化论文列表（整体拼成一个字符串，一次写出，避免逐行 print）"""
+    lines = []
+    for i, paper in enumerate(papers, 1):
+        get = paper.get
+        lines.append(f"[{i}] [{get('source', 'unknown')}] {paper['title']}")
+        if get('title_cn'):
+            lines.append(f"    📖 {paper['title_cn']}")
+        authors = get('authors', [])
+        if authors:
+            lines.append(f"    作者: {', '.join(authors)}")
+        lines.append(f"    年份: {get('year', 'N/A')}")
+        if get('citation_count'):
+            lines.append(f"    引用: {paper['citation_count']}")
+        if get('summary'):
+            lines.append(f"    摘要: {paper['summary']}")
+        lines.append(f"    链接: {paper['url']}")
+        lines.append("")
+    return "\n".join(lines) + "\n" if lines else ""
+
+
 def main():
     """命令行入口"""
     print("=" * 50)
@@ -346,9 +464,14 @@ def main():
     print("=" * 50)
 
     assistant = ResearchAssistant()
+    warmup_thread: Optional[threading.Thread] = None
 
     while True:
         try:
+            # 用户输入期间后台预先建立连接（上一次预连接仍在进行时不重复启动）
+            if warmup_thread is None or not warmup_thread.is_alive():
+                warmup_thread = threading.Thread(target=assistant.warmup, daemon=True)
+                warmup_thread.start()
             query = input("\n请输入研究问题 (输入 'quit' 退出): ").strip()
 
             if query.lower() in ["quit", "exit", "q"]:
@@ -378,21 +501,7 @@ def main():
                 # 快速搜索模式显示论文列表
                 print(f"找到 {len(result['papers'])} 篇相关论文:\n")
 
-                for i, paper in enumerate(result["papers"], 1):
-                    source_tag = f"[{paper.get('source', 'unknown')}]"
-                    print(f"[{i}] {source_tag} {paper['title']}")
-                    if paper.get('title_cn'):
-                        print(f"    📖 {paper['title_cn']}")
-                    authors = paper.get('authors', [])
-                    if authors:
-                        print(f"    作者: {', '.join(authors)}")
-                    print(f"    年份: {paper.get('year', 'N/A')}")
-                    if paper.get('citation_count'):
-                        print(f"    引用: {paper['citation_count']}")
-                    if paper.get('summary'):
-                        print(f"    摘要: {paper['summary']}")
-                    print(f"    链接: {paper['url']}")
-                    print()
+                sys.stdout.write(_format_papers(result["papers"]))
 
         except KeyboardInterrupt:
             print("\n再见！")
@@ -1,7 +1,24 @@
 """语义压缩器 - 解决Context爆炸问题"""
-from typing import List, Optional
+import heapq
+import re
+from operator import itemgetter
+from typing import FrozenSet, List, Optional
 from dataclasses import dataclass
 
+# 句子分隔符（中英文句末标点与换行）
+_SENT_SPLIT = re.compile(r'[。！？.!?\n]')
+
+# 评分用分词：英文/数字词，或单个汉字（按整词匹配，"art" 不再命中 "start"）
+_TOKEN_RE = re.compile(r'[a-z0-9]+|[\u4e00-\u9fff]')
+
+# 估算 max_length 能容纳的句子数时假定的平均句长（字符）
+_AVG_SENTENCE_CHARS = 40
+
+
+def _query_words(query: str) -> FrozenSet[str]:
+    """查询分词（与句子评分使用同一分词规则）"""
+    return frozenset(_TOKEN_RE.findall(query.lower()))
+
 
 @dataclass
 class CompressedContent:
@@ -61,24 +78,25 @@ class SemanticCompressor:
         self,
         content: str,
         query: str,
-        max_length: int
+        max_length: int,
+        query_words: Optional[FrozenSet[str]] = None
     ) -> CompressedContent:
-        """简单压缩（不使用LLM）"""
+        """简单压缩（不使用LLM）；query_words 为预先分好的查询词，批量压缩时复用"""
         original_length = len(content)
 
         # 按句子分割
         sentences = self._split_sentences(content)
 
-        # 简单相关性评分：包含查询词的句子得分更高
-        query_words = set(query.lower().split())
-        scored_sentences = []
-
-        for sent in sentences:
-            score = sum(1 for word in query_words if word in sent.lower())
-            scored_sentences.append((score, sent))
+        # 简单相关性评分：句子词集与查询词集的交集大小
+        if query_words is None:
+            query_words = _query_words(query)
+        scored_sentences = [
+            (len(query_words.intersection(_TOKEN_RE.findall(sent.lower()))), sent)
+            for sent in sentences
+        ]
 
         # 按得分排序，取最相关的句子
-        scored_sentences.sort(key=lambda x: x[0], reverse=True)
+        scored_sentences = self._top_sentences(scored_sentences, max_length)
 
         # 拼接直到达到长度限制
         compressed_parts = []
@@ -102,6 +120,22 @@ class SemanticCompressor:
             key_points=key_points[:5]
         )
 
+    @staticmethod
+    def _top_sentences(scored_sentences: List[tuple], max_length: int) -> List[tuple]:
+        """
+        按得分从高到低排列的句子（得分相同保持原文顺序）
+
+        拼接只会用到排在前面、总长不超过 max_length 的句子：
+        先用堆取前 k 句（O(n log k)），这些句子总长仍装不满 max_length 时才完整排序。
+        """
+        k = max(5, max_length // _AVG_SENTENCE_CHARS)
+        if len(scored_sentences) > k:
+            # nlargest 与 sorted(..., reverse=True)[:k] 结果一致（同分保持原顺序）
+            top = heapq.nlargest(k, scored_sentences, key=itemgetter(0))
+            if sum(len(sent) for _, sent in top) > max_length:
+                return top
+        return sorted(scored_sentences, key=itemgetter(0), reverse=True)
+
     def _llm_compress(
         self,
         content: str,
@@ -118,8 +152,7 @@ class SemanticCompressor:
     def _split_sentences(self, text: str) -> List[str]:
         """分割句子"""
         # 简单的句子分割
-        import re
-        sentences = re.split(r'[。！？.!?\n]', text)
+        sentences = _SENT_SPLIT.split(text)
         return [s.strip() for s in sentences if s.strip()]
 
     def compress_batch(
@@ -128,9 +161,16 @@ class SemanticCompressor:
         query: str,
         max_length_per_item: int = 300
     ) -> List[CompressedContent]:
-        """批量压缩"""
+        """批量压缩（简单压缩时查询只分词一次）"""
+        if self.llm_client is not None:
+            return [
+                self.compress(content, query, max_length_per_item)
+                for content in contents
+            ]
+
+        query_words = _query_words(query)
         return [
-            self.compress(content, query, max_length_per_item)
+            self._simple_compress(content, query, max_length_per_item, query_words)
             for content in contents
         ]
 
@@ -1,29 +1,134 @@
 """摘要总结器 - 使用LLM将英文摘要总结为中文，并翻译标题"""
+import asyncio
 import json
-from typing import Optional, List
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional, List, Tuple
 
 import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from utils.llm_client import QwenClient
+from utils import json_utils
+from utils.json_utils import find_json_array, find_json_object
+from utils.llm_client import QwenClient, aclose_async_client
 
 
 class AbstractSummarizer:
     """使用LLM总结论文摘要并翻译标题"""
 
+    # 未配置 API Key 时直接截取原始摘要的长度
+    RAW_SUMMARY_CHARS = 200
+
     def __init__(
         self,
         qwen_api_key: str = "",
-        max_workers: int = 5,
+        max_concurrency: int = 20,
+        batch_size: int = 6,
     ):
         self.llm_client = QwenClient(api_key=qwen_api_key) if qwen_api_key else None
-        self.max_workers = max_workers
+        self.max_concurrency = max_concurrency
+        self.batch_size = batch_size
 
         if not self.llm_client:
             print("[摘要总结] 未配置 QWEN_API_KEY，将显示原始摘要")
 
+    def _build_prompt(self, abstract: str, title: str) -> str:
+        """构造“翻译标题 + 总结摘要”的提示词"""
+        if not abstract or abstract == "无摘要":
+            abstract_text = ""
+        else:
+            abstract_text = abstract
+
+        return f"""请完成以下两个任务，返回JSON格式：
+
+1. 将论文标题翻译为中文（简洁准确）
+2. 将摘要总结为中文（50字以内，保留核心贡献）
+
+论文标题：{title}
+摘要：{abstract_text or "无"}
+
+请返回JSON格式（不要有其他内容）：
+{{"title_cn": "中文标题", "summary": "中文摘要总结"}}"""
+
+    def _build_batch_prompt(self, items: List[Tuple[str, str]]) -> str:
+        """构造多篇论文共用一次调用的提示词（要求返回等长 JSON 数组）"""
+        blocks = []
+        for i, (title, abstract) in enumerate(items, 1):
+            abstract_text = "" if not abstract or abstract == "无摘要" else abstract
+            blocks.append(f"论文{i}\n标题：{title}\n摘要：{abstract_text or '无'}")
+        papers_text = "\n\n".join(blocks)
+
+        return f"""下面共有 {len(items)} 篇论文，请对每篇完成以下两个任务：
+
+1. 将论文标题翻译为中文（简洁准确）
+2. 将摘要总结为中文（50字以内，保留核心贡献）
+
+{papers_text}
+
+请返回长度为 {len(items)} 的JSON数组，第 i 个元素对应论文 i（不要有其他内容）：
+[{{"title_cn": "中文标题", "summary": "中文摘要总结"}}, ...]"""
+
+    @staticmethod
+    def _strip_code_block(content: str) -> str:
+        """去掉可能包裹在外层的 markdown 代码块"""
+        if content.startswith("```"):
+            content = content.split("```")[1]
+            if content.startswith("json"):
+                content = content[4:]
+        return content.strip()
+
+    @classmethod
+    def _parse_batch_result(cls, content: str, items: List[Tuple[str, str]]) -> Optional[List[dict]]:
+        """
+        解析批量结果；不是等长数组时返回 None（由调用方逐篇重试）
+
+        定位第一个括号平衡的 JSON 数组，代码块标记、前后说明文字都不影响解析。
+        """
+        json_text = find_json_array(content)
+        if json_text is None:
+            return None
+        try:
+            parsed = json_utils.loads(json_text)
+        except json.JSONDecodeError:
+            return None
+        if not isinstance(parsed, list) or len(parsed) != len(items):
+            return None
+        if not all(isinstance(item, dict) for item in parsed):
+            return None
+        return [
+            {
+                "title_cn": item.get("title_cn", ""),
+                "summary": item.get("summary", abstract[:150] if abstract else "暂无摘要")
+            }
+            for item, (_, abstract) in zip(parsed, items)
+        ]
+
+    @classmethod
+    def _parse_result(cls, content: str, abstract: str) -> dict:
+        """
+        解析模型返回的 JSON（解析失败时把原始内容作为摘要）
+
+        直接定位第一个括号平衡的 JSON 对象，代码块标记、前后说明文字都不影响解析。
+        """
+        json_text = find_json_object(content)
+        if json_text:
+            try:
+                parsed = json_utils.loads(json_text)
+                return {
+                    "title_cn": parsed.get("title_cn", ""),
+                    "summary": parsed.get("summary", abstract[:150] if abstract else "暂无摘要")
+                }
+            except json.JSONDecodeError:
+                pass
+        return {"title_cn": "", "summary": cls._strip_code_block(content)}
+
+    @staticmethod
+    def _fallback(abstract: str) -> dict:
+        """调用失败时的降级结果：截断原始摘要"""
+        return {
+            "title_cn": "",
+            "summary": abstract[:150] + "..." if abstract and len(abstract) > 150 else (abstract or "")
+        }
+
     def summarize_and_translate(self, abstract: str, title: str = "") -> dict:
         """
         总结摘要并翻译标题（一次API调用完成）
@@ -36,66 +141,78 @@ class AbstractSummarizer:
             dict: {"title_cn": "中文标题", "summary": "中文摘要总结"}
         """
         if not self.llm_client:
+            limit = self.RAW_SUMMARY_CHARS
+            abstract = abstract or ""
             return {
                 "title_cn": "",
-                "summary": abstract[:200] + "..." if len(abstract) > 200 else abstract
+                "summary": abstract[:limit] + "..." if len(abstract) > limit else abstract
             }
 
-        if not abstract or abstract == "无摘要":
-            abstract_text = ""
-        else:
-            abstract_text = abstract
-
-        prompt = f"""请完成以下两个任务，返回JSON格式：
-
-1. 将论文标题翻译为中文（简洁准确）
-2. 将摘要总结为中文（50字以内，保留核心贡献）
-
-论文标题：{title}
-摘要：{abstract_text or "无"}
-
-请返回JSON格式（不要有其他内容）：
-{{"title_cn": "中文标题", "summary": "中文摘要总结"}}"""
-
         try:
             # 使用通义千问 turbo 模型（翻译总结是简单任务）
             content = self.llm_client.chat(
-                prompt=prompt,
+                prompt=self._build_prompt(abstract, title),
                 task_type="compress",
                 max_tokens=200,
                 temperature=0.3,
                 timeout=20.0
             )
+            return self._parse_result(content, abstract)
+        except Exception as e:
+            print(f"[摘要总结] 失败: {e}")
+            return self._fallback(abstract)
 
-            # 解析JSON
-            # 处理可能的markdown代码块
-            if content.startswith("```"):
-                content = content.split("```")[1]
-                if content.startswith("json"):
-                    content = content[4:]
-            content = content.strip()
-
-            parsed = json.loads(content)
-            return {
-                "title_cn": parsed.get("title_cn", ""),
-                "summary": parsed.get("summary", abstract[:150] if abstract else "暂无摘要")
-            }
-        except json.JSONDecodeError:
-            # JSON解析失败，返回原始内容作为摘要
-            return {
-                "title_cn": "",
-                "summary": content if 'content' in dir() else (abstract[:150] if abstract else "")
-            }
+    async def _asummarize_and_translate(self, abstract: str, title: str = "") -> dict:
+        """summarize_and_translate 的异步版本（复用当前事件循环的共享连接池）"""
+        try:
+            content = await self.llm_client.chat_async(
+                prompt=self._build_prompt(abstract, title),
+                task_type="compress",
+                max_tokens=200,
+                temperature=0.3,
+                timeout=20.0
+            )
+            return self._parse_result(content, abstract)
         except Exception as e:
             print(f"[摘要总结] 失败: {e}")
-            return {
-                "title_cn": "",
-                "summary": abstract[:150] + "..." if abstract and len(abstract) > 150 else (abstract or "")
-            }
+            return self._fallback(abstract)
 
-    def summarize_batch(self, papers: List[dict]) -> List[dict]:
+    async def _asummarize_and_translate_batch(self, items: List[Tuple[str, str]]) -> List[dict]:
         """
-        批量总结论文摘要并翻译标题（并行处理）
+        一次 API 调用总结多篇论文
+
+        返回数组长度不符或解析失败时，退回逐篇调用（并发进行）。
+
+        Args:
+            items: [(标题, 摘要), ...]
+
+        Returns:
+            List[dict]: 与 items 顺序一致的 {"title_cn", "summary"}
+        """
+        if len(items) > 1:
+            try:
+                content = await self.llm_client.chat_async(
+                    prompt=self._build_batch_prompt(items),
+                    task_type="compress",
+                    max_tokens=200 * len(items),
+                    temperature=0.3,
+                    timeout=20.0 + 5.0 * len(items)
+                )
+                results = self._parse_batch_result(content, items)
+                if results is not None:
+                    return results
+            except Exception as e:
+                print(f"[摘要总结] 批量失败: {e}")
+
+        return await asyncio.gather(
+            *(self._asummarize_and_translate(abstract, title) for title, abstract in items)
+        )
+
+    async def asummarize_batch(self, papers: List[dict]) -> List[dict]:
+        """
+        批量总结论文摘要并翻译标题（异步并发）
+
+        每 batch_size 篇论文合并为一次调用，各批并发进行，同时进行的批数不超过 max_concurrency。
 
         Args:
             papers: 论文列表，每个包含 'abstract' 和 'title' 字段
@@ -103,34 +220,54 @@ class AbstractSummarizer:
         Returns:
             添加了 'summary' 和 'title_cn' 字段的论文列表
         """
-        if not self.api_key:
-            # 无API Key时直接返回原始数据
-            for paper in papers:
-                paper['summary'] = paper.get('abstract', '')[:200]
-                paper['title_cn'] = ""
-            return papers
-
-        def process_paper(paper):
-            abstract = paper.get('abstract', '')
-            title = paper.get('title', '')
-            result = self.summarize_and_translate(abstract, title)
-            paper['summary'] = result['summary']
-            paper['title_cn'] = result['title_cn']
-            return paper
-
-        # 并行处理
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            futures = {executor.submit(process_paper, p): p for p in papers}
-            for future in as_completed(futures):
-                try:
-                    future.result()
-                except Exception as e:
-                    paper = futures[future]
-                    paper['summary'] = paper.get('abstract', '')[:150]
-                    paper['title_cn'] = ""
+        if not self.llm_client:
+            return self._fill_raw(papers)
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def process_chunk(chunk: List[dict]) -> None:
+            items = [(p.get('title') or '', p.get('abstract') or '') for p in chunk]
+            async with semaphore:
+                results = await self._asummarize_and_translate_batch(items)
+            for paper, result in zip(chunk, results):
+                paper['summary'] = result['summary']
+                paper['title_cn'] = result['title_cn']
 
+        size = max(1, self.batch_size)
+        chunks = [papers[i:i + size] for i in range(0, len(papers), size)]
+        await asyncio.gather(*(process_chunk(c) for c in chunks))
         return papers
 
+    def _fill_raw(self, papers: List[dict]) -> List[dict]:
+        """无API Key时直接返回原始数据：摘要截取前 RAW_SUMMARY_CHARS 字，无中文标题"""
+        limit = self.RAW_SUMMARY_CHARS
+        for paper in papers:
+            paper['summary'] = (paper.get('abstract') or '')[:limit]
+            paper['title_cn'] = ""
+        return papers
+
+    def summarize_batch(self, papers: List[dict]) -> List[dict]:
+        """
+        批量总结论文摘要并翻译标题（同步入口，内部运行 asummarize_batch）
+
+        Args:
+            papers: 论文列表，每个包含 'abstract' 和 'title' 字段
+
+        Returns:
+            添加了 'summary' 和 'title_cn' 字段的论文列表
+        """
+        if not self.llm_client:
+            # 无需为回退路径创建事件循环
+            return self._fill_raw(papers)
+
+        async def run() -> List[dict]:
+            try:
+                return await self.asummarize_batch(papers)
+            finally:
+                await aclose_async_client()
+
+        return asyncio.run(run())
+
 
 # 测试代码
 if __name__ == "__main__":
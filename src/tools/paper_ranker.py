@@ -0,0 +1,279 @@
+"""论文预排序
+
+在把论文交给 LLM 压缩之前，做一次廉价的本地预处理：
+1. 近重复去除：同一论文的不同版本（arXiv 预印本 / 正式发表）标题略有差异，
+   按标题字符 3-gram 的 Jaccard 相似度去重
+2. BM25 排序：以研究问题 + 关键词为查询，对标题和摘要打分，再融合年份和引用数，
+   只保留综合分最高的若干篇（按篇数，或按 prompt 字符预算），缩短 prompt、降低 LLM 延迟
+"""
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Optional
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.text_utils import normalize_title, title_shingles
+
+# 分词：英文/数字词，或单个汉字
+_TOKEN_RE = re.compile(r"[a-z0-9]+|[\u4e00-\u9fff]")
+
+# 不参与计分的英文虚词（单字母词已按长度过滤）
+STOPWORDS = frozenset(
+    "an and are as at be by for from in is it of on or the to via vs with we our this that".split()
+)
+
+# 标题在文档中的重复次数（相当于标题词权重）
+TITLE_WEIGHT = 2
+
+# BM25 参数
+BM25_K1 = 1.5
+BM25_B = 0.75
+
+# 综合分：相关性 × 时效加成 + 引用加成
+RECENCY_BASE_YEAR = 2015     # 该年份时效加成为 0
+RECENCY_PER_YEAR = 0.05      # 每年的时效加成
+RECENCY_MIN_FACTOR = 0.5     # 老论文的时效系数下限
+CITATION_WEIGHT = 0.1        # log1p(引用数) 的权重
+
+# 近重复判定阈值（标题 3-gram Jaccard 相似度）
+NEAR_DUPLICATE_THRESHOLD = 0.8
+
+# 估算单篇论文在 prompt 中的长度：摘要截断长度 + 编号/来源/年份等固定开销
+PROMPT_ABSTRACT_CHARS = 400
+PROMPT_ENTRY_OVERHEAD = 60
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """分词：大小写折叠，去掉虚词和单字母英文词"""
+    if not text:
+        return []
+    return [
+        t for t in _TOKEN_RE.findall(text.casefold())
+        if t not in STOPWORDS and (len(t) > 1 or not t.isascii())
+    ]
+
+
+def bm25_scores(papers: List[dict], query: str) -> List[float]:
+    """
+    计算每篇论文相对查询的 BM25 分数
+
+    语料即当前这批论文（IDF 由它们统计），文档为标题（加权）+ 摘要。
+
+    Args:
+        papers: 论文列表（dict，含 title / abstract）
+        query: 查询文本（研究问题 + 关键词）
+
+    Returns:
+        与 papers 顺序一致的分数列表（查询没有有效词时全为 0）
+    """
+    query_terms = set(tokenize(query))
+    if not papers or not query_terms:
+        return [0.0] * len(papers)
+
+    # 文档：标题重复 TITLE_WEIGHT 次 + 摘要
+    docs = [tokenize(p.get("title")) * TITLE_WEIGHT + tokenize(p.get("abstract")) for p in papers]
+    n_docs = len(docs)
+    avg_len = sum(len(d) for d in docs) / n_docs or 1.0
+
+    term_freqs = [Counter(d) for d in docs]
+    doc_freq = Counter(t for tf in term_freqs for t in query_terms if t in tf)
+    idf = {
+        t: math.log((n_docs - df + 0.5) / (df + 0.5) + 1.0)
+        for t, df in doc_freq.items()
+    }
+
+    scores = []
+    for doc, tf in zip(docs, term_freqs):
+        norm = BM25_K1 * (1.0 - BM25_B + BM25_B * len(doc) / avg_len)
+        scores.append(sum(
+            weight * tf[t] * (BM25_K1 + 1.0) / (tf[t] + norm)
+            for t, weight in idf.items() if t in tf
+        ))
+    return scores
+
+
+# 标题中的数字（版本号、年份等）
+_DIGITS_RE = re.compile(r"\d+")
+
+
+def fused_scores(papers: List[dict], relevance: List[float]) -> List[float]:
+    """
+    融合相关性、年份和引用数的综合分
+
+    综合分 = 相关性 × max(RECENCY_MIN_FACTOR, 1 + RECENCY_PER_YEAR × (年份 - RECENCY_BASE_YEAR))
+           + CITATION_WEIGHT × log1p(引用数)
+
+    先把年份、引用数各抽成一列，再按列逐项计算。缺失年份视为 RECENCY_BASE_YEAR，
+    缺失引用视为 0。引用加成量级很小，主要在相关性相同时（如都为 0）起排序作用。
+
+    Args:
+        papers: 论文列表
+        relevance: 与 papers 对应的相关性分数（如 bm25_scores 的结果）
+
+    Returns:
+        与 papers 顺序一致的综合分
+    """
+    years = [p.get("year") or RECENCY_BASE_YEAR for p in papers]
+    citations = [p.get("citation_count") or 0 for p in papers]
+    return [
+        rel * max(RECENCY_MIN_FACTOR, 1.0 + RECENCY_PER_YEAR * (year - RECENCY_BASE_YEAR))
+        + CITATION_WEIGHT * math.log1p(max(cites, 0))
+        for rel, year, cites in zip(relevance, years, citations)
+    ]
+
+
+class NearDuplicateIndex:
+    """
+    标题近重复索引（增量版 drop_near_duplicates）
+
+    用 3-gram → 已收录论文 的倒排索引找候选，只和共享 3-gram 的论文比较，
+    交集大小在遍历倒排表时顺带计数，不必逐对求集合交集。
+    标题中的数字不同（如 "Llama 2" / "Llama 3"）不视为重复。
+    索引可跨批次保留，例如多轮研究的原始笔记逐轮去重。
+    """
+
+    def __init__(self, threshold: float = NEAR_DUPLICATE_THRESHOLD):
+        self.threshold = threshold
+        self._index: Dict[str, List[int]] = {}
+        self._sizes: List[int] = []
+        self._digits: List[List[str]] = []
+
+    def __len__(self) -> int:
+        return len(self._sizes)
+
+    def add(self, paper: dict) -> bool:
+        """
+        收录一篇论文
+
+        Returns:
+            True 表示新论文（已加入索引），False 表示与已收录论文近重复
+        """
+        title = normalize_title(paper.get("title", ""))
+        shingles = title_shingles(title)
+        digits = _DIGITS_RE.findall(title)
+        overlap: Counter = Counter()
+        for s in shingles:
+            overlap.update(self._index.get(s, ()))
+
+        size = len(shingles)
+        if any(
+            inter / (size + self._sizes[j] - inter) >= self.threshold and self._digits[j] == digits
+            for j, inter in overlap.items()
+        ):
+            return False
+
+        for s in shingles:
+            self._index.setdefault(s, []).append(len(self._sizes))
+        self._sizes.append(size)
+        self._digits.append(digits)
+        return True
+
+
+def drop_near_duplicates(
+    papers: List[dict],
+    threshold: float = NEAR_DUPLICATE_THRESHOLD
+) -> List[dict]:
+    """
+    去除标题近重复的论文（保留首次出现，见 NearDuplicateIndex）
+
+    Args:
+        papers: 论文列表
+        threshold: Jaccard 相似度阈值
+
+    Returns:
+        去重后的论文列表
+    """
+    index = NearDuplicateIndex(threshold)
+    return [paper for paper in papers if index.add(paper)]
+
+
+def prefilter_papers(
+    papers: List[dict],
+    keywords: List[str],
+    keep: int
+) -> List[dict]:
+    """
+    按综合分（BM25 相关性 + 时效 + 引用，见 fused_scores）保留前 keep 篇论文
+
+    保留的论文维持原有顺序（搜索结果已按来源分组排序），
+    分数相同时原顺序靠前的优先。
+
+    Args:
+        papers: 论文列表
+        keywords: 查询文本（研究问题、搜索关键词）
+        keep: 保留数量
+
+    Returns:
+        筛选后的论文列表（数量不超过 keep 时原样返回）
+    """
+    if len(papers) <= keep:
+        return papers
+
+    scores = fused_scores(papers, bm25_scores(papers, " ".join(keywords)))
+    ranked = sorted(range(len(papers)), key=lambda i: -scores[i])
+    return [papers[i] for i in sorted(ranked[:keep])]
+
+
+def prompt_size(paper: dict) -> int:
+    """估算论文格式化进 prompt 后的字符数"""
+    abstract = paper.get("abstract") or ""
+    return (
+        len(paper.get("title") or "")
+        + min(len(abstract), PROMPT_ABSTRACT_CHARS)
+        + PROMPT_ENTRY_OVERHEAD
+    )
+
+
+def select_within_budget(
+    papers: List[dict],
+    keywords: List[str],
+    max_chars: int
+) -> List[dict]:
+    """
+    按综合分从高到低挑选论文，直到 prompt 字符预算用完
+
+    放不下的论文跳过、继续尝试后面较短的；至少保留综合分最高的一篇。
+    保留的论文维持原有顺序。
+
+    Args:
+        papers: 论文列表
+        keywords: 查询文本（研究问题、搜索关键词）
+        max_chars: 论文部分的字符预算
+
+    Returns:
+        筛选后的论文列表（总长度不超过预算时原样返回）
+    """
+    sizes = [prompt_size(p) for p in papers]
+    if sum(sizes) <= max_chars:
+        return papers
+
+    scores = fused_scores(papers, bm25_scores(papers, " ".join(keywords)))
+    chosen = []
+    used = 0
+    for i in sorted(range(len(papers)), key=lambda i: -scores[i]):
+        if not chosen or used + sizes[i] <= max_chars:
+            chosen.append(i)
+            used += sizes[i]
+    return [papers[i] for i in sorted(chosen)]
+
+
+# 测试代码
+if __name__ == "__main__":
+    papers = [
+        {"title": "Image Classification with CNNs", "abstract": "We study convolutional networks."},
+        {"title": "Attention Is All You Need", "abstract": "The Transformer relies on self-attention."},
+        {"title": "Attention is all you need.", "abstract": "Published version."},
+        {"title": "Recurrent Neural Networks Revisited", "abstract": "RNN and transformer comparison."},
+        {"title": "Graph Neural Networks", "abstract": "Message passing on graphs."},
+    ]
+    query = "Transformer 与 RNN 的对比 Transformer self-attention"
+
+    unique = drop_near_duplicates(papers)
+    print(f"近重复去除: {len(papers)} -> {len(unique)}")
+    for p, score in zip(unique, bm25_scores(unique, query)):
+        print(f"  {score:.3f}  {p['title']}")
+    for p in prefilter_papers(unique, [query], keep=2):
+        print(f"  保留: {p['title']}")
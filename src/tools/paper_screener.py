@@ -13,6 +13,8 @@ import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from utils import json_utils
+from utils.json_utils import find_json_object
 from utils.llm_client import QwenClient
 
 
@@ -211,16 +213,16 @@ class PaperScreener:
     def _parse_response(self, content: str) -> Optional[List[dict]]:
         """解析 LLM 响应"""
         try:
-            data = json.loads(content)
+            data = json_utils.loads(content)
             return data.get("evaluations", [])
         except json.JSONDecodeError:
             pass
 
-        # 尝试提取 JSON
-        json_match = re.search(r'\{[\s\S]*\}', content)
-        if json_match:
+        # 尝试提取第一个括号平衡的 JSON 对象
+        json_text = find_json_object(content)
+        if json_text:
             try:
-                data = json.loads(json_match.group())
+                data = json_utils.loads(json_text)
                 return data.get("evaluations", [])
             except json.JSONDecodeError:
                 pass
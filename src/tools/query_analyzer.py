@@ -1,13 +1,16 @@
 """查询分析器 - 理解用户意图并生成多组搜索关键词"""
 import json
 import re
+from collections import OrderedDict
 from typing import Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 
 import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from utils import json_utils
+from utils.json_utils import find_json_object
 from utils.llm_client import QwenClient
 
 
@@ -85,8 +88,17 @@ class QueryAnalyzer:
   "suggested_mode": "deep_research"
 }"""
 
+    # 分析结果缓存条数（交互式使用时同一问题常被重复提交）
+    ANALYSIS_CACHE_SIZE = 128
+
     def __init__(self, qwen_api_key: Optional[str] = None):
         self.llm_client = QwenClient(api_key=qwen_api_key) if qwen_api_key else None
+        self._analysis_cache: OrderedDict[str, QueryAnalysis] = OrderedDict()
+
+    @staticmethod
+    def _cache_key(query: str) -> str:
+        """缓存键：大小写折叠并合并空白"""
+        return " ".join(query.casefold().split())
 
     def _contains_chinese(self, text: str) -> bool:
         """检查文本是否包含中文"""
@@ -96,15 +108,15 @@ class QueryAnalyzer:
         """解析 LLM 响应的 JSON"""
         # 尝试直接解析
         try:
-            return json.loads(content)
+            return json_utils.loads(content)
         except json.JSONDecodeError:
             pass
 
-        # 尝试提取 JSON 块
-        json_match = re.search(r'\{[\s\S]*\}', content)
-        if json_match:
+        # 尝试提取第一个括号平衡的 JSON 对象
+        json_text = find_json_object(content)
+        if json_text:
             try:
-                return json.loads(json_match.group())
+                return json_utils.loads(json_text)
             except json.JSONDecodeError:
                 pass
 
@@ -125,6 +137,13 @@ class QueryAnalyzer:
         if not self.llm_client:
             return self._fallback_analyze(query)
 
+        # 命中缓存：返回副本（original_query 为本次输入，关键词列表独立）
+        key = self._cache_key(query)
+        cached = self._analysis_cache.get(key)
+        if cached is not None:
+            self._analysis_cache.move_to_end(key)
+            return replace(cached, original_query=query, keywords=list(cached.keywords))
+
         try:
             # 使用通义千问 turbo 模型（意图识别是简单任务）
             prompt = f"{self.SYSTEM_PROMPT}\n\n用户查询: {query}"
@@ -148,6 +167,10 @@ class QueryAnalyzer:
                 print(f"[QueryAnalyzer] 意图: {result.intent}")
                 print(f"[QueryAnalyzer] 关键词: {result.keywords}")
                 print(f"[QueryAnalyzer] 建议模式: {result.suggested_mode}")
+                # 只缓存 LLM 成功解析的结果，回退结果不缓存（下次仍会重试 LLM）
+                self._analysis_cache[key] = replace(result, keywords=list(result.keywords))
+                if len(self._analysis_cache) > self.ANALYSIS_CACHE_SIZE:
+                    self._analysis_cache.popitem(last=False)
                 return result
             else:
                 return self._fallback_analyze(query)
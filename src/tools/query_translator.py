@@ -1,8 +1,13 @@
 """查询翻译器 - 将中文查询翻译为英文搜索关键词"""
-import httpx
 import re
 from typing import Optional
 
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.llm_client import get_sync_client
+
 
 class QueryTranslator:
     """
@@ -81,7 +86,8 @@ class QueryTranslator:
         try:
             api_url, api_key, model = self._get_api_config()
 
-            response = httpx.post(
+            # 复用进程内共享的连接池（与 QwenClient 共用）
+            response = get_sync_client().post(
                 api_url,
                 headers={
                     "Authorization": f"Bearer {api_key}",
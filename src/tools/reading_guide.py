@@ -1,12 +1,13 @@
 """阅读导航 - 根据搜索结果生成论文阅读建议"""
 import json
-import re
 from typing import Optional
 
 import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from utils import json_utils
+from utils.json_utils import find_json_object
 from utils.llm_client import QwenClient
 
 
@@ -83,19 +84,33 @@ class ReadingGuide:
     def _parse_response(self, content: str) -> dict:
         """解析 LLM 响应"""
         try:
-            return json.loads(content)
+            return json_utils.loads(content)
         except json.JSONDecodeError:
             pass
 
-        json_match = re.search(r'\{[\s\S]*\}', content)
-        if json_match:
+        json_text = find_json_object(content)
+        if json_text:
             try:
-                return json.loads(json_match.group())
+                return json_utils.loads(json_text)
             except json.JSONDecodeError:
                 pass
 
         return None
 
+    def _build_prompt(self, query: str, papers: list) -> str:
+        """构造阅读导航提示词"""
+        papers_text = self._format_papers_for_prompt(papers)
+        return f"{self.SYSTEM_PROMPT}\n\n研究问题: {query}\n\n论文列表:\n{papers_text}"
+
+    def _guide_from_content(self, content: str, papers: list) -> dict:
+        """LLM 响应 → 阅读导航（解析失败时使用规则回退）"""
+        parsed = self._parse_response(content)
+
+        if parsed:
+            return self._format_guide(parsed, papers)
+        else:
+            return self._fallback_guide(papers)
+
     def generate(self, query: str, papers: list) -> dict:
         """
         生成阅读导航
@@ -114,24 +129,37 @@ class ReadingGuide:
             return self._fallback_guide(papers)
 
         try:
-            papers_text = self._format_papers_for_prompt(papers)
-
             # 使用通义千问 turbo 模型（阅读导航是简单分类任务）
-            prompt = f"{self.SYSTEM_PROMPT}\n\n研究问题: {query}\n\n论文列表:\n{papers_text}"
             content = self.llm_client.chat(
-                prompt=prompt,
+                prompt=self._build_prompt(query, papers),
                 task_type="screen",
                 max_tokens=500,
                 temperature=0.3,
                 timeout=30.0
             )
+            return self._guide_from_content(content, papers)
+
+        except Exception as e:
+            print(f"[ReadingGuide] 生成出错: {e}")
+            return self._fallback_guide(papers)
+
+    async def agenerate(self, query: str, papers: list) -> dict:
+        """generate 的异步版本（复用当前事件循环的共享连接池）"""
+        if not papers:
+            return {"error": "没有论文可分析"}
 
-            parsed = self._parse_response(content)
+        if not self.llm_client:
+            return self._fallback_guide(papers)
 
-            if parsed:
-                return self._format_guide(parsed, papers)
-            else:
-                return self._fallback_guide(papers)
+        try:
+            content = await self.llm_client.chat_async(
+                prompt=self._build_prompt(query, papers),
+                task_type="screen",
+                max_tokens=500,
+                temperature=0.3,
+                timeout=30.0
+            )
+            return self._guide_from_content(content, papers)
 
         except Exception as e:
             print(f"[ReadingGuide] 生成出错: {e}")
@@ -2,4 +2,4 @@
 from .semantic_scholar import SemanticScholarSearch, Paper
 from .arxiv_search import ArxivSearch
 from .openalex_search import OpenAlexSearch
-from .unified_search import UnifiedSearch, SearchResult
+from .unified_search import UnifiedSearch, SearchResult, get_default_searcher
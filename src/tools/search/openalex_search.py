@@ -19,17 +19,19 @@ class OpenAlexSearch:
 
     BASE_URL = "https://api.openalex.org/works"
 
-    def __init__(self, email: Optional[str] = None):
+    def __init__(self, email: Optional[str] = None, client: Optional[httpx.Client] = None):
         """
         初始化 OpenAlex 搜索
 
         Args:
             email: 可选，提供邮箱可获得更高的速率限制（polite pool）
+            client: 共享的 HTTP 客户端（可选，复用连接池）
         """
         self.email = email
         self.headers = {"Accept": "application/json"}
         if email:
             self.headers["User-Agent"] = f"mailto:{email}"
+        self.client = client or httpx.Client()
 
     def search(self, query: str, limit: int = 10) -> List[Paper]:
         """
@@ -54,14 +56,14 @@ class OpenAlexSearch:
             params["mailto"] = self.email
 
         try:
-            with httpx.Client(timeout=30.0) as client:
-                response = client.get(
-                    self.BASE_URL,
-                    params=params,
-                    headers=self.headers
-                )
-                response.raise_for_status()
-                data = response.json()
+            response = self.client.get(
+                self.BASE_URL,
+                params=params,
+                headers=self.headers,
+                timeout=30.0
+            )
+            response.raise_for_status()
+            data = response.json()
         except httpx.HTTPError as e:
             print(f"[OpenAlex] 搜索出错: {e}")
             return []
@@ -22,9 +22,15 @@ class SemanticScholarSearch:
 
     BASE_URL = "https://api.semanticscholar.org/graph/v1"
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, client: Optional[httpx.Client] = None):
+        """
+        Args:
+            api_key: Semantic Scholar API Key（可选）
+            client: 共享的 HTTP 客户端（可选，复用连接池）
+        """
         self.api_key = api_key
         self.headers = {"x-api-key": api_key} if api_key else {}
+        self.client = client or httpx.Client()
 
     def search(
         self,
@@ -34,7 +40,7 @@ class SemanticScholarSearch:
     ) -> List[Paper]:
         """搜索论文"""
         try:
-            response = httpx.get(
+            response = self.client.get(
                 f"{self.BASE_URL}/paper/search",
                 params={"query": query, "limit": limit, "fields": fields},
                 headers=self.headers,
@@ -67,7 +73,7 @@ class SemanticScholarSearch:
     def get_paper(self, paper_id: str) -> Optional[Paper]:
         """获取单篇论文详情"""
         try:
-            response = httpx.get(
+            response = self.client.get(
                 f"{self.BASE_URL}/paper/{paper_id}",
                 params={"fields": "title,abstract,url,year,authors,citationCount"},
                 headers=self.headers,
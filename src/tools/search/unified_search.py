@@ -1,7 +1,9 @@
 """统一搜索器 - 整合多个搜索源"""
-from typing import List, Optional, Literal
-from dataclasses import dataclass
+from typing import Dict, List, Optional, Literal
+from dataclasses import dataclass, asdict
 from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
+import httpx
 import sys
 from pathlib import Path
 
@@ -10,7 +12,9 @@ src_dir = Path(__file__).parent.parent.parent
 if str(src_dir) not in sys.path:
     sys.path.insert(0, str(src_dir))
 
+from utils.cache import DiskCache
 from utils.logger import get_search_logger
+from utils.text_utils import normalize_title
 from .semantic_scholar import SemanticScholarSearch, Paper
 from .arxiv_search import ArxivSearch
 from .openalex_search import OpenAlexSearch
@@ -35,11 +39,20 @@ class UnifiedSearch:
     默认使用 arXiv + OpenAlex（替代 Semantic Scholar，因后者有严格的速率限制）
     """
 
+    # 每个搜索源同时进行的最大请求数（多任务 × 多关键词并发时保护上游速率限制）
+    SOURCE_CONCURRENCY = {
+        "arxiv": 4,
+        "openalex": 8,
+        "semantic_scholar": 2
+    }
+
     def __init__(
         self,
         semantic_scholar_key: Optional[str] = None,
         openalex_email: Optional[str] = None,
-        sources: List[str] = None
+        sources: List[str] = None,
+        client: Optional[httpx.Client] = None,
+        cache: Optional[DiskCache] = None
     ):
         """
         初始化统一搜索器
@@ -48,18 +61,38 @@ class UnifiedSearch:
             semantic_scholar_key: Semantic Scholar API Key（可选）
             openalex_email: OpenAlex 邮箱（可选，提高速率限制）
             sources: 要使用的搜索源列表，默认["arxiv", "openalex"]
+            client: 共享的 HTTP 客户端（默认创建一个 HTTP/2 长连接池）
+            cache: 搜索结果磁盘缓存（可选，None 表示不缓存）
         """
+        self.cache = cache
         # 默认使用 arXiv + OpenAlex（OpenAlex 替代 Semantic Scholar）
         self.sources = sources or ["arxiv", "openalex"]
 
+        # 各 HTTP 搜索源共享连接池，避免每次搜索重新建立 TCP/TLS 连接
+        self._owns_client = client is None
+        self.client = client or httpx.Client(
+            http2=True,
+            timeout=30.0,
+            limits=httpx.Limits(
+                max_keepalive_connections=32, max_connections=64, keepalive_expiry=60.0
+            )
+        )
+
         # 初始化各搜索源
         self.searchers = {}
         if "semantic_scholar" in self.sources:
-            self.searchers["semantic_scholar"] = SemanticScholarSearch(api_key=semantic_scholar_key)
+            self.searchers["semantic_scholar"] = SemanticScholarSearch(
+                api_key=semantic_scholar_key, client=self.client
+            )
         if "arxiv" in self.sources:
             self.searchers["arxiv"] = ArxivSearch()
         if "openalex" in self.sources:
-            self.searchers["openalex"] = OpenAlexSearch(email=openalex_email)
+            self.searchers["openalex"] = OpenAlexSearch(email=openalex_email, client=self.client)
+
+        self._source_slots = {
+            source: threading.BoundedSemaphore(self.SOURCE_CONCURRENCY.get(source, 4))
+            for source in self.searchers
+        }
 
     def search(
         self,
@@ -81,6 +114,19 @@ class UnifiedSearch:
             SearchResult: 合并后的搜索结果
         """
         sources_to_use = sources or list(self.searchers.keys())
+
+        cache_key = None
+        if self.cache is not None:
+            cache_key = DiskCache.make_key(query, limit, sorted(sources_to_use))
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                log.info(f"搜索命中缓存: query='{query}', limit={limit}")
+                return SearchResult(
+                    papers=[Paper(**p) for p in cached["papers"]],
+                    sources_used=cached["sources_used"],
+                    total_count=cached["total_count"]
+                )
+
         all_papers = []
         sources_used = []
 
@@ -123,36 +169,61 @@ class UnifiedSearch:
         log.info(f"搜索完成: 总计={len(all_papers)}, 去重后={len(unique_papers)}, 返回={min(len(sorted_papers), limit * 2)}")
         log.debug(f"使用的源: {sources_used}")
 
-        return SearchResult(
+        result = SearchResult(
             papers=sorted_papers[:limit * 2],  # 返回更多结果
             sources_used=sources_used,
             total_count=len(unique_papers)
         )
 
+        # 只缓存有结果的搜索，避免把临时故障缓存下来
+        if cache_key is not None and result.papers:
+            self.cache.set(cache_key, {
+                "papers": [asdict(p) for p in result.papers],
+                "sources_used": result.sources_used,
+                "total_count": result.total_count
+            })
+
+        return result
+
+    def warmup(self):
+        """
+        预先建立到各 HTTP 搜索源的连接（HEAD 请求，响应与错误均忽略）
+
+        用于交互场景在用户输入问题期间后台调用，首次搜索省去 TCP/TLS 握手。
+        """
+        for source, searcher in self.searchers.items():
+            base_url = getattr(searcher, "BASE_URL", None)
+            if base_url is None or getattr(searcher, "client", None) is not self.client:
+                continue
+            try:
+                self.client.head(base_url, timeout=5.0)
+            except httpx.HTTPError as e:
+                log.debug(f"{source} 预连接失败: {e}")
+
+    def close(self):
+        """关闭自建的 HTTP 连接池（外部传入的客户端由调用方负责关闭）"""
+        if self._owns_client:
+            self.client.close()
+
     def _search_single(self, source: str, query: str, limit: int) -> List[Paper]:
-        """单个源搜索"""
+        """单个源搜索（受该源的并发上限约束）"""
         searcher = self.searchers.get(source)
         if searcher:
-            return searcher.search(query, limit=limit)
+            with self._source_slots[source]:
+                return searcher.search(query, limit=limit)
         return []
 
     def _deduplicate(self, papers: List[Paper]) -> List[Paper]:
         """
         论文去重（基于标题）
 
-        简单实现：标题完全相同视为重复
+        归一化标题（大小写折叠、去标点、合并空白）相同视为重复，单次 dict 插入完成
         TODO: 后续可用模糊匹配或论文ID
         """
-        seen_titles = set()
-        unique = []
-
+        unique: dict = {}
         for paper in papers:
-            title_lower = paper.title.lower().strip()
-            if title_lower not in seen_titles:
-                seen_titles.add(title_lower)
-                unique.append(paper)
-
-        return unique
+            unique.setdefault(normalize_title(paper.title), paper)
+        return list(unique.values())
 
     def _group_by_source(self, papers: List[Paper]) -> List[Paper]:
         """
@@ -198,6 +269,45 @@ class UnifiedSearch:
         # 合并：arXiv在前，OpenAlex在后
         return arxiv_papers + openalex_papers + other_papers
 
+    def search_many(
+        self,
+        queries: List[str],
+        limit: int = 10
+    ) -> List[SearchResult]:
+        """
+        并发执行多个独立搜索
+
+        每个查询内部仍按源并行，因此 3 个关键词 × 2 个源会同时发出 6 个请求，
+        总耗时约等于最慢的一次搜索，而不是逐个相加。
+
+        Args:
+            queries: 搜索关键词列表
+            limit: 每个源返回的最大数量
+
+        Returns:
+            List[SearchResult]: 与 queries 顺序一致的搜索结果（出错的查询返回空结果）
+        """
+        if not queries:
+            return []
+
+        results: List[SearchResult] = [
+            SearchResult(papers=[], sources_used=[], total_count=0) for _ in queries
+        ]
+
+        with ThreadPoolExecutor(max_workers=len(queries)) as executor:
+            futures = {
+                executor.submit(self.search, query, limit): i
+                for i, query in enumerate(queries)
+            }
+            for future in as_completed(futures):
+                i = futures[future]
+                try:
+                    results[i] = future.result()
+                except Exception as e:
+                    log.error(f"搜索 '{queries[i]}' 出错: {e}")
+
+        return results
+
     def search_multi_keywords(
         self,
         keywords: List[str],
@@ -273,6 +383,31 @@ class UnifiedSearch:
         return self._search_single("openalex", query, limit)
 
 
+# 进程级默认搜索器（按是否启用磁盘缓存各一个）：未显式传入 searcher 的 Agent、
+# 各深度研究协调器共享同一个连接池
+_DEFAULT_SEARCHERS: Dict[bool, UnifiedSearch] = {}
+_DEFAULT_SEARCHER_LOCK = threading.Lock()
+
+
+def get_default_searcher(cached: bool = False) -> UnifiedSearch:
+    """
+    获取进程内共享的默认搜索器（首次调用时创建，线程安全）
+
+    默认配置（arXiv + OpenAlex）。其它配置（如 Semantic Scholar Key）请自行创建 UnifiedSearch。
+
+    Args:
+        cached: 是否使用带搜索结果磁盘缓存（data/cache/search，1 天过期）的搜索器
+    """
+    with _DEFAULT_SEARCHER_LOCK:
+        searcher = _DEFAULT_SEARCHERS.get(cached)
+        if searcher is None:
+            searcher = UnifiedSearch(
+                cache=DiskCache("search", ttl_seconds=86400) if cached else None
+            )
+            _DEFAULT_SEARCHERS[cached] = searcher
+    return searcher
+
+
 # 测试代码
 if __name__ == "__main__":
     print("=" * 60)
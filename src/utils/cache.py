@@ -0,0 +1,146 @@
+"""磁盘缓存
+
+将搜索结果、LLM 响应等可复用的数据以 JSON 文件形式缓存到 data/cache/ 下，
+重复查询时直接读取本地文件，省去远程请求。
+
+- 按命名空间分目录（search / llm ...）
+- 支持过期时间（TTL）
+- 条目数超过上限时按最近访问时间淘汰（近似 LRU）
+"""
+import hashlib
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+from .config import Config
+from . import json_utils
+from .logger import get_logger
+
+log = get_logger("cache")
+
+CACHE_DIR = Config.DATA_DIR / "cache"
+
+
+class DiskCache:
+    """
+    基于 JSON 文件的磁盘缓存
+
+    使用方式：
+    ```python
+    cache = DiskCache("search", ttl_seconds=86400)
+    key = DiskCache.make_key("transformer", 10)
+    value = cache.get(key)
+    if value is None:
+        value = do_search()
+        cache.set(key, value)
+    ```
+    """
+
+    def __init__(
+        self,
+        namespace: str,
+        ttl_seconds: float = 86400,
+        max_entries: int = 2000,
+        root: Optional[Path] = None
+    ):
+        """
+        初始化缓存
+
+        Args:
+            namespace: 命名空间（子目录名）
+            ttl_seconds: 过期时间（秒）
+            max_entries: 最大条目数，超过后淘汰最久未访问的条目
+            root: 缓存根目录（默认 data/cache）
+        """
+        self.dir = (root or CACHE_DIR) / namespace
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    @staticmethod
+    def make_key(*parts: Any) -> str:
+        """由任意参数生成缓存键（blake2b 哈希）"""
+        digest = hashlib.blake2b(digest_size=20)
+        for part in parts:
+            digest.update(str(part).encode("utf-8"))
+            digest.update(b"\x1f")
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.dir / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        读取缓存
+
+        Returns:
+            缓存的值，未命中或已过期返回 None
+        """
+        path = self._path(key)
+        try:
+            entry = json_utils.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            log.warning(f"读取缓存失败 {path.name}: {e}")
+            return None
+
+        if time.time() - entry.get("created", 0) > self.ttl_seconds:
+            path.unlink(missing_ok=True)
+            return None
+
+        # 更新修改时间作为最近访问时间，供淘汰时参考
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry.get("value")
+
+    def set(self, key: str, value: Any) -> None:
+        """写入缓存（原子替换，写失败只记录日志）"""
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        try:
+            entry = {"created": time.time(), "value": value}
+            tmp_path.write_text(json_utils.dumps(entry), encoding="utf-8")
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            log.warning(f"写入缓存失败 {path.name}: {e}")
+            tmp_path.unlink(missing_ok=True)
+            return
+
+        with self._lock:
+            self._writes += 1
+            should_evict = self._writes % 100 == 0
+        if should_evict:
+            self._evict()
+
+    def _evict(self) -> None:
+        """条目超过上限时，删除最久未访问的条目"""
+        entries = list(self.dir.glob("*.json"))
+        overflow = len(entries) - self.max_entries
+        if overflow <= 0:
+            return
+
+        def mtime(path: Path) -> float:
+            try:
+                return path.stat().st_mtime
+            except FileNotFoundError:
+                return 0.0
+
+        entries.sort(key=mtime)
+        for path in entries[:overflow]:
+            path.unlink(missing_ok=True)
+        log.info(f"缓存 {self.dir.name} 淘汰 {overflow} 条")
+
+    def clear(self) -> int:
+        """清空缓存，返回删除的条目数"""
+        count = 0
+        for path in self.dir.glob("*.json"):
+            path.unlink(missing_ok=True)
+            count += 1
+        return count
@@ -31,6 +31,9 @@ class Config:
     # 搜索配置
     DEFAULT_SEARCH_LIMIT = int(os.getenv("DEFAULT_SEARCH_LIMIT", "10"))
 
+    # 缓存配置：深度研究的搜索结果 / LLM 响应缓存到 data/cache（设为 false 关闭）
+    USE_CACHE = os.getenv("USE_CACHE", "true").strip().lower() not in ("0", "false", "no", "off")
+
     @classmethod
     def validate(cls):
         """验证必要配置"""
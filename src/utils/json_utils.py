@@ -0,0 +1,195 @@
+"""JSON 工具
+
+LLM 响应中经常夹杂解释文字或 ```json 代码块，
+这里提供从文本中定位 JSON 对象的轻量扫描器，供各 Agent 的 _parse_response 复用。
+
+可选依赖 orjson：安装后 loads / dumps 自动使用 orjson（更快），否则回退到标准库 json。
+"""
+import json
+import re
+from typing import Any, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# JSON 结构字符：花括号（数组扫描时为方括号）、引号、转义符
+_STRUCTURAL_RE = re.compile(r'[{}"\\]')
+_ARRAY_STRUCTURAL_RE = re.compile(r'[\[\]"\\]')
+
+
+def loads(text: str) -> Any:
+    """
+    解析 JSON 文本
+
+    orjson.JSONDecodeError 是 json.JSONDecodeError 的子类，
+    调用方统一捕获 json.JSONDecodeError 即可。
+    """
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def dumps(obj: Any) -> str:
+    """
+    序列化为 JSON 文本（保留非 ASCII 字符，不转义中文）
+
+    orjson 序列化失败抛出的 orjson.JSONEncodeError 是 TypeError 的子类，
+    与标准库行为一致。
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False)
+
+
+def find_json_object(text: str) -> Optional[str]:
+    """
+    查找文本中第一个括号平衡的 JSON 对象
+
+    单次线性扫描，跟踪 {/} 深度，并跳过字符串字面量（含转义）中的括号，
+    找到第一个完整对象即返回，不会像贪婪正则那样扫到末尾再回溯。
+
+    Args:
+        text: LLM 原始输出
+
+    Returns:
+        JSON 对象子串，未找到完整对象返回 None
+    """
+    return JsonObjectScanner().feed(text)
+
+
+def find_json_array(text: str) -> Optional[str]:
+    """
+    查找文本中第一个括号平衡的 JSON 数组（find_json_object 的数组版本）
+
+    Args:
+        text: LLM 原始输出
+
+    Returns:
+        JSON 数组子串，未找到完整数组返回 None
+    """
+    return JsonObjectScanner(array=True).feed(text)
+
+
+class JsonObjectScanner:
+    """
+    增量版 find_json_object
+
+    流式响应逐块 feed，扫描状态（深度、是否在字符串内、转义位置）跨块保留，
+    每个字符只扫描一次；第一个对象闭合时即可停止读取剩余输出。
+
+    使用示例：
+    ```python
+    scanner = JsonObjectScanner()
+    for chunk in stream:
+        json_text = scanner.feed(chunk)
+        if json_text is not None:
+            break
+    ```
+    """
+
+    def __init__(self, array: bool = False):
+        """
+        Args:
+            array: 为 True 时扫描 JSON 数组（[/]）而不是对象
+        """
+        self._open = "[" if array else "{"
+        self._structural_re = _ARRAY_STRUCTURAL_RE if array else _STRUCTURAL_RE
+        self._parts: list[str] = []
+        self._length = 0          # 已接收的总字符数
+        self._start = -1          # 第一个左括号的绝对位置
+        self._depth = 0
+        self._in_string = False
+        self._skip_to = 0         # 转义符之后的字符位置（绝对位置）
+        self.result: Optional[str] = None
+
+    def feed(self, chunk: str) -> Optional[str]:
+        """
+        追加一段文本
+
+        Returns:
+            第一个完整 JSON 对象子串；尚未闭合返回 None
+        """
+        if self.result is not None:
+            return self.result
+
+        offset = self._length
+        self._parts.append(chunk)
+        self._length += len(chunk)
+
+        begin = 0
+        if self._start < 0:
+            begin = chunk.find(self._open)
+            if begin < 0:
+                return None
+            self._start = offset + begin
+
+        # 只在结构字符处停下，其余字符由正则引擎在 C 层跳过
+        for match in self._structural_re.finditer(chunk, begin):
+            pos = offset + match.start()
+            if pos < self._skip_to:
+                continue  # 被转义的字符
+            ch = match.group()
+
+            if ch == "\\":
+                self._skip_to = pos + 2
+            elif ch == '"':
+                self._in_string = not self._in_string
+            elif self._in_string:
+                continue
+            elif ch == self._open:
+                self._depth += 1
+            else:
+                self._depth -= 1
+                if self._depth == 0:
+                    self.result = "".join(self._parts)[self._start:pos + 1]
+                    self._parts = []
+                    return self.result
+
+        return None
+
+
+class JsonListEncoder:
+    """
+    只追加列表的增量序列化
+
+    LLM 对话历史每轮只在末尾追加消息，整表重新 dumps 会让早期的大段工具输出
+    每轮都被重新转义一遍。这里缓存已编码元素的 JSON 文本，每次只编码新增部分。
+
+    约定：已编码的元素不再被修改；传入另一个列表或列表变短时从头重新编码。
+
+    使用示例：
+    ```python
+    encoder = JsonListEncoder()
+    for round in rounds:
+        messages.append(...)
+        body = encoder.encode(messages)
+    ```
+    """
+
+    def __init__(self):
+        self._items: Optional[list] = None
+        self._parts: list[str] = []
+
+    def encode(self, items: list) -> str:
+        """返回 items 的 JSON 数组文本"""
+        if items is not self._items or len(items) < len(self._parts):
+            self._items = items
+            self._parts = []
+        for item in items[len(self._parts):]:
+            self._parts.append(dumps(item))
+        return "[" + ",".join(self._parts) + "]"
+
+
+# 测试代码
+if __name__ == "__main__":
+    samples = [
+        '{"title": "测试"}',
+        '好的，结果如下：\n```json\n{"a": {"b": 1}, "c": "x}y"}\n```\n以上。',
+        '{"quote": "he said \\"{\\" here"} trailing {"second": 2}',
+        "没有 JSON",
+        '{"unclosed": 1',
+    ]
+    for s in samples:
+        print(repr(find_json_object(s)))
@@ -3,9 +3,16 @@
 支持通义千问 API，针对不同任务使用不同规模的模型。
 """
 import os
+import asyncio
+import atexit
+import random
+import threading
+import time
+import weakref
 import httpx
-from typing import Optional, Literal
+from typing import Iterator, List, Optional, Literal, Union
 
+from . import json_utils
 from .logger import get_llm_logger
 
 log = get_llm_logger()
@@ -13,6 +20,95 @@ log = get_llm_logger()
 TaskType = Literal["intent", "screen", "compress", "report"]
 ModelSize = Literal["turbo", "plus", "max"]
 
+# 异步连接池：AsyncClient 绑定创建它的事件循环，因此按事件循环各保留一个，
+# 同一循环内的所有 QwenClient 实例共享连接（HTTP/2 多路复用，免去重复 TLS 握手）
+_ASYNC_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+# 空闲连接保留 60 秒（httpx 默认 5 秒）：摘要分批、Supervisor 各轮之间的 LLM 调用间隔
+# 常超过 5 秒，默认值下连接会被回收，下一批请求又要重新握手
+_ASYNC_LIMITS = httpx.Limits(max_keepalive_connections=32, max_connections=64, keepalive_expiry=60.0)
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """获取当前事件循环的共享 AsyncClient（不存在则创建）"""
+    loop = asyncio.get_running_loop()
+    client = _ASYNC_CLIENTS.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(http2=True, limits=_ASYNC_LIMITS)
+        _ASYNC_CLIENTS[loop] = client
+    return client
+
+
+# 同步连接池：进程内所有 QwenClient 共享（httpx.Client 线程安全），
+# 各轮 / 各线程的同步调用复用同一连接，不再每次请求重新握手
+_SYNC_CLIENT: Optional[httpx.Client] = None
+_SYNC_CLIENT_LOCK = threading.Lock()
+_SYNC_LIMITS = httpx.Limits(max_keepalive_connections=8, max_connections=16, keepalive_expiry=60.0)
+
+
+def get_sync_client() -> httpx.Client:
+    """获取进程内共享的同步 Client（首次调用时创建，进程退出时关闭）"""
+    global _SYNC_CLIENT
+    with _SYNC_CLIENT_LOCK:
+        if _SYNC_CLIENT is None or _SYNC_CLIENT.is_closed:
+            _SYNC_CLIENT = httpx.Client(http2=True, limits=_SYNC_LIMITS)
+            atexit.register(_SYNC_CLIENT.close)
+        return _SYNC_CLIENT
+
+
+async def aclose_async_client() -> None:
+    """
+    关闭当前事件循环的共享 AsyncClient
+
+    在 asyncio.run(...) 包装的入口结束前调用，避免事件循环关闭后遗留连接。
+    """
+    client = _ASYNC_CLIENTS.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+class AsyncRateLimiter:
+    """
+    异步令牌桶限流器：每 period 秒最多 rate 次
+
+    令牌按恒定速率补充，桶容量为 rate（允许短时突发）；令牌不足时按先来后到等待。
+    内部的 asyncio.Lock 在首次使用时绑定事件循环，不要跨事件循环共享同一实例。
+
+    使用示例：
+    ```python
+    limiter = AsyncRateLimiter(60, 60.0)  # 每分钟 60 次
+    async with limiter:
+        await client.post(...)
+    ```
+    """
+
+    def __init__(self, rate: float, period: float = 60.0):
+        self.rate = rate
+        self.period = period
+        self._tokens = float(rate)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """取得一个令牌（不足时等待）"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.rate, self._tokens + (now - self._updated) * self.rate / self.period)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) * self.period / self.rate)
+
+    async def __aenter__(self) -> "AsyncRateLimiter":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        return None
+
 
 class QwenClient:
     """
@@ -42,6 +138,10 @@ class QwenClient:
         "report": "plus"        # 报告生成 - 中模型
     }
 
+    # 重试退避：第 n 次重试前等待 [0, min(MAX, BASE * 2^n)] 内的随机时长（full jitter）
+    RETRY_BASE_DELAY = 1.0
+    RETRY_MAX_DELAY = 4.0
+
     def __init__(self, api_key: Optional[str] = None):
         """
         初始化客户端
@@ -62,7 +162,8 @@ class QwenClient:
         max_tokens: int = 2000,
         temperature: float = 0.3,
         timeout: float = 30.0,
-        model_override: Optional[ModelSize] = None
+        model_override: Optional[ModelSize] = None,
+        system_prompt: Optional[str] = None
     ) -> str:
         """
         调用通义千问 API
@@ -74,6 +175,8 @@ class QwenClient:
             temperature: 温度参数
             timeout: 超时时间（秒）
             model_override: 强制使用指定模型（覆盖自动选择）
+            system_prompt: 系统提示词（可选；固定的指令放这里，
+                服务端可跨请求复用其前缀缓存）
 
         Returns:
             str: LLM 响应内容
@@ -81,44 +184,245 @@ class QwenClient:
         Raises:
             Exception: API 调用失败
         """
-        # 选择模型
-        model_size = model_override or self.TASK_MODEL_MAP[task_type]
-        model_name = self.MODELS[model_size]
-
-        log.info(f"任务: {task_type}, 使用模型: {model_name}")
-        log.debug(f"Prompt 长度: {len(prompt)} 字符, max_tokens: {max_tokens}")
+        payload = self._build_request(
+            prompt, task_type, max_tokens, temperature, model_override, system_prompt
+        )
 
         # 调用 API
         try:
-            response = httpx.post(
+            response = get_sync_client().post(
                 self.API_URL,
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": model_name,
-                    "messages": [{"role": "user", "content": prompt}],
-                    "max_tokens": max_tokens,
-                    "temperature": temperature
-                },
+                headers=self._headers(),
+                json=payload,
                 timeout=timeout
             )
-            response.raise_for_status()
+            return self._handle_response(response)
+        except httpx.TimeoutException:
+            log.error(f"API 调用超时: {timeout}秒")
+            raise
+        except httpx.HTTPStatusError as e:
+            log.error(f"API 返回错误: {e.response.status_code} - {e.response.text[:200]}")
+            raise
+        except Exception as e:
+            log.error(f"API 调用异常: {type(e).__name__}: {str(e)}")
+            raise
+
+    def chat_stream(
+        self,
+        prompt: str,
+        task_type: TaskType,
+        max_tokens: int = 2000,
+        temperature: float = 0.3,
+        timeout: float = 30.0,
+        model_override: Optional[ModelSize] = None,
+        system_prompt: Optional[str] = None
+    ) -> Iterator[str]:
+        """
+        流式调用通义千问 API（参数与 chat 相同，不做重试）
+
+        逐块产出增量文本。调用方提前停止迭代并 close() 生成器时，
+        HTTP 连接随之关闭，服务端不再继续生成剩余 token。
+
+        Yields:
+            str: 响应内容增量
+        """
+        payload = self._build_request(
+            prompt, task_type, max_tokens, temperature, model_override, system_prompt
+        )
+        payload["stream"] = True
+
+        length = 0
+        try:
+            with get_sync_client().stream(
+                "POST",
+                self.API_URL,
+                headers=self._headers(),
+                json=payload,
+                timeout=timeout
+            ) as response:
+                if response.is_error:
+                    response.read()
+                response.raise_for_status()
 
-            content = response.json()["choices"][0]["message"]["content"]
-            log.info(f"响应成功, 长度: {len(content)} 字符")
-            log.debug(f"响应预览: {content[:200]}..." if len(content) > 200 else f"响应: {content}")
-            return content
-        except httpx.TimeoutException as e:
+                # SSE：每行 "data: {...}"，以 "data: [DONE]" 结束
+                for line in response.iter_lines():
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[5:].strip()
+                    if data == "[DONE]":
+                        break
+                    choices = json_utils.loads(data).get("choices")
+                    delta = choices[0].get("delta", {}).get("content") if choices else None
+                    if delta:
+                        length += len(delta)
+                        yield delta
+        except httpx.TimeoutException:
             log.error(f"API 调用超时: {timeout}秒")
             raise
         except httpx.HTTPStatusError as e:
             log.error(f"API 返回错误: {e.response.status_code} - {e.response.text[:200]}")
             raise
+        except GeneratorExit:
+            log.info(f"流式响应提前结束, 已接收: {length} 字符")
+            raise
         except Exception as e:
             log.error(f"API 调用异常: {type(e).__name__}: {str(e)}")
             raise
+        else:
+            log.info(f"流式响应成功, 长度: {length} 字符")
+
+    async def chat_async(
+        self,
+        prompt: str,
+        task_type: TaskType,
+        max_tokens: int = 2000,
+        temperature: float = 0.3,
+        timeout: float = 30.0,
+        model_override: Optional[ModelSize] = None,
+        system_prompt: Optional[str] = None
+    ) -> str:
+        """
+        异步调用通义千问 API（参数与 chat 相同）
+
+        复用当前事件循环的共享连接池，适合 asyncio.gather 并发调用。
+        """
+        payload = self._build_request(
+            prompt, task_type, max_tokens, temperature, model_override, system_prompt
+        )
+
+        try:
+            response = await get_async_client().post(
+                self.API_URL,
+                headers=self._headers(),
+                json=payload,
+                timeout=timeout
+            )
+            return self._handle_response(response)
+        except httpx.TimeoutException:
+            log.error(f"API 调用超时: {timeout}秒")
+            raise
+        except httpx.HTTPStatusError as e:
+            log.error(f"API 返回错误: {e.response.status_code} - {e.response.text[:200]}")
+            raise
+        except Exception as e:
+            log.error(f"API 调用异常: {type(e).__name__}: {str(e)}")
+            raise
+
+    async def chat_batch_async(
+        self,
+        prompts: List[str],
+        task_type: TaskType,
+        max_tokens: int = 2000,
+        temperature: float = 0.3,
+        timeout: float = 30.0,
+        model_override: Optional[ModelSize] = None,
+        system_prompt: Optional[str] = None
+    ) -> List[Union[str, Exception]]:
+        """
+        批量调用通义千问 API
+
+        DashScope 兼容模式没有同步批处理接口，这里在共享连接池上并发发出所有请求。
+        单个请求失败不影响其它请求。
+
+        Returns:
+            List[Union[str, Exception]]: 与 prompts 顺序一致，失败的位置为异常对象
+        """
+        return await asyncio.gather(
+            *(
+                self.chat_async(
+                    prompt,
+                    task_type,
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    timeout=timeout,
+                    model_override=model_override,
+                    system_prompt=system_prompt
+                )
+                for prompt in prompts
+            ),
+            return_exceptions=True
+        )
+
+    def _build_request(
+        self,
+        prompt: str,
+        task_type: TaskType,
+        max_tokens: int,
+        temperature: float,
+        model_override: Optional[ModelSize],
+        system_prompt: Optional[str] = None
+    ) -> dict:
+        """选择模型并构建请求体"""
+        model_size = model_override or self.TASK_MODEL_MAP[task_type]
+        model_name = self.MODELS[model_size]
+
+        log.info(f"任务: {task_type}, 使用模型: {model_name}")
+        log.debug(f"Prompt 长度: {len(prompt)} 字符, max_tokens: {max_tokens}")
+
+        messages = [{"role": "user", "content": prompt}]
+        if system_prompt:
+            messages.insert(0, {"role": "system", "content": system_prompt})
+
+        return {
+            "model": model_name,
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": temperature
+        }
+
+    def _retry_delay(
+        self,
+        error: Union[httpx.TransportError, httpx.HTTPStatusError],
+        attempt: int,
+        max_retries: int,
+        timeout: float
+    ) -> Optional[float]:
+        """
+        计算重试前的等待时长
+
+        限流（429）响应带 Retry-After（秒）时按其等待，否则与超时/连接失败一样随机退避。
+
+        Returns:
+            等待秒数；重试次数用尽时记录错误并返回 None
+        """
+        delay = random.uniform(0, min(self.RETRY_MAX_DELAY, self.RETRY_BASE_DELAY * 2 ** attempt))
+        if isinstance(error, httpx.HTTPStatusError):
+            reason = f"API 限流: {error.response.status_code}"
+            retry_after = error.response.headers.get("Retry-After", "")
+            if retry_after.isdigit():
+                delay = float(retry_after)
+        elif isinstance(error, httpx.TimeoutException):
+            reason = f"API 调用超时: {timeout:.1f}秒"
+        else:
+            reason = f"API 连接失败: {type(error).__name__}: {error}"
+
+        if attempt >= max_retries:
+            log.error(reason)
+            return None
+
+        log.warning(f"{reason}，{delay:.1f}秒后重试 ({attempt + 1}/{max_retries})")
+        return delay
+
+    def _headers(self) -> dict:
+        """请求头"""
+        return {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+
+    def _handle_response(self, response: httpx.Response) -> str:
+        """检查状态码并提取响应内容"""
+        response.raise_for_status()
+
+        content = response.json()["choices"][0]["message"]["content"]
+        log.info(f"响应成功, 长度: {len(content)} 字符")
+        log.debug(f"响应预览: {content[:200]}..." if len(content) > 200 else f"响应: {content}")
+        return content
+
+
+# 进程级客户端缓存（按 API Key），避免每个 Agent 各自初始化
+_CLIENTS: dict[str, "QwenClient"] = {}
+_CLIENTS_LOCK = threading.Lock()
 
 
 # 便捷函数
@@ -126,13 +430,21 @@ def get_qwen_client(api_key: Optional[str] = None) -> QwenClient:
     """
     获取通义千问客户端实例
 
+    同一 API Key 在进程内共享同一个实例（线程安全）。
+
     Args:
         api_key: API Key（可选）
 
     Returns:
         QwenClient: 客户端实例
     """
-    return QwenClient(api_key=api_key)
+    key = api_key or os.getenv("QWEN_API_KEY") or ""
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get(key)
+        if client is None:
+            client = QwenClient(api_key=api_key)
+            _CLIENTS[key] = client
+    return client
 
 
 # 测试代码
@@ -0,0 +1,78 @@
+"""文本工具
+
+论文标题归一化等轻量文本处理，供去重、标题匹配复用。
+"""
+import difflib
+import re
+from typing import Dict, Optional, Set, TypeVar
+
+T = TypeVar("T")
+
+# 非单词字符（标点、空白）连续段
+_NON_WORD_RE = re.compile(r"\W+")
+
+
+def normalize_title(title: str) -> str:
+    """
+    归一化论文标题：大小写折叠（casefold）、去标点、合并空白
+
+    "Attention Is All You Need!" 与 "attention is all  you need" 归一化后相同。
+    """
+    return _NON_WORD_RE.sub(" ", title.casefold()).strip()
+
+
+def title_shingles(text: str) -> Set[str]:
+    """归一化标题的字符 3-gram 集合（不足 3 个字符时为整个字符串）"""
+    if len(text) <= 3:
+        return {text} if text else set()
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def match_title(
+    title: str,
+    index: Dict[str, T],
+    cutoff: float = 0.85
+) -> Optional[T]:
+    """
+    在归一化标题索引中查找标题
+
+    先做 O(1) 精确查找；未命中时容忍 LLM 改写/截断标题：
+    依次尝试相似度匹配（difflib，相似度 >= cutoff）和子串包含。
+
+    Args:
+        title: 待匹配标题（如 LLM 返回的标题）
+        index: {normalize_title(原标题): 值}
+        cutoff: 相似度阈值
+
+    Returns:
+        匹配到的值，未匹配返回 None
+    """
+    key = normalize_title(title)
+    if not key:
+        return None
+
+    hit = index.get(key)
+    if hit is not None:
+        return hit
+
+    close = difflib.get_close_matches(key, index.keys(), n=1, cutoff=cutoff)
+    if close:
+        return index[close[0]]
+
+    for candidate, value in index.items():
+        if key in candidate:
+            return value
+    return None
+
+
+# 测试代码
+if __name__ == "__main__":
+    papers = {
+        normalize_title(t): t
+        for t in [
+            "Attention Is All You Need",
+            "BERT: Pre-training of Deep Bidirectional Transformers for Language Understanding",
+        ]
+    }
+    for q in ["attention is all you need.", "BERT Pre-training of Deep Bidirectional Transformers", "GPT-4"]:
+        print(f"{q!r} -> {match_title(q, papers)!r}")
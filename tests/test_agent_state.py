@@ -0,0 +1,29 @@
+"""V2 AgentState 测试"""
+import pytest
+
+pytest.importorskip("arxiv")  # V2 包导入时依赖 arXiv 搜索
+
+from src.agents.deep_research.v2.state import AgentState, RawNote
+
+
+class TestRawNotes:
+    """原始笔记测试类"""
+
+    def test_cross_round_dedup(self):
+        """测试与此前轮次标题近重复的论文不再重复存储，累计搜索数仍计入全部论文"""
+        state = AgentState()
+        state.add_raw_note(RawNote(
+            topic="注意力机制",
+            papers=[{"title": "Attention Is All You Need"}, {"title": "Graph Neural Networks"}],
+            search_keywords=["attention"],
+            round_number=1
+        ))
+        state.add_raw_note(RawNote(
+            topic="Transformer",
+            papers=[{"title": "Attention is all you need."}, {"title": "Mamba: Linear-Time Sequence Modeling"}],
+            search_keywords=["transformer"],
+            round_number=2
+        ))
+
+        assert state.papers_searched == 4
+        assert [p["title"] for p in state.raw_notes[1].papers] == ["Mamba: Linear-Time Sequence Modeling"]
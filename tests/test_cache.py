@@ -0,0 +1,28 @@
+"""磁盘缓存测试"""
+from src.utils.cache import DiskCache
+
+
+class TestDiskCache:
+    """DiskCache 测试类"""
+
+    def test_roundtrip(self, tmp_path):
+        """测试写入后读取"""
+        cache = DiskCache("test", root=tmp_path)
+        key = DiskCache.make_key("transformer", 10, ["arxiv"])
+        assert cache.get(key) is None
+        cache.set(key, {"papers": [{"title": "注意力机制"}]})
+        assert cache.get(key) == {"papers": [{"title": "注意力机制"}]}
+
+    def test_expired(self, tmp_path):
+        """测试过期条目不返回"""
+        cache = DiskCache("test", ttl_seconds=-1, root=tmp_path)
+        cache.set("k", 1)
+        assert cache.get("k") is None
+
+    def test_evict(self, tmp_path):
+        """测试超过上限时淘汰"""
+        cache = DiskCache("test", max_entries=3, root=tmp_path)
+        for i in range(5):
+            cache.set(str(i), i)
+        cache._evict()
+        assert len(list(cache.dir.glob("*.json"))) == 3
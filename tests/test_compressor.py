@@ -0,0 +1,38 @@
+"""语义压缩器测试"""
+from src.rag.compressor import SemanticCompressor
+
+
+class TestSimpleCompress:
+    """简单压缩（不使用LLM）测试类"""
+
+    def test_whole_word_match(self):
+        """测试按整词计分：查询词 art 不命中 start"""
+        content = "We start the training now. Modern art is evaluated here."
+        result = SemanticCompressor().compress(content, "art", max_length=30)
+        assert result.content == "Modern art is evaluated here"
+        assert result.key_points == ["Modern art is evaluated here"]
+
+    def test_chinese_query(self):
+        """测试中文查询按字匹配，与查询无关的句子不计入关键点"""
+        content = "今天天气很好。Transformer的核心是自注意力机制。"
+        result = SemanticCompressor().compress(content, "注意力机制", max_length=100)
+        assert result.key_points == ["Transformer的核心是自注意力机制"]
+        assert result.content.startswith("Transformer")
+
+    def test_long_document_matches_full_sort(self):
+        """测试长文档（走堆选前 k 句）与完整排序的拼接结果一致"""
+        sentences = [f"Sentence {i} about {'attention' if i % 37 == 0 else 'other'} topics" for i in range(500)]
+        content = ". ".join(sentences)
+        compressor = SemanticCompressor()
+
+        result = compressor.compress(content, "attention", max_length=200)
+
+        scored = [(1 if "attention" in s else 0, s) for s in sentences]
+        expected, length = [], 0
+        for _, sent in sorted(scored, key=lambda x: x[0], reverse=True):
+            if length + len(sent) > 200:
+                break
+            expected.append(sent)
+            length += len(sent)
+        assert result.content == " ".join(expected)
+        assert result.content.startswith("Sentence 0 about attention")
@@ -49,6 +49,11 @@ class TestIntentRouter:
         query = "什么是Transformer，对比RNN有什么区别"
         assert self.router.route(query) == "deep_research"
 
+    def test_no_keyword_characters(self):
+        """测试不含任何关键词首字符的查询（跳过正则，按长度路由）"""
+        assert self.router.route("attention") == "simple"
+        assert self.router.route("survey of retrieval augmented generation methods") == "deep_research"
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
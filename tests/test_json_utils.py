@@ -0,0 +1,112 @@
+"""JSON 工具测试"""
+import json
+
+import pytest
+
+from src.utils.json_utils import (
+    JsonListEncoder, JsonObjectScanner, dumps, find_json_array, find_json_object, loads
+)
+
+
+class TestFindJsonObject:
+    """JSON 对象定位测试类"""
+
+    def test_plain_object(self):
+        """测试纯 JSON"""
+        assert find_json_object('{"title": "测试"}') == '{"title": "测试"}'
+
+    def test_surrounding_text(self):
+        """测试带说明文字和代码块的响应"""
+        text = '结果如下：\n```json\n{"a": {"b": 1}}\n```\n以上是报告。'
+        assert find_json_object(text) == '{"a": {"b": 1}}'
+
+    def test_braces_in_strings(self):
+        """测试字符串中的括号和转义引号"""
+        text = '{"c": "x}y", "q": "\\"{\\""} trailing {"second": 2}'
+        assert find_json_object(text) == '{"c": "x}y", "q": "\\"{\\""}'
+
+    def test_not_found(self):
+        """测试无 JSON 或未闭合"""
+        assert find_json_object("没有 JSON") is None
+        assert find_json_object('{"unclosed": 1') is None
+
+
+class TestFindJsonArray:
+    """JSON 数组定位测试类"""
+
+    def test_surrounding_text(self):
+        """测试数组前后有说明文字、字符串中含方括号"""
+        text = '以下是结果：\n[{"title_cn": "标题[1]", "summary": "a]b"}, {"n": [1, 2]}]\n共 2 篇。'
+        assert loads(find_json_array(text)) == [
+            {"title_cn": "标题[1]", "summary": "a]b"}, {"n": [1, 2]}
+        ]
+
+    def test_not_found(self):
+        """测试无数组或未闭合"""
+        assert find_json_array('{"a": 1}') is None
+        assert find_json_array('[{"a": 1}') is None
+
+
+class TestJsonObjectScanner:
+    """增量 JSON 扫描测试类"""
+
+    def test_split_across_chunks(self):
+        """测试对象、字符串和转义被切分到多个块"""
+        text = '好的：\n```json\n{"c": "x}y", "q": "\\"{\\"", "d": {"e": 1}}\n```\n以上。'
+        scanner = JsonObjectScanner()
+        results = [scanner.feed(text[i:i + 3]) for i in range(0, len(text), 3)]
+        done = [r for r in results if r is not None]
+        assert done[0] == find_json_object(text) == '{"c": "x}y", "q": "\\"{\\"", "d": {"e": 1}}'
+
+    def test_stops_at_first_object(self):
+        """测试第一个对象闭合后即返回，不再等待后续输出"""
+        scanner = JsonObjectScanner()
+        assert scanner.feed('{"a": ') is None
+        assert scanner.feed('1} 后续说明') == '{"a": 1}'
+        assert scanner.feed('{"b": 2}') == '{"a": 1}'
+
+    def test_unclosed(self):
+        """测试未闭合时返回 None"""
+        scanner = JsonObjectScanner()
+        assert scanner.feed("前言") is None
+        assert scanner.feed('{"a": [1, 2') is None
+
+
+class TestJsonListEncoder:
+    """增量列表序列化测试类"""
+
+    def test_matches_full_encoding(self):
+        """测试逐次追加后与整表序列化结果一致"""
+        encoder = JsonListEncoder()
+        messages = [{"role": "system", "content": "系统提示"}]
+        assert loads(encoder.encode(messages)) == messages
+
+        messages.append({"role": "assistant", "content": "x}y\"", "tool_calls": [{"id": "c1"}]})
+        messages.append({"role": "tool", "content": "研究结果"})
+        assert loads(encoder.encode(messages)) == loads(dumps(messages))
+
+    def test_new_list_resets(self):
+        """测试换用新列表时重新编码"""
+        encoder = JsonListEncoder()
+        encoder.encode([1, 2, 3])
+        assert loads(encoder.encode([4])) == [4]
+        assert encoder.encode([]) == "[]"
+
+
+class TestLoads:
+    """JSON 解析测试类"""
+
+    def test_unicode_roundtrip(self):
+        """测试中文内容解析"""
+        assert loads('{"title": "研究报告", "n": [1, 2]}') == {"title": "研究报告", "n": [1, 2]}
+
+    def test_decode_error_type(self):
+        """测试解析失败时抛出标准库异常类型"""
+        with pytest.raises(json.JSONDecodeError):
+            loads("not json")
+
+    def test_dumps_keeps_unicode(self):
+        """测试序列化不转义中文且可往返"""
+        text = dumps({"title": "研究报告", "n": [1, 2]})
+        assert "研究报告" in text
+        assert loads(text) == {"title": "研究报告", "n": [1, 2]}
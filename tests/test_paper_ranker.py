@@ -0,0 +1,80 @@
+"""论文预排序测试"""
+from src.tools.paper_ranker import (
+    NearDuplicateIndex, bm25_scores, drop_near_duplicates, fused_scores, prefilter_papers,
+    prompt_size, select_within_budget
+)
+
+
+class TestPaperRanker:
+    """BM25 预排序与近重复去除测试类"""
+
+    PAPERS = [
+        {"title": "Image Classification with CNNs", "abstract": "Convolutional networks."},
+        {"title": "Attention Is All You Need", "abstract": "The Transformer uses self-attention."},
+        {"title": "Transformer vs RNN", "abstract": "We compare the transformer with an RNN."},
+        {"title": "Graph Neural Networks", "abstract": None},
+    ]
+
+    def test_scores(self):
+        """测试 BM25 分数：无关论文为 0，标题命中得分更高"""
+        scores = bm25_scores(self.PAPERS, "Transformer RNN")
+        assert scores[0] == scores[3] == 0
+        assert scores[2] > scores[1] > 0
+
+    def test_prefilter_keeps_order(self):
+        """测试预筛保留高分论文且维持原顺序"""
+        kept = prefilter_papers(self.PAPERS, ["self-attention", "transformer"], keep=2)
+        assert [p["title"] for p in kept] == ["Attention Is All You Need", "Transformer vs RNN"]
+
+    def test_prefilter_noop(self):
+        """测试数量不超过 keep 或没有有效查询词时不筛选"""
+        assert prefilter_papers(self.PAPERS, ["x"], keep=10) is self.PAPERS
+        assert prefilter_papers(self.PAPERS, ["of", "in"], keep=2) == self.PAPERS[:2]
+
+    def test_drop_near_duplicates(self):
+        """测试标题近重复去除（保留首次出现）"""
+        papers = self.PAPERS + [
+            {"title": "Attention is all you need.", "abstract": "Published version."},
+            {"title": "Attention Is All You Need in Speech Separation", "abstract": ""},
+        ]
+        titles = [p["title"] for p in drop_near_duplicates(papers)]
+        assert titles == [p["title"] for p in self.PAPERS] + [
+            "Attention Is All You Need in Speech Separation"
+        ]
+
+    def test_near_duplicates_respect_numbers(self):
+        """测试仅数字不同的标题（不同版本/系列）不视为重复"""
+        papers = [
+            {"title": "Llama 2: Open Foundation and Fine-Tuned Chat Models"},
+            {"title": "Llama 3: Open Foundation and Fine-Tuned Chat Models"},
+        ]
+        assert len(drop_near_duplicates(papers)) == 2
+
+    def test_near_duplicate_index_across_batches(self):
+        """测试索引跨批次保留：后一批中与前一批近重复的论文被拒绝"""
+        index = NearDuplicateIndex()
+        assert all(index.add(p) for p in self.PAPERS)
+        assert not index.add({"title": "attention is all you need!"})
+        assert index.add({"title": "Mamba: Linear-Time Sequence Modeling"})
+        assert len(index) == len(self.PAPERS) + 1
+
+    def test_fused_scores(self):
+        """测试综合分：相关性相同时新论文、高引用论文优先，缺失字段不报错"""
+        papers = [
+            {"year": 2018, "citation_count": 100},
+            {"year": 2024, "citation_count": 100},
+            {"year": None, "citation_count": None},
+            {"year": 1990, "citation_count": 5000},
+        ]
+        scores = fused_scores(papers, [1.0, 1.0, 1.0, 0.0])
+        assert scores[1] > scores[0] > scores[2]
+        assert 0 < scores[3] < scores[2]
+
+    def test_select_within_budget(self):
+        """测试按预算保留高分论文、维持原顺序，预算足够时原样返回"""
+        sizes = [prompt_size(p) for p in self.PAPERS]
+        assert select_within_budget(self.PAPERS, ["x"], sum(sizes)) is self.PAPERS
+
+        kept = select_within_budget(self.PAPERS, ["transformer", "RNN"], sizes[1] + sizes[2])
+        assert [p["title"] for p in kept] == ["Attention Is All You Need", "Transformer vs RNN"]
+        assert len(select_within_budget(self.PAPERS, ["transformer"], 1)) == 1
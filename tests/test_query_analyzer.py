@@ -0,0 +1,43 @@
+"""查询分析器测试"""
+from src.tools.query_analyzer import QueryAnalyzer
+
+
+class _StubClient:
+    """记录调用次数的 LLM 客户端桩"""
+
+    def __init__(self, content: str):
+        self.content = content
+        self.calls = 0
+
+    def chat(self, **kwargs) -> str:
+        self.calls += 1
+        return self.content
+
+
+class TestAnalysisCache:
+    """查询分析缓存测试类"""
+
+    def test_repeat_query_hits_cache(self):
+        """测试大小写、空白不同的重复查询只调用一次 LLM"""
+        analyzer = QueryAnalyzer()
+        analyzer.llm_client = _StubClient(
+            '{"intent": "了解RAG", "keywords": ["RAG"], "suggested_mode": "simple"}'
+        )
+
+        first = analyzer.analyze("RAG 是什么")
+        second = analyzer.analyze("  rag   是什么 ")
+
+        assert analyzer.llm_client.calls == 1
+        assert second.original_query == "  rag   是什么 "
+        assert second.keywords == first.keywords
+        assert second.keywords is not first.keywords
+
+    def test_fallback_not_cached(self):
+        """测试 LLM 结果无法解析时不缓存回退结果"""
+        analyzer = QueryAnalyzer()
+        analyzer.llm_client = _StubClient("无法解析")
+
+        analyzer.analyze("Transformer")
+        analyzer.analyze("Transformer")
+
+        assert analyzer.llm_client.calls == 2
@@ -0,0 +1,124 @@
+"""V2 Supervisor 测试"""
+import asyncio
+import json
+import time
+from unittest import mock
+
+import pytest
+
+pytest.importorskip("arxiv")  # V2 Researcher 依赖 arXiv 搜索
+
+from src.agents.deep_research.v2.supervisor import SupervisorAgent
+from src.utils.cache import DiskCache
+
+
+def _tool_call(call_id: str, name: str, arguments: dict) -> dict:
+    """构造一条 OpenAI 格式的工具调用"""
+    return {
+        "id": call_id,
+        "type": "function",
+        "function": {"name": name, "arguments": json.dumps(arguments, ensure_ascii=False)},
+    }
+
+
+def _scripted_llm(*responses):
+    """按顺序返回预设响应的 _acall_llm 替身"""
+    queue = list(responses)
+
+    async def acall_llm(messages, on_tool_call=None):
+        return queue.pop(0) if queue else None
+
+    return acall_llm
+
+
+class TestSupervisorRun:
+    """Supervisor 主循环测试类"""
+
+    def test_arun_with_spill_dir(self, tmp_path):
+        """测试设置 spill_dir 时 arun 正常完成，溢出文件以时间戳命名"""
+        supervisor = SupervisorAgent(researcher=mock.MagicMock(), spill_dir=tmp_path, max_rounds=3)
+        supervisor._acall_llm = _scripted_llm({
+            "role": "assistant",
+            "content": "",
+            "tool_calls": [
+                _tool_call("call_1", "think", {"thought": "先梳理问题"}),
+                _tool_call("call_2", "research_complete", {"reason": "信息已充分"}),
+            ],
+        })
+
+        result = asyncio.run(supervisor.arun("Transformer 注意力机制"))
+
+        assert result.total_rounds == 1
+        assert result.completion_reason == "信息已充分"
+        assert result.state.spill_path.parent == tmp_path
+        assert result.state.spill_path.stem[:8].isdigit()
+
+    def test_llm_failure_cancels_search_ahead(self):
+        """测试 LLM 调用失败时取消已开始的提前搜索"""
+        supervisor = SupervisorAgent(researcher=mock.MagicMock(), max_rounds=3)
+        searches = {}
+
+        async def acall_llm(messages, on_tool_call=None):
+            on_tool_call("conduct_research", {"topic": "医学图像分割"})
+            searches.update(supervisor._search_ahead.call_args.args[0])
+            return None
+
+        async def run():
+            result = await supervisor.arun("医学图像分割")
+            await asyncio.sleep(0)  # 让取消生效
+            return result
+
+        supervisor._acall_llm = acall_llm
+        supervisor._search_ahead = mock.MagicMock(wraps=supervisor._search_ahead)
+        supervisor.researcher._search_papers.side_effect = lambda tool: time.sleep(0.5) or []
+        result = asyncio.run(run())
+
+        assert result.completion_reason == "LLM 调用失败"
+        assert len(searches) == 1
+        assert all(task.cancelled() for task in searches.values())
+
+
+class TestFirstRoundPlanReuse:
+    """首轮规划复用测试类"""
+
+    def setup_method(self):
+        """每个测试方法前执行"""
+        self.plan = {
+            "role": "assistant",
+            "content": "",
+            "tool_calls": [_tool_call("call_1", "conduct_research", {"topic": "医学图像分割"})],
+        }
+
+    def _supervisor(self, tmp_path) -> SupervisorAgent:
+        return SupervisorAgent(
+            researcher=mock.MagicMock(),
+            llm_cache=DiskCache("supervisor_test", root=tmp_path),
+        )
+
+    def test_same_query_reused(self, tmp_path):
+        """测试大小写、空白、标点不同的相同查询复用规划"""
+        supervisor = self._supervisor(tmp_path)
+        supervisor._remember_plan("基于 Transformer 的医学图像分割方法", self.plan)
+
+        assert supervisor._find_cached_plan("基于transformer的医学图像分割方法？") == self.plan
+        assert supervisor.llm_cache_stats["plan_hits"] == 1
+
+    def test_near_miss_not_reused(self, tmp_path):
+        """测试只差个别实词的查询不复用规划"""
+        supervisor = self._supervisor(tmp_path)
+        supervisor._remember_plan("基于 Transformer 的医学图像分割方法", self.plan)
+
+        assert supervisor._find_cached_plan("基于 Transformer 的遥感图像分割方法") is None
+        assert supervisor._find_cached_plan("基于 Mamba 的医学图像分割方法") is None
+        assert supervisor._find_cached_plan("基于 Transformer 的医学图像分割") is None
+        assert supervisor.llm_cache_stats["plan_hits"] == 0
+
+    def test_plans_stored_per_query(self, tmp_path):
+        """测试每个查询的规划单独存储：一个实例写入不会覆盖另一实例写入的规划"""
+        first, second = self._supervisor(tmp_path), self._supervisor(tmp_path)
+        other_plan = {**self.plan, "content": "另一规划"}
+        first._remember_plan("医学图像分割", self.plan)
+        second._remember_plan("遥感图像分割", other_plan)
+
+        assert first._find_cached_plan("医学图像分割") == self.plan
+        assert first._find_cached_plan("遥感图像分割") == other_plan
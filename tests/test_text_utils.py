@@ -0,0 +1,28 @@
+"""文本工具测试"""
+from src.utils.text_utils import normalize_title, match_title, title_shingles
+
+
+class TestTitleMatching:
+    """标题归一化与匹配测试类"""
+
+    def test_normalize(self):
+        """测试大小写、标点、空白归一化"""
+        assert normalize_title("  Attention Is All-You  Need! ") == "attention is all you need"
+
+    def test_match_exact_and_fuzzy(self):
+        """测试精确、模糊、子串匹配"""
+        index = {normalize_title(t): t for t in [
+            "Attention Is All You Need",
+            "BERT: Pre-training of Deep Bidirectional Transformers for Language Understanding",
+        ]}
+        assert match_title("attention is all you need.", index) == "Attention Is All You Need"
+        assert match_title("Attention is all we need", index) == "Attention Is All You Need"
+        assert match_title("Deep Bidirectional Transformers", index).startswith("BERT")
+        assert match_title("GPT-4 Technical Report", index) is None
+        assert match_title("", index) is None
+
+    def test_title_shingles(self):
+        """测试 3-gram 切分及短标题"""
+        assert title_shingles("abcd") == {"abc", "bcd"}
+        assert title_shingles("ab") == {"ab"}
+        assert title_shingles("") == set()
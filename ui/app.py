@@ -14,6 +14,7 @@ if str(src_dir) not in sys.path:
 from main import ResearchAssistant
 from tools.reading_guide import ReadingGuide
 from tools.pdf import PaperProcessor
+from utils import json_utils
 
 
 def create_app():
@@ -26,9 +27,8 @@ def create_app():
         if not paper_json or paper_json == "{}":
             return "## 📄 论文详情\n\n点击论文标题查看详细信息"
 
-        import json
         try:
-            paper = json.loads(paper_json)
+            paper = json_utils.loads(paper_json)
         except:
             return "## 📄 论文详情\n\n数据解析失败"
 
@@ -96,7 +96,6 @@ def create_app():
             report_sources_json: 报告来源列表 JSON（与引用编号对应）
             papers_json: 论文列表 JSON
         """
-        import json
 
         if cite_num is None or cite_num < 1:
             return (
@@ -107,8 +106,8 @@ def create_app():
 
         try:
             # 尝试从 report_sources 获取（与报告引用编号一致）
-            report_sources = json.loads(report_sources_json) if report_sources_json else []
-            papers = json.loads(papers_json) if papers_json else []
+            report_sources = json_utils.loads(report_sources_json) if report_sources_json else []
+            papers = json_utils.loads(papers_json) if papers_json else []
 
             # 引用编号是 1-indexed，转换为 0-indexed
             idx = int(cite_num) - 1
@@ -124,7 +123,7 @@ def create_app():
                 )
 
             paper = source_list[idx]
-            paper_json = json.dumps(paper, ensure_ascii=False)
+            paper_json = json_utils.dumps(paper)
 
             # 返回论文详情和更新当前论文状态
             return (
@@ -146,14 +145,13 @@ def create_app():
         Args:
             current_paper_json: 当前选中论文的 JSON
         """
-        import json
         import re
 
         if not current_paper_json or current_paper_json == "{}":
             return "请先选择一篇论文"
 
         try:
-            paper = json.loads(current_paper_json)
+            paper = json_utils.loads(current_paper_json)
         except:
             return "论文数据解析失败"
 
@@ -416,7 +414,6 @@ def create_app():
         guide_output = format_reading_guide(reading_guide) if result['mode'] == 'simple' else ""
 
         # 论文列表（合并为单一列表，带来源标签）
-        import json
         arxiv_papers = result.get('arxiv_papers', [])
         openalex_papers = result.get('openalex_papers', [])
         papers_list = arxiv_papers + openalex_papers
@@ -439,11 +436,11 @@ def create_app():
             papers_output += "*暂无结果*\n"
 
         # 返回论文列表JSON供侧边栏使用
-        papers_json = json.dumps(papers_list, ensure_ascii=False)
+        papers_json = json_utils.dumps(papers_list)
 
         # 返回报告来源JSON（与报告引用编号一致）
         report_sources = result.get('report_sources', [])
-        report_sources_json = json.dumps(report_sources, ensure_ascii=False) if report_sources else "[]"
+        report_sources_json = json_utils.dumps(report_sources) if report_sources else "[]"
 
         yield header, report_output, thinking_output, guide_output, papers_output, papers_json, report_sources_json
 
@@ -648,7 +645,6 @@ def create_app():
     def export_markdown(report_content: str, papers_json: str) -> str:
         """导出 Markdown 报告"""
         import tempfile
-        import json
         from datetime import datetime
 
         if not report_content or report_content.startswith("⏳"):
@@ -677,7 +673,7 @@ def create_app():
         if not has_references:
             md_content += "\n\n---\n\n## 参考论文\n\n"
             try:
-                papers = json.loads(papers_json) if papers_json else []
+                papers = json_utils.loads(papers_json) if papers_json else []
                 for i, p in enumerate(papers, 1):
                     title = p.get('title', '未知标题')
                     authors = ', '.join(p.get('authors', [])[:3])
@@ -700,14 +696,13 @@ def create_app():
     def export_bibtex(papers_json: str) -> str:
         """导出 BibTeX 格式"""
         import tempfile
-        import json
         import re
 
         if not papers_json:
             return None
 
         try:
-            papers = json.loads(papers_json)
+            papers = json_utils.loads(papers_json)
         except:
             return None
 
@@ -1113,9 +1108,8 @@ def create_app():
         # 侧边栏：更新论文选择器（当搜索完成后）
         def update_paper_selector(papers_json: str):
             """更新论文下拉菜单"""
-            import json
             try:
-                papers = json.loads(papers_json) if papers_json else []
+                papers = json_utils.loads(papers_json) if papers_json else []
                 if not papers:
                     return gr.Dropdown(choices=[], value=None)
 
@@ -1138,7 +1132,6 @@ def create_app():
         # 侧边栏：当选择论文时显示详情
         def show_selected_paper(paper_index, papers_json):
             """显示选中的论文详情，同时更新 current_paper_state"""
-            import json
             if paper_index is None or not papers_json:
                 return (
                     "## 📄 论文详情\n\n请先搜索论文，然后从上方下拉菜单选择",
@@ -1146,10 +1139,10 @@ def create_app():
                 )
 
             try:
-                papers = json.loads(papers_json)
+                papers = json_utils.loads(papers_json)
                 if 0 <= paper_index < len(papers):
                     paper = papers[paper_index]
-                    paper_json = json.dumps(paper, ensure_ascii=False)
+                    paper_json = json_utils.dumps(paper)
                     return (
                         show_paper_details(paper_json),
                         paper_json